@@ -1,9 +1,10 @@
 import os
+import asyncio
 import google.generativeai as genai
 import json
 import logging
-import time
-import httpx
+from core.cache import cache_registry
+from core.http_client import http_clients
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -18,9 +19,8 @@ class AIService:
         if self.default_api_key and self.default_api_key != "your_gemini_api_key_here":
             genai.configure(api_key=self.default_api_key)
         
-        self._market_cache = None
-        self._market_cache_time = 0
         self.CACHE_DURATION = 1800 
+        self._market_cache = cache_registry.namespace("ai_market_outlook", maxsize=1, ttl=self.CACHE_DURATION)
 
     def list_available_models(self, api_key: Optional[str] = None) -> List[Dict[str, str]]:
         # 생략 (기존 로직 유지하되 필요 시 확장)
@@ -82,24 +82,24 @@ class AIService:
         # 모델명 보정 (Gemini 기본값이 넘어올 경우 llama3로 대체)
         ollama_model = "llama3" if "gemini" in model else model
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.post(
-                    f"{base_url}/api/generate",
-                    json={
-                        "model": ollama_model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "format": "json"
-                    }
-                )
-                if response.status_code != 200:
-                    return {"error": f"Ollama Error: {response.text}"}
-                
-                res_data = response.json()
-                return json.loads(res_data["response"])
-            except Exception as e:
-                return {"error": f"Ollama Connection Failed: {str(e)}"}
+        client = http_clients.get("ollama")
+        try:
+            response = await client.post(
+                f"{base_url}/api/generate",
+                json={
+                    "model": ollama_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "format": "json"
+                }
+            )
+            if response.status_code != 200:
+                return {"error": f"Ollama Error: {response.text}"}
+            
+            res_data = response.json()
+            return json.loads(res_data["response"])
+        except Exception as e:
+            return {"error": f"Ollama Connection Failed: {str(e)}"}
 
     async def _call_google(self, api_key: str, model_name: str, prompt: str) -> Dict[str, Any]:
         """기존 Gemini 호출 로직"""
@@ -135,9 +135,9 @@ class AIService:
             return {"score": 50, "sentiment": "Neutral", "summary": "분석 오류", "reason": str(e)}
 
     async def analyze_market_outlook(self, news_list: List[Dict[str, Any]], model_name: str = "models/gemini-2.0-flash") -> Dict[str, Any]:
-        current_time = time.time()
-        if self._market_cache and (current_time - self._market_cache_time < self.CACHE_DURATION):
-            return self._market_cache
+        cached = self._market_cache.get("outlook")
+        if cached is not None:
+            return cached
         
         prompt = self._build_sentiment_prompt("미국 주식 시장 전체", news_list)
         
@@ -148,8 +148,7 @@ class AIService:
                 result = await self._call_google(self.default_api_key, model_name, prompt)
             
             if "error" not in result:
-                self._market_cache = result
-                self._market_cache_time = current_time
+                self._market_cache.set("outlook", result)
             return result
         except Exception as e:
             return {"error": str(e)}
@@ -160,9 +159,8 @@ class AIService:
             if provider.upper() == "OLLAMA":
                 if not base_url: return False
                 if not base_url.startswith("http"): base_url = f"http://{base_url}"
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    response = await client.get(f"{base_url}/")
-                    return response.status_code == 200
+                response = await http_clients.get("ollama").get(f"{base_url}/", timeout=5.0)
+                return response.status_code == 200
             elif provider.upper() == "GOOGLE":
                 # 단순 라이브러리 설정 체크
                 return api_key is not None and len(api_key) > 10
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from core.bar_store import Bars, bar_store
+from core.indicator_service import IndicatorService, format_bar_dates, to_json_floats
+from core.strategy_service import StrategyService
+from core.expression_strategy import RuleError, compile_strategy, env_from_panel
+
+@dataclass(frozen=True)
+class SignalRule:
+    """
+    전략 타입별 시그널 규칙.
+    features(바) -> 파라미터와 무관한 지표 배열 (종목당 한 번만 계산, 최적화 시 조합 간 재사용)
+    signals(지표, 파라미터) -> 바마다 +1(BUY) / -1(SELL) / 0(HOLD)
+    """
+    features: Callable[[Bars], Dict[str, np.ndarray]]
+    signals: Callable[[Dict[str, np.ndarray], Dict[str, Any]], np.ndarray]
+
+    def __call__(self, bars: Bars, params: Dict[str, Any]) -> np.ndarray:
+        return self.signals(self.features(bars), params)
+
+def rsi_features(bars: Bars) -> Dict[str, np.ndarray]:
+    return {"rsi": IndicatorService.calculate_rsi_panel(bars.close)[0]}
+
+def rsi_limit_signals(features: Dict[str, np.ndarray], params: Dict[str, Any]) -> np.ndarray:
+    """StrategyService.evaluate_strategy의 RSI_LIMIT 규칙을 전체 바에 한 번에 적용합니다."""
+    buy_threshold, sell_threshold = StrategyService.rsi_limit_thresholds(params)
+    rsi = features["rsi"]
+    with np.errstate(invalid="ignore"):
+        # RSI가 NaN이면 두 비교 모두 False -> HOLD (실시간 평가와 동일)
+        return np.where(rsi <= buy_threshold, 1, np.where(rsi >= sell_threshold, -1, 0)).astype(np.int8)
+
+def expression_features(bars: Bars) -> Dict[str, np.ndarray]:
+    return env_from_panel(bars, IndicatorService.calculate_panel(bars.close))
+
+def expression_signals(features: Dict[str, np.ndarray], params: Dict[str, Any]) -> np.ndarray:
+    """EXPRESSION 전략의 buy_rule/sell_rule을 전체 바에 대해 한 번에 평가합니다. (컴파일 결과는 규칙 문자열별로 캐싱)"""
+    return compile_strategy(params).signals(features)
+
+SIGNAL_RULES: Dict[str, SignalRule] = {
+    "RSI_LIMIT": SignalRule(rsi_features, rsi_limit_signals),
+    "EXPRESSION": SignalRule(expression_features, expression_signals),
+}
+
+def simulate(closes: np.ndarray, signals: np.ndarray, quantity: float = 1.0, initial_cash: float = 10000.0) -> Dict[str, np.ndarray]:
+    """
+    시그널을 워커와 같은 방식으로 체결합니다. BUY는 매번 quantity만큼 매수하고,
+    SELL은 보유 수량이 있을 때만 매도합니다. 체결가는 시그널이 발생한 바의 종가입니다.
+    보유 수량은 시그널 누적합 S를 0에서 반사시킨 값 S - min(0, cummin(S))로 반복문 없이 계산합니다.
+    (실시간 매매의 잔고 부족 거절은 재현하지 않으며, 필요한 최대 자금은 결과의 max_capital_used로 확인합니다)
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    steps = np.asarray(signals, dtype=np.float64)
+    cumulative = np.cumsum(steps)
+    units = cumulative - np.minimum(0.0, np.minimum.accumulate(cumulative))
+    position = units * quantity
+    trades = np.diff(position, prepend=0.0)
+    cash = initial_cash - np.cumsum(trades * closes)
+    equity = cash + position * closes
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.where(peak > 0, equity / peak - 1.0, 0.0)
+    return {"position": position, "trades": trades, "cash": cash, "equity": equity, "drawdown": drawdown}
+
+def backtest_metrics(closes: np.ndarray, sim: Dict[str, np.ndarray], initial_cash: float) -> Dict[str, float]:
+    """시뮬레이션 결과의 요약 지표 (수익률, 최대 낙폭, 체결 수, 회전율 등)"""
+    trades = sim["trades"]
+    equity = sim["equity"]
+    final_equity = float(equity[-1])
+    mean_equity = equity.mean()
+    return {
+        "final_equity": final_equity,
+        "total_return": final_equity / initial_cash - 1.0,
+        "buy_and_hold_return": float(closes[-1] / closes[0] - 1.0),
+        "max_drawdown": float(sim["drawdown"].min()),
+        "num_trades": int(np.count_nonzero(trades)),
+        "turnover": float(np.abs(trades * closes).sum() / mean_equity) if mean_equity else 0.0,
+        "max_capital_used": float(initial_cash - sim["cash"].min()),
+        "final_position": float(sim["position"][-1]),
+    }
+
+class BacktestService:
+    """바 저장소의 과거 데이터로 TradingStrategy 규칙을 벡터화하여 재생합니다."""
+
+    @staticmethod
+    def run_on_bars(bars: Bars, strategy_type: str, params: Dict[str, Any], quantity: float = 1.0,
+                    initial_cash: float = 10000.0) -> Dict[str, Any]:
+        rule = SIGNAL_RULES.get(strategy_type)
+        if rule is None:
+            return {"error": f"Backtest not supported for strategy type: {strategy_type}"}
+        if len(bars) == 0:
+            return {"error": "No data found"}
+
+        started = time.perf_counter()
+        closes = np.asarray(bars.close, dtype=np.float64)
+        try:
+            signals = rule(bars, params)
+        except RuleError as e:
+            return {"error": str(e)}
+        sim = simulate(closes, signals, quantity=quantity, initial_cash=initial_cash)
+
+        fill_idx = np.flatnonzero(sim["trades"])
+        fill_qty = sim["trades"][fill_idx]
+        dates = format_bar_dates(bars.ts, bars.interval)
+
+        return {
+            "symbol": bars.symbol,
+            "strategy_type": strategy_type,
+            "parameters": params,
+            "interval": bars.interval,
+            "start": dates[0],
+            "end": dates[-1],
+            "bars": len(bars),
+            "initial_cash": initial_cash,
+            **backtest_metrics(closes, sim, initial_cash),
+            "fills": {
+                "date": [dates[i] for i in fill_idx],
+                "side": np.where(fill_qty > 0, "BUY", "SELL").tolist(),
+                "quantity": np.abs(fill_qty).tolist(),
+                "price": closes[fill_idx].tolist(),
+            },
+            "equity_curve": {"date": dates, "equity": to_json_floats(sim["equity"]), "drawdown": to_json_floats(sim["drawdown"])},
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    async def run(self, symbol: str, strategy_type: str, params: Dict[str, Any], period: str = "1y",
+                  interval: str = "1d", quantity: float = 1.0, initial_cash: float = 10000.0) -> Dict[str, Any]:
+        """종목의 과거 바를 불러와 백테스트를 실행합니다."""
+        try:
+            bars = await bar_store.get_bars(symbol, interval=interval, period=period)
+        except ValueError as e:
+            return {"error": str(e)}
+        return self.run_on_bars(bars, strategy_type, params, quantity=quantity, initial_cash=initial_cash)
+
+# 글로벌 인스턴스
+backtest_service = BacktestService()
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="TradingStrategy 백테스트 (예: python -m core.backtest_service TSLA --params '{\"buy_rsi\": 25}')")
+    parser.add_argument("symbol")
+    parser.add_argument("--type", default="RSI_LIMIT", help="전략 타입 (기본: RSI_LIMIT)")
+    parser.add_argument("--params", default="{}", help="전략 파라미터 JSON")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--quantity", type=float, default=1.0)
+    parser.add_argument("--cash", type=float, default=10000.0)
+    parser.add_argument("--full", action="store_true", help="자산 곡선(equity_curve)까지 출력")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(backtest_service.run(
+        args.symbol.upper(), args.type, json.loads(args.params), period=args.period,
+        interval=args.interval, quantity=args.quantity, initial_cash=args.cash,
+    ))
+    if not args.full:
+        result.pop("equity_curve", None)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from core.executor import run_yfinance
+from core.singleflight import SingleFlight
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작 (단일 프로세스 개발 환경용)
+    fcntl = None
+
+logger = logging.getLogger("bar_store")
+
+# 컬럼별로 파일 하나씩 저장 (ts는 UTC epoch 초, 나머지는 float64)
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+DTYPES = {"ts": np.dtype("<i8"), "open": np.dtype("<f8"), "high": np.dtype("<f8"),
+          "low": np.dtype("<f8"), "close": np.dtype("<f8"), "volume": np.dtype("<f8")}
+FRAME_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+# yfinance period 문자열 -> 대략적인 기간(초)
+PERIOD_SECONDS = {
+    "1d": 86400, "5d": 5 * 86400, "1mo": 31 * 86400, "3mo": 92 * 86400, "6mo": 183 * 86400,
+    "1y": 366 * 86400, "2y": 731 * 86400, "5y": 1827 * 86400, "10y": 3653 * 86400,
+}
+
+NY_TZ = ZoneInfo("America/New_York")
+SESSION_OPEN_SECONDS = 9 * 3600 + 30 * 60  # 정규장 시작 09:30 (뉴욕 현지)
+
+# 로컬 리샘플링이 가능한 주기 (분 단위 길이). 일/주 단위는 뉴욕 현지 날짜 기준으로 묶음
+INTERVAL_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60, "1d": 1440, "1wk": 10080}
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "bars")
+
+def period_start(period: str, now: Optional[float] = None) -> int:
+    """period 문자열("3mo", "1y", "ytd", "max")을 조회 시작 시각(epoch 초)으로 변환합니다."""
+    now = time.time() if now is None else now
+    if period == "max":
+        return 0
+    if period == "ytd":
+        year = datetime.fromtimestamp(now, tz=timezone.utc).year
+        return int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp())
+    if period not in PERIOD_SECONDS:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(now - PERIOD_SECONDS[period])
+
+def ny_utc_offsets(ts: np.ndarray) -> np.ndarray:
+    """epoch 초 배열의 각 시각에 대한 뉴욕 UTC 오프셋(초). 서머타임은 날짜 단위로만 바뀌므로 고유한 UTC 날짜마다 한 번씩만 계산"""
+    ts = np.asarray(ts, dtype=np.int64)
+    if len(ts) == 0:
+        return np.empty(0, dtype=np.int64)
+    days, inverse = np.unique(ts // 86400, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(d) * 86400 + 43200, tz=timezone.utc).astimezone(NY_TZ).utcoffset().total_seconds()
+        for d in days
+    ], dtype=np.int64)
+    return offsets[inverse]
+
+@dataclass
+class Bars:
+    """한 종목/주기의 OHLCV 배열 묶음 (저장소 파일을 그대로 메모리 매핑한 읽기 전용 뷰)"""
+    symbol: str
+    interval: str
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> "Bars":
+        """복사 없이 구간 뷰를 반환합니다."""
+        return Bars(self.symbol, self.interval, *(getattr(self, c)[start:stop] for c in COLUMNS))
+
+    def since(self, start_ts: int) -> "Bars":
+        return self.slice(int(np.searchsorted(self.ts, start_ts, side="left")))
+
+    def tail(self, n: int) -> "Bars":
+        return self.slice(max(len(self) - n, 0))
+
+    def to_frame(self) -> pd.DataFrame:
+        """yfinance history()와 같은 형태(뉴욕 시간대 DatetimeIndex)의 데이터프레임으로 변환합니다."""
+        index = pd.to_datetime(np.asarray(self.ts), unit="s", utc=True).tz_convert("America/New_York")
+        return pd.DataFrame({FRAME_COLUMNS[c]: np.asarray(getattr(self, c)) for c in FRAME_COLUMNS}, index=index)
+
+    @classmethod
+    def from_frame(cls, symbol: str, interval: str, df: pd.DataFrame) -> "Bars":
+        """yfinance history() 결과를 배열 묶음으로 변환합니다."""
+        df = df.dropna(subset=["Close"])
+        index = df.index if df.index.tz is not None else df.index.tz_localize("UTC")
+        ts = index.tz_convert("UTC").as_unit("s").asi8.astype(np.int64)
+        columns = {c: df[FRAME_COLUMNS[c]].to_numpy(dtype=np.float64) for c in FRAME_COLUMNS}
+        return cls(symbol, interval, ts, **columns)
+
+def resample_bars(bars: Bars, interval: str) -> Bars:
+    """
+    더 짧은 주기의 바를 긴 주기로 묶습니다. (시가=첫 값, 고가=최댓값, 저가=최솟값, 종가=마지막 값, 거래량=합)
+    분/시간 단위는 뉴욕 현지 09:30 기준으로 정렬하고(1h = 09:30, 10:30, ...), 1d는 현지 날짜, 1wk는 월요일 시작 주 단위로 묶습니다.
+    새 바의 시각은 구간 시작 시각이며, 마지막 구간은 진행 중인 바일 수 있습니다.
+    """
+    if interval == bars.interval:
+        return bars
+    if interval not in INTERVAL_MINUTES or bars.interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval: {interval}")
+    width, base = INTERVAL_MINUTES[interval] * 60, INTERVAL_MINUTES[bars.interval] * 60
+    if width < base or (width < 86400 and width % base):
+        raise ValueError(f"Cannot resample {bars.interval} bars into {interval}")
+    if len(bars) == 0:
+        return Bars(bars.symbol, interval, *(np.empty(0, dtype=DTYPES[c]) for c in COLUMNS))
+
+    ts = np.asarray(bars.ts, dtype=np.int64)
+    offsets = ny_utc_offsets(ts)
+    local = ts + offsets
+    day = local // 86400
+    if interval == "1d":
+        key = day
+        start_local = day * 86400
+    elif interval == "1wk":
+        key = (day + 3) // 7  # 1970-01-01은 목요일 -> 월요일 시작 주 번호
+        start_local = (key * 7 - 3) * 86400
+    else:
+        slot = (local - day * 86400 - SESSION_OPEN_SECONDS) // width
+        key = day * 1000 + slot  # 하루 슬롯 수(최대 1440)보다 충분히 큰 배수
+        start_local = day * 86400 + SESSION_OPEN_SECONDS + slot * width
+
+    # 정렬된 시계열이므로 키가 바뀌는 지점이 곧 구간 경계 -> reduceat으로 한 번에 집계
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+    return Bars(
+        bars.symbol,
+        interval,
+        (start_local[starts] - offsets[starts]).astype(np.int64),
+        np.asarray(bars.open)[starts],
+        np.maximum.reduceat(np.asarray(bars.high), starts),
+        np.minimum.reduceat(np.asarray(bars.low), starts),
+        np.asarray(bars.close)[ends],
+        np.add.reduceat(np.asarray(bars.volume), starts),
+    )
+
+def local_day_start(epoch: int) -> int:
+    """epoch 초가 속한 뉴욕 현지 날짜의 자정(epoch 초)"""
+    local = datetime.fromtimestamp(epoch, tz=NY_TZ)
+    return int(local.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+
+class BarStore:
+    """
+    종목/주기별 OHLCV 바를 디스크에 컬럼 단위 바이너리 파일로 저장하는 로컬 저장소.
+    - 읽기: np.memmap으로 파일을 그대로 매핑하므로 복사가 발생하지 않습니다.
+    - 갱신: 마지막으로 저장된 바 이후(마지막 바 포함, 진행 중인 바 갱신용)만 yfinance에서 받아 덧붙입니다.
+    - 쓰기: API와 워커 프로세스가 같은 디렉터리를 갱신하므로, 읽고-고쳐-쓰기와 파일 교체는 종목/주기별 잠금 파일(flock) 안에서 합니다.
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT, refresh_seconds: float = 60):
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self._synced_at: Dict[tuple, float] = {}
+        self._flight = SingleFlight("bars")
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.upper())
+
+    def _path(self, symbol: str, interval: str, column: str) -> str:
+        return os.path.join(self._dir(symbol, interval), f"{column}.bin")
+
+    @contextmanager
+    def _lock(self, symbol: str, interval: str):
+        """종목/주기 디렉터리의 쓰기 잠금 (프로세스 간 배타). 같은 프로세스 안에서 중첩해서 잡지 않아야 함"""
+        os.makedirs(self._dir(symbol, interval), exist_ok=True)
+        with open(os.path.join(self._dir(symbol, interval), ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_meta(self, symbol: str, interval: str) -> dict:
+        try:
+            with open(os.path.join(self._dir(symbol, interval), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, symbol: str, interval: str, meta: dict):
+        path = os.path.join(self._dir(symbol, interval), "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def read(self, symbol: str, interval: str = "1d") -> Bars:
+        """저장된 전체 바를 메모리 매핑으로 읽습니다. 저장된 데이터가 없으면 빈 Bars를 반환합니다."""
+        sizes = {}
+        for c in COLUMNS:
+            try:
+                sizes[c] = os.path.getsize(self._path(symbol, interval, c)) // DTYPES[c].itemsize
+            except OSError:
+                sizes[c] = 0
+        # 컬럼별 쓰기 도중이라도 모든 컬럼에 존재하는 길이까지만 노출
+        n = min(sizes.values())
+        arrays = {}
+        for c in COLUMNS:
+            if n == 0:
+                arrays[c] = np.empty(0, dtype=DTYPES[c])
+            else:
+                arrays[c] = np.memmap(self._path(symbol, interval, c), dtype=DTYPES[c], mode="r", shape=(n,))
+        return Bars(symbol, interval, **arrays)
+
+    def write(self, bars: Bars):
+        """
+        새 바를 저장합니다. 기존 마지막 구간과 겹치는 바는 제자리에서 덮어쓰고 나머지는 파일 끝에 덧붙입니다.
+        (매핑 중인 파일을 줄이지 않기 위해, 겹침보다 새 데이터가 짧으면 새 파일로 교체합니다.)
+        """
+        if len(bars) == 0:
+            return
+        with self._lock(bars.symbol, bars.interval):
+            self._write(bars)
+
+    def _write(self, bars: Bars):
+        # 잠금 안에서 다시 읽어야 다른 프로세스가 방금 덧붙인 바를 덮어쓰지 않음
+        stored = self.read(bars.symbol, bars.interval)
+        keep = int(np.searchsorted(stored.ts, bars.ts[0], side="left"))
+        overlap = len(stored) - keep
+
+        if len(bars) < overlap:
+            self._replace(bars.symbol, bars.interval, stored.slice(0, keep), bars)
+            return
+
+        # ts를 마지막에 써서, 읽는 쪽이 완성되지 않은 행을 보지 않도록 함
+        for c in COLUMNS[1:] + ("ts",):
+            values = np.ascontiguousarray(getattr(bars, c), dtype=DTYPES[c])
+            path = self._path(bars.symbol, bars.interval, c)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.seek(keep * DTYPES[c].itemsize)
+                f.write(values.tobytes())
+
+    def _replace(self, symbol: str, interval: str, head: Bars, tail: Bars):
+        """기존 파일을 새 파일로 원자적으로 교체합니다 (기존 매핑은 이전 파일을 계속 참조). _lock() 안에서 호출"""
+        for c in COLUMNS:
+            values = np.concatenate([np.asarray(getattr(head, c)), np.asarray(getattr(tail, c))]).astype(DTYPES[c])
+            path = self._path(symbol, interval, c)
+            with open(path + ".tmp", "wb") as f:
+                f.write(values.tobytes())
+            os.replace(path + ".tmp", path)
+
+    async def get_bars(self, symbol: str, interval: str = "1d", period: str = "3mo", base: Optional[str] = None) -> Bars:
+        """
+        필요하면 저장소를 갱신한 뒤, 요청 기간에 해당하는 바를 복사 없이 반환합니다.
+        base(예: "5m")를 주면 그 주기만 내려받아 interval로 로컬 리샘플링합니다.
+        """
+        if base and base != interval:
+            return (await self.get_timeframes(symbol, [interval], period=period, base=base))[interval]
+        await self.sync(symbol, interval, period)
+        return self.read(symbol, interval).since(period_start(period))
+
+    async def get_timeframes(self, symbol: str, intervals: Iterable[str], period: str = "5d", base: str = "5m") -> Dict[str, Bars]:
+        """
+        기준 주기(base) 바를 한 번만 받아 여러 주기(15m, 1h, 1d 등)로 리샘플링합니다.
+        첫 구간이 잘리지 않도록 조회 시작은 뉴욕 현지 자정에 맞춥니다. (일봉은 정규장 바만 집계됨)
+        """
+        await self.sync(symbol, base, period)
+        bars = self.read(symbol, base).since(local_day_start(period_start(period)))
+        return {interval: resample_bars(bars, interval) for interval in intervals}
+
+    async def sync(self, symbol: str, interval: str = "1d", period: str = "3mo"):
+        """저장소가 요청 기간을 덮지 못하거나 갱신 주기가 지났으면 yfinance에서 부족한 바만 받아옵니다."""
+        key = (symbol.upper(), interval)
+        start = period_start(period)
+        meta = self._load_meta(symbol, interval)
+        covered = meta.get("start") is not None and meta["start"] <= start
+        if covered and time.time() - self._synced_at.get(key, 0) < self.refresh_seconds:
+            return
+        await self._flight.do((key, None if covered else period), lambda: self._sync(symbol, interval, period, start, covered))
+
+    async def _sync(self, symbol: str, interval: str, period: str, start: int, covered: bool):
+        stored = self.read(symbol, interval)
+        if covered and len(stored):
+            # 마지막 바부터 다시 받아 진행 중이던 바를 최신 값으로 덮어씀 (다른 프로세스가 더 덧붙였어도 write()가 잠금 안에서 병합)
+            last_ts = int(stored.ts[-1])
+            logger.info(f"🌐 [API Fetch] Appending {interval} bars for {symbol} since {last_ts}")
+            since = datetime.fromtimestamp(last_ts, tz=timezone.utc)
+            if interval.endswith(("d", "wk", "mo")):
+                since = since.date()
+            df = await run_yfinance(lambda: yf.Ticker(symbol).history(start=since, interval=interval))
+            if not df.empty:
+                self.write(Bars.from_frame(symbol, interval, df))
+        else:
+            logger.info(f"🌐 [API Fetch] Backfilling {period} of {interval} bars for {symbol}")
+            df = await run_yfinance(lambda: yf.Ticker(symbol).history(period=period, interval=interval))
+            if df.empty:
+                return
+            new = Bars.from_frame(symbol, interval, df)
+            # 새로 받은 구간 이전의 기존 바만 남기고 나머지는 새 데이터로 교체 (백필은 드물게 발생)
+            with self._lock(symbol, interval):
+                stored = self.read(symbol, interval)
+                self._replace(symbol, interval, stored.slice(0, int(np.searchsorted(stored.ts, new.ts[0]))), new)
+                meta = self._load_meta(symbol, interval)
+                # 다른 프로세스가 그 사이 더 긴 기간을 백필했으면 넓은 쪽 유지
+                self._save_meta(symbol, interval, {"start": min(start, meta.get("start", start))})
+
+        self._synced_at[(symbol.upper(), interval)] = time.time()
+
+# 글로벌 인스턴스
+bar_store = BarStore(os.getenv("BAR_STORE_DIR", DEFAULT_ROOT))
@@ -0,0 +1,153 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+# 캐시에 값이 없음을 나타내는 표식 (None도 정상 값으로 캐싱할 수 있도록 별도 객체 사용)
+MISSING = object()
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    negative: bool = False
+
+class TTLCache:
+    """
+    크기 제한(LRU)과 TTL을 가진 인메모리 캐시.
+    실패한 조회 결과는 set_negative()로 짧은 TTL 동안 캐싱하여 같은 오류 요청이 반복해서 업스트림을 호출하지 않도록 합니다.
+    stale_ttl을 주면 만료된 값도 그 시간 동안 보관하여 get_stale()로 꺼낼 수 있습니다. (stale-while-revalidate)
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60, negative_ttl: float = 10, stale_ttl: float = 0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """만료되지 않은 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            self._expire(key, entry, now)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        if entry.negative:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry.value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        만료되었더라도 stale 구간 안에 있는 정상 값을 반환합니다. (negative 캐시 값은 제외)
+        갱신이 진행되는 동안 이전 값을 응답하기 위한 용도입니다.
+        """
+        entry = self._data.get(key)
+        if entry is None or entry.negative:
+            return default
+        now = time.monotonic()
+        if entry.expires_at + self.stale_ttl <= now:
+            self._expire(key, entry, now)
+            return default
+        if entry.expires_at <= now:
+            self.stale_hits += 1
+        return entry.value
+
+    def ttl_remaining(self, key: Hashable) -> float:
+        """남은 유효 시간(초)을 반환합니다. 없으면 0, 이미 만료되었으면 음수입니다."""
+        entry = self._data.get(key)
+        if entry is None:
+            return 0.0
+        return entry.expires_at - time.monotonic()
+
+    def is_negative(self, key: Hashable) -> bool:
+        """만료되지 않은 negative 캐시 항목(최근 실패한 조회)이 있는지 여부"""
+        entry = self._data.get(key)
+        return entry is not None and entry.negative and entry.expires_at > time.monotonic()
+
+    def _expire(self, key: Hashable, entry: CacheEntry, now: float):
+        # stale 구간이 지난 항목(또는 negative 항목)만 실제로 제거
+        if entry.negative or entry.expires_at + self.stale_ttl <= now:
+            del self._data[key]
+            self.expirations += 1
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값을 저장합니다. ttl을 생략하면 네임스페이스 기본 TTL을 사용합니다."""
+        self._store(key, CacheEntry(value, time.monotonic() + (self.ttl if ttl is None else ttl)))
+
+    def set_negative(self, key: Hashable, value: Any = None):
+        """실패한 조회 결과(오류 응답 등)를 짧은 negative TTL로 저장합니다."""
+        self._store(key, CacheEntry(value, time.monotonic() + self.negative_ttl, negative=True))
+
+    def _store(self, key: Hashable, entry: CacheEntry):
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "negative_ttl": self.negative_ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": ((self.hits + self.negative_hits) / lookups) if lookups else 0.0,
+        }
+
+class CacheRegistry:
+    """네임스페이스별 TTLCache를 관리하고 통계를 한곳에서 조회할 수 있게 합니다."""
+
+    def __init__(self):
+        self._caches: Dict[str, TTLCache] = {}
+
+    def namespace(self, name: str, maxsize: int = 1024, ttl: float = 60, negative_ttl: float = 10, stale_ttl: float = 0) -> TTLCache:
+        """이름에 해당하는 캐시를 반환합니다. 처음 요청되면 주어진 설정으로 생성합니다."""
+        if name not in self._caches:
+            self._caches[name] = TTLCache(name, maxsize=maxsize, ttl=ttl, negative_ttl=negative_ttl, stale_ttl=stale_ttl)
+        return self._caches[name]
+
+    def get(self, name: str) -> Optional[TTLCache]:
+        return self._caches.get(name)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: cache.stats() for name, cache in self._caches.items()}
+
+# 글로벌 인스턴스
+cache_registry = CacheRegistry()
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger("executor")
+
+class BoundedExecutor:
+    """
+    블로킹 라이브러리 호출(yfinance 등)을 이벤트 루프 밖에서 실행하는 전용 스레드 풀.
+    동시 실행 수(max_workers)를 제한하고, 대기열 깊이 등 운영 지표를 집계합니다.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """func(*args, **kwargs)를 풀에서 실행하고 결과를 기다립니다."""
+        submitted_at = time.monotonic()
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        def job():
+            started_at = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += started_at - submitted_at
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._total_run += time.monotonic() - started_at
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, job)
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 대기열 깊이, 실행 중 작업 수, 누적 처리량 등 지표를 반환합니다."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": (self._total_wait / finished * 1000) if finished else 0.0,
+                "avg_run_ms": (self._total_run / finished * 1000) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info(f"Executor '{self.name}' shut down.")
+
+# yfinance 전용 풀 (동시 업스트림 호출 수 제한)
+yfinance_executor = BoundedExecutor("yfinance", max_workers=int(os.getenv("YFINANCE_MAX_WORKERS", "8")))
+
+async def run_yfinance(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """yfinance 블로킹 호출을 전용 풀에서 실행하는 단축 함수"""
+    return await yfinance_executor.run(func, *args, **kwargs)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from core.database import engine
+from core.lease_manager import LeaseManager
+from core.models import StockAsset, User
+from core.quote_feed import QuoteBoard, QuoteFeed, quote_board, quote_feed
+from core.trade_service import TradeService
+from core.trigger_index import PositionKey, Trigger, TriggerIndex
+
+logger = logging.getLogger("exit_manager")
+
+# 워커가 여러 개일 때 청산은 이 리스를 가진 워커 하나만 실행 (같은 포지션을 두 번 매도하지 않도록)
+EXIT_MANAGER_LEASE = "exit_manager"
+
+class ExitManager:
+    """
+    보유 포지션의 손절가/익절가를 TriggerIndex에 올려두고, 시세 보드의 틱마다 가격을 넘은 포지션만 청산합니다.
+    TradingWorker의 주기(60초)와 무관하게 틱 지연 수준으로 동작하며, 청산은 TradeService.execute_trade(SELL)로 실행합니다.
+    leases를 주면 EXIT_MANAGER_LEASE를 가진 동안에만 청산하고, 리스를 새로 얻으면 DB에서 인덱스를 다시 불러옵니다.
+    """
+
+    def __init__(self, trade_service: TradeService, board: QuoteBoard = quote_board, feed: QuoteFeed = quote_feed,
+                 leases: Optional[LeaseManager] = None):
+        self.trade_service = trade_service
+        self.board = board
+        self.feed = feed
+        self.leases = leases
+        self.is_active = leases is None
+        self.index = TriggerIndex()
+        self._pending: Set[PositionKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.is_running = False
+
+    def set_levels(self, user_id: int, symbol: str, stop_price: Optional[float], target_price: Optional[float]):
+        """포지션의 청산 가격을 인덱스에 반영하고, 해당 종목을 시세 피드에 등록합니다."""
+        self.index.set(user_id, symbol, stop_price, target_price)
+        if stop_price is not None or target_price is not None:
+            self.feed.watch([symbol])
+
+    async def load(self):
+        """DB에서 청산 가격이 설정된 보유 포지션을 읽어 인덱스를 다시 만듭니다."""
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with async_session() as session:
+            result = await session.execute(
+                select(StockAsset).where(
+                    StockAsset.quantity > 0,
+                    (StockAsset.stop_price != None) | (StockAsset.target_price != None),
+                )
+            )
+            assets = result.scalars().all()
+        self.index = TriggerIndex()
+        for asset in assets:
+            self.index.set(asset.user_id, asset.symbol, asset.stop_price, asset.target_price)
+        self.feed.watch(self.index.symbols())
+        logger.info(f"Loaded {len(self.index)} exit triggers")
+
+    def on_tick(self, symbol: str, quote: dict):
+        """틱 하나를 처리합니다. 발동한 트리거는 별도 태스크로 청산하여 다음 틱 처리를 막지 않습니다."""
+        price = quote.get("currentPrice")
+        if price is None or not self.is_active:
+            return
+        for trigger in self.index.crossed(symbol, price):
+            key = (trigger.user_id, trigger.symbol)
+            if key in self._pending:
+                continue
+            self._pending.add(key)
+            task = asyncio.create_task(self._exit(trigger))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _exit(self, trigger: Trigger):
+        key = (trigger.user_id, trigger.symbol)
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with async_session() as session:
+                user = await session.get(User, trigger.user_id)
+                result = await session.execute(
+                    select(StockAsset).where(StockAsset.user_id == trigger.user_id, StockAsset.symbol == trigger.symbol)
+                )
+                asset = result.scalar_one_or_none()
+                # 그 사이 매도되었거나 청산 가격이 바뀐 포지션은 건너뜀
+                if user is None or asset is None or asset.quantity <= 0:
+                    return
+                level = asset.stop_price if trigger.kind == "STOP" else asset.target_price
+                if level != trigger.level:
+                    return
+                label = "손절" if trigger.kind == "STOP" else "익절"
+                logger.info(f"🎯 {label} {trigger.symbol} for user {trigger.user_id}: price {trigger.price} crossed {trigger.level}")
+                result = await self.trade_service.execute_trade(session, user, trigger.symbol, asset.quantity, "SELL")
+                if "error" in result:
+                    logger.error(f"Exit order failed for {trigger.symbol} (user {trigger.user_id}): {result['error']}")
+                    # 다음 틱에서 다시 시도하도록 인덱스에 되돌림
+                    self.index.set(trigger.user_id, trigger.symbol, asset.stop_price, asset.target_price)
+        except Exception as e:
+            logger.error(f"Exit execution error for {trigger.symbol} (user {trigger.user_id}): {e}")
+        finally:
+            self._pending.discard(key)
+
+    async def hold_lease(self):
+        """청산 리스를 주기적으로 선점/연장합니다. 리스를 새로 얻은 워커는 인덱스를 DB에서 다시 만듭니다."""
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        while self.is_running:
+            try:
+                async with async_session() as session:
+                    acquired = await self.leases.acquire(session, EXIT_MANAGER_LEASE)
+                if acquired and not self.is_active:
+                    await self.load()
+                    logger.info(f"🔑 Exit manager lease acquired by {self.leases.worker_id}")
+                self.is_active = acquired
+            except Exception as e:
+                logger.error(f"Exit manager lease error: {e}")
+            await asyncio.sleep(self.leases.lease_seconds / 3)
+
+    async def start(self):
+        """인덱스를 불러온 뒤(리스 사용 시 리스를 얻은 뒤) 시세 보드를 구독하여 틱마다 트리거를 확인합니다."""
+        self.is_running = True
+        lease_task = None
+        if self.leases is None:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"Failed to load exit triggers: {e}")
+        else:
+            lease_task = asyncio.create_task(self.hold_lease())
+        queue = self.board.subscribe()
+        try:
+            while self.is_running:
+                symbol, quote = await queue.get()
+                self.on_tick(symbol, quote)
+        finally:
+            self.board.unsubscribe(queue)
+            if lease_task is not None:
+                lease_task.cancel()
+
+    def stop(self):
+        self.is_running = False
@@ -0,0 +1,202 @@
+import ast
+import json
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from core.cache import cache_registry
+
+# 규칙에서 사용할 수 있는 변수 (지표 배열 또는 최신값)
+VARIABLES = (
+    "close", "open", "high", "low", "volume",
+    "rsi", "macd", "macd_signal", "macd_hist",
+    "bb_upper", "bb_middle", "bb_lower",
+)
+
+_COMPARE_OPS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_BIN_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+_FUNCTIONS = {"abs": np.abs, "min": np.minimum, "max": np.maximum}
+
+# 규칙 문자열 길이와 구문 트리 깊이 상한. 깊게 중첩된 입력이 파서/컴파일/평가에서 재귀 한도를 넘지 않도록 제한
+RULE_MAX_LENGTH = 500
+RULE_MAX_DEPTH = 32
+
+Evaluator = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+class RuleError(ValueError):
+    """규칙 문법 오류 또는 허용되지 않은 구문"""
+
+def _compile_node(node: ast.AST) -> Evaluator:
+    """허용된 AST 노드만 numpy 연산 클로저로 변환합니다. (eval을 사용하지 않음)"""
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_node(v) for v in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        def bool_op(env):
+            result = parts[0](env)
+            for part in parts[1:]:
+                result = combine(result, part(env))
+            return result
+        return bool_op
+
+    if isinstance(node, ast.Compare):
+        left = _compile_node(node.left)
+        pairs = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in _COMPARE_OPS:
+                raise RuleError(f"Unsupported comparison: {type(op).__name__}")
+            pairs.append((_COMPARE_OPS[type(op)], _compile_node(comparator)))
+        def compare(env):
+            # 체인 비교(a < b < c)는 a < b and b < c. NaN과의 비교는 False
+            lhs, result = left(env), True
+            for op, right in pairs:
+                rhs = right(env)
+                with np.errstate(invalid="ignore"):
+                    result = np.logical_and(result, op(lhs, rhs))
+                lhs = rhs
+            return result
+        return compare
+
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in _BIN_OPS:
+            raise RuleError(f"Unsupported operator: {type(node.op).__name__}")
+        op, left, right = _BIN_OPS[type(node.op)], _compile_node(node.left), _compile_node(node.right)
+        def bin_op(env):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return op(left(env), right(env))
+        return bin_op
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_node(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda env: np.logical_not(operand(env))
+        if isinstance(node.op, ast.USub):
+            return lambda env: -operand(env)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        raise RuleError(f"Unsupported operator: {type(node.op).__name__}")
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+            raise RuleError("Only abs(), min(a, b) and max(a, b) calls are allowed")
+        func, args = _FUNCTIONS[node.func.id], [_compile_node(a) for a in node.args]
+        if len(args) != (1 if node.func.id == "abs" else 2):
+            raise RuleError(f"Wrong number of arguments for {node.func.id}()")
+        return lambda env: func(*(a(env) for a in args))
+
+    if isinstance(node, ast.Name):
+        if node.id not in VARIABLES:
+            raise RuleError(f"Unknown variable: {node.id} (available: {', '.join(VARIABLES)})")
+        name = node.id
+        return lambda env: env[name]
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = float(node.value)
+        return lambda env: value
+
+    raise RuleError(f"Unsupported syntax: {type(node).__name__}")
+
+def _check_depth(tree: ast.AST):
+    """구문 트리 깊이를 재귀 없이 확인합니다."""
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > RULE_MAX_DEPTH:
+            raise RuleError(f"Rule is nested too deeply (max depth {RULE_MAX_DEPTH})")
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+
+@lru_cache(maxsize=1024)
+def compile_rule(text: str) -> Evaluator:
+    """
+    규칙 문자열(예: "rsi < 30 and close < bb_lower")을 지표 배열에 대한 벡터화된 판정 함수로 컴파일합니다.
+    반환된 함수는 {변수: 배열 또는 스칼라}를 받아 bool 배열을 반환합니다.
+    """
+    if not isinstance(text, str):
+        raise RuleError("Rule must be a string")
+    if not text.strip():
+        raise RuleError("Empty rule")
+    if len(text) > RULE_MAX_LENGTH:
+        raise RuleError(f"Rule is too long (max {RULE_MAX_LENGTH} characters)")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        _check_depth(tree)
+        evaluator = _compile_node(tree.body)
+    except SyntaxError as e:
+        raise RuleError(f"Invalid rule syntax: {e.msg}") from None
+    except (RecursionError, MemoryError):
+        raise RuleError("Rule is too complex") from None
+    return lambda env: np.asarray(evaluator(env), dtype=bool)
+
+@dataclass(frozen=True)
+class CompiledStrategy:
+    buy: Optional[Evaluator]
+    sell: Optional[Evaluator]
+
+    def signals(self, env: Dict[str, Any]) -> np.ndarray:
+        """바마다 +1(BUY) / -1(SELL) / 0(HOLD). 두 규칙이 동시에 참이면 BUY (RSI_LIMIT와 같은 우선순위)"""
+        buy = self.buy(env) if self.buy else False
+        sell = self.sell(env) if self.sell else False
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+
+def rule_texts(params: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """파라미터에서 (매수 규칙, 매도 규칙)을 꺼냅니다. "rule"은 "buy_rule"의 별칭입니다."""
+    return params.get("buy_rule") or params.get("rule"), params.get("sell_rule")
+
+def compile_strategy(params: Dict[str, Any]) -> CompiledStrategy:
+    buy_text, sell_text = rule_texts(params)
+    if not buy_text and not sell_text:
+        raise RuleError("EXPRESSION strategy needs 'buy_rule' (or 'rule') and/or 'sell_rule'")
+    return CompiledStrategy(
+        compile_rule(buy_text) if buy_text else None,
+        compile_rule(sell_text) if sell_text else None,
+    )
+
+# 전략 버전별 컴파일 결과 캐시: (전략 id, updated_at, 규칙 문자열) -> CompiledStrategy
+compiled_strategies = cache_registry.namespace("strategy_rules", maxsize=1024, ttl=7 * 24 * 3600)
+
+def get_compiled_strategy(strategy) -> CompiledStrategy:
+    """TradingStrategy의 규칙을 한 번만 컴파일하고, 전략이 바뀔 때까지 재사용합니다."""
+    params = json.loads(strategy.parameters or "{}")
+    key = (strategy.id, strategy.updated_at, *rule_texts(params))
+    compiled = compiled_strategies.get(key)
+    if compiled is None:
+        compiled = compile_strategy(params)
+        compiled_strategies.set(key, compiled)
+    return compiled
+
+def env_from_indicators(indicators: Dict[str, Any]) -> Dict[str, float]:
+    """get_indicators()/get_latest_indicators()의 최신값을 규칙 변수로 변환합니다. (값이 없으면 NaN)"""
+    def value(v):
+        return np.nan if v is None else float(v)
+    macd = indicators.get("macd") or {}
+    bollinger = indicators.get("bollinger") or {}
+    ohlcv = indicators.get("ohlcv") or {}
+    return {
+        "close": value(indicators.get("current_price")),
+        "open": value(ohlcv.get("open")),
+        "high": value(ohlcv.get("high")),
+        "low": value(ohlcv.get("low")),
+        "volume": value(ohlcv.get("volume")),
+        "rsi": value(indicators.get("rsi")),
+        "macd": value(macd.get("val")),
+        "macd_signal": value(macd.get("signal")),
+        "macd_hist": value(macd.get("hist")),
+        "bb_upper": value(bollinger.get("upper")),
+        "bb_middle": value(bollinger.get("middle")),
+        "bb_lower": value(bollinger.get("lower")),
+    }
+
+def env_from_panel(bars, panel: Dict[str, np.ndarray], row: int = 0) -> Dict[str, np.ndarray]:
+    """바 배열과 IndicatorService.calculate_panel() 결과를 규칙 변수 배열로 변환합니다. (백테스트용)"""
+    return {
+        "close": np.asarray(bars.close), "open": np.asarray(bars.open), "high": np.asarray(bars.high),
+        "low": np.asarray(bars.low), "volume": np.asarray(bars.volume),
+        "rsi": panel["rsi"][row], "macd": panel["macd"][row], "macd_signal": panel["signal"][row],
+        "macd_hist": panel["histogram"][row], "bb_upper": panel["upper"][row],
+        "bb_middle": panel["middle"][row], "bb_lower": panel["lower"][row],
+    }
@@ -0,0 +1,75 @@
+import importlib.util
+import logging
+from typing import Any, Dict
+
+import httpx
+
+logger = logging.getLogger("http_client")
+
+# h2 패키지가 설치된 경우에만 HTTP/2 사용 (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class HTTPClientRegistry:
+    """
+    업스트림별로 하나씩 keep-alive 커넥션 풀을 공유하는 httpx.AsyncClient 레지스트리.
+    호출마다 새 클라이언트를 만들며 발생하던 TCP/TLS 핸드셰이크 비용을 없앱니다.
+    API 서버는 lifespan에서 start()/aclose()를 호출하고, 스크립트는 첫 get() 시점에 지연 생성됩니다.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def register(
+        self,
+        name: str,
+        base_url: str = "",
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = True,
+        **client_kwargs
+    ):
+        """업스트림 설정을 등록합니다. (타임아웃/커넥션 제한은 업스트림마다 독립적)"""
+        self._configs[name] = {
+            "base_url": base_url,
+            "timeout": httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+            "http2": http2 and HTTP2_AVAILABLE,
+            **client_kwargs,
+        }
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """업스트림 이름에 해당하는 공유 클라이언트를 반환합니다."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            if name not in self._configs:
+                raise KeyError(f"Unknown upstream: {name}")
+            client = httpx.AsyncClient(**self._configs[name])
+            self._clients[name] = client
+        return client
+
+    async def start(self):
+        """등록된 모든 업스트림 클라이언트를 미리 생성합니다."""
+        for name in self._configs:
+            self.get(name)
+        logger.info(f"HTTP clients ready: {', '.join(self._configs)} (http2={HTTP2_AVAILABLE})")
+
+    async def aclose(self):
+        """모든 클라이언트의 커넥션 풀을 닫습니다."""
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close HTTP client {name}: {e}")
+        self._clients.clear()
+
+# 글로벌 인스턴스 (업스트림별 설정)
+http_clients = HTTPClientRegistry()
+http_clients.register("yahoo", timeout=10.0, max_connections=20, headers={
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+http_clients.register("telegram", base_url="https://api.telegram.org", timeout=10.0, max_connections=5)
+http_clients.register("ollama", timeout=60.0, max_connections=4, http2=False)
+http_clients.register("kis", timeout=10.0, max_connections=10)
+http_clients.register("rss", timeout=10.0, max_connections=10, follow_redirects=True)
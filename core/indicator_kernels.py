@@ -0,0 +1,135 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# float64 배열용 지표 커널. 60~250개 정도의 짧은 시계열에서는 pandas rolling/ewm의 객체 생성 비용이
+# 실제 연산보다 크므로, IndicatorService의 pandas 구현과 같은 값을 numpy 연산만으로 계산합니다.
+# 모든 함수는 1차원(시간) 또는 2차원(종목 × 시간) 배열을 받아 마지막 축(시간) 방향으로 계산합니다.
+# 앞쪽 NaN(이력이 짧은 종목의 채움 구간)은 건너뛰고, 윈도우가 다 차지 않은 구간은 NaN입니다.
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """이동평균. 윈도우에 NaN이 하나라도 있으면 NaN (pandas rolling(window).mean()과 동일)"""
+    values = _as_float(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(values, window, axis=-1).mean(axis=-1)
+    return out
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """이동 표본표준편차 (pandas rolling(window).std()와 동일)"""
+    values = _as_float(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(values, window, axis=-1).std(axis=-1, ddof=ddof)
+    return out
+
+# 1차원 EMA 블록 계산에서 허용하는 감쇠 계수의 최대 역수 (블록 길이를 정함, float64 범위 안에서 충분히 작음)
+EMA_BLOCK_GROWTH = 1e12
+
+def _ema_1d(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    1차원 EMA를 블록 단위 누적합으로 계산합니다. 블록 안에서
+    e_j = d^(j+1) · (p + α · Σ_{k≤j} x_k · d^-(k+1))  (d = 1-α, p = 직전 블록의 마지막 값)
+    이므로 파이썬 반복은 블록 수만큼만 돕니다. d^-(k+1)이 EMA_BLOCK_GROWTH를 넘지 않도록 블록을 자릅니다.
+    """
+    out = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    first = valid[0]
+    decay = 1 - alpha
+    if decay <= 0:
+        out[first:] = values[first:]
+        return out
+    block = max(1, int(math.log(EMA_BLOCK_GROWTH) / -math.log(decay)))
+    powers = decay ** np.arange(1, min(block, len(values)) + 1)
+    scale = 1 / powers
+    out[first] = prev = values[first]
+    for start in range(first + 1, len(values), block):
+        x = values[start:start + block]
+        m = len(x)
+        chunk = powers[:m] * (prev + alpha * np.cumsum(x * scale[:m]))
+        out[start:start + m] = chunk
+        prev = chunk[-1]
+    return out
+
+def ema(values: np.ndarray, span: Optional[float] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    지수이동평균 (pandas ewm(span 또는 alpha, adjust=False).mean()과 동일).
+    1차원은 블록 누적합으로, 2차원(또는 중간에 NaN이 있는 경우)은 시간축으로 반복하며 종목 방향으로 벡터화합니다.
+    중간 NaN 이후에는 다음 값에서 새로 시작합니다.
+    """
+    if alpha is None:
+        alpha = 2 / (span + 1)
+    values = _as_float(values)
+    if values.ndim == 1:
+        valid = ~np.isnan(values)
+        if valid.all() or not valid.any() or valid[np.argmax(valid):].all():
+            return _ema_1d(values, alpha)
+        return ema(values[np.newaxis, :], alpha=alpha)[0]
+    out = np.empty(values.shape)
+    prev = np.full(values.shape[:-1], np.nan)
+    for t in range(values.shape[-1]):
+        x = values[..., t]
+        prev = np.where(np.isnan(prev), x, prev + alpha * (x - prev))
+        out[..., t] = prev
+    return out
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """단순 이동평균 RSI. 첫 바의 변화량은 0 (pandas diff + where와 동일), 채움 구간은 NaN 유지"""
+    close = _as_float(close)
+    valid = ~np.isnan(close)
+    delta = np.full(close.shape, np.nan)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    delta = np.where(valid, np.nan_to_num(delta), np.nan)
+    gain = rolling_mean(np.where(delta > 0, delta, np.where(valid, 0.0, np.nan)), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, np.where(valid, 0.0, np.nan)), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + gain / loss))
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD선(빠른 EMA - 느린 EMA), 시그널선, 히스토그램"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+def bollinger(close: np.ndarray, period: int = 20, std_dev: float = 2) -> Dict[str, np.ndarray]:
+    """볼린저 밴드 (이동평균 ± 표본표준편차 × std_dev)"""
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    return {"upper": middle + std * std_dev, "middle": middle, "lower": middle - std * std_dev}
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(고가-저가, |고가-전일 종가|, |저가-전일 종가|). 첫 바는 고가-저가"""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[..., 1:] = close[..., :-1]
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """ATR (Wilder 평활: true range의 ewm(alpha=1/period, adjust=False))"""
+    return ema(true_range(high, low, close), alpha=1 / period)
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         sessions: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    거래량 가중 평균가 (대표가격 (고+저+종)/3 기준 누적). 1차원 전용.
+    sessions(예: 거래일 키)를 주면 값이 바뀌는 지점마다 누적을 다시 시작합니다.
+    """
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3
+    volume = _as_float(volume)
+    pv = typical * volume
+    cum_pv, cum_v = np.cumsum(pv), np.cumsum(volume)
+    if sessions is not None and len(volume):
+        sessions = np.asarray(sessions)
+        is_start = np.r_[True, sessions[1:] != sessions[:-1]]
+        first = np.flatnonzero(is_start)[np.cumsum(is_start) - 1]
+        cum_pv = cum_pv - (cum_pv[first] - pv[first])
+        cum_v = cum_v - (cum_v[first] - volume[first])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cum_pv / cum_v
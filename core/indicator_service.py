@@ -1,7 +1,54 @@
+import asyncio
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
-import yfinance as yf
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from core.bar_store import NY_TZ, Bars, bar_store, ny_utc_offsets
+from core.cache import cache_registry
+from core import indicator_kernels as kernels
+
+# 단일 종목 지표 계산 백엔드: numpy(기본, indicator_kernels) 또는 pandas(rolling/ewm)
+INDICATOR_BACKENDS = ("numpy", "pandas")
+INDICATOR_BACKEND = os.getenv("INDICATOR_BACKEND", "numpy")
+
+# 계산된 지표 결과 캐시. 키에 마지막 바(시각, 종가)가 들어가므로 새 바가 오거나 진행 중인 바가 갱신될 때만 무효화됨
+indicator_cache = cache_registry.namespace("indicators", maxsize=1024, ttl=24 * 3600)
+
+# format=columnar에서 선택할 수 있는 필드 (패널 결과 키 또는 바 컬럼)
+COLUMNAR_FIELDS = {
+    "price": "close", "open": "open", "high": "high", "low": "low", "volume": "volume",
+    "rsi": "rsi", "macd": "macd", "macd_signal": "signal", "macd_hist": "histogram",
+    "bb_upper": "upper", "bb_middle": "middle", "bb_lower": "lower",
+    "atr": "atr", "vwap": "vwap",
+}
+DEFAULT_COLUMNAR_FIELDS = ("date", "price", "rsi", "macd", "macd_hist")
+
+def to_json_floats(values: np.ndarray) -> list:
+    """float 배열을 NaN -> None인 리스트로 변환합니다. (행 단위 반복 없이 변환)"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), None, values).tolist()
+
+def is_intraday(interval: str) -> bool:
+    """분/시간봉 여부 ("1m", "5m", "1h" 등. "1mo"는 제외)"""
+    return interval[-1] in ("m", "h") and not interval.endswith("mo")
+
+def format_bar_dates(ts: np.ndarray, interval: str) -> list:
+    """epoch 초 배열을 뉴욕 현지 날짜(일봉 이상) 또는 날짜+시각(분/시간봉) 문자열 리스트로 변환합니다."""
+    ts = np.asarray(ts, dtype=np.int64)
+    if len(ts) == 0:
+        return []
+    local = (ts + ny_utc_offsets(ts)).astype("datetime64[s]")
+    unit = "m" if is_intraday(interval) else "D"
+    return np.datetime_as_string(local, unit=unit).tolist()
+
+def last_ohlcv(bars: Bars) -> Dict[str, float]:
+    """마지막 바의 시가/고가/저가/종가/거래량"""
+    return {c: float(getattr(bars, c)[-1]) for c in ("open", "high", "low", "close", "volume")}
+
+def indicator_cache_key(symbol: str, interval: str, period: str, bars: Bars) -> Tuple:
+    """(종목, 주기, 기간, 마지막 바 시각, 마지막 바 종가)"""
+    return (symbol.upper(), interval, period, int(bars.ts[-1]), float(bars.close[-1]))
 
 class IndicatorService:
     @staticmethod
@@ -43,53 +90,218 @@ class IndicatorService:
             "lower": lower_band
         }
 
-    async def get_indicators(self, symbol: str, interval: str = "1d", period: str = "3mo") -> Dict[str, Any]:
-        """특정 종목의 기술적 지표 및 차트 데이터를 반환"""
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period, interval=interval)
-        
-        if df.empty:
+    @staticmethod
+    def calculate_ema(series: pd.Series, span: int) -> pd.Series:
+        """지수이동평균 계산"""
+        return series.ewm(span=span, adjust=False).mean()
+
+    @staticmethod
+    def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+        """ATR (Average True Range, Wilder 평활) 계산"""
+        prev_close = close.shift(1)
+        true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+        return true_range.ewm(alpha=1 / period, adjust=False).mean()
+
+    @staticmethod
+    def calculate_vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+                       sessions: Optional[Sequence] = None) -> pd.Series:
+        """VWAP 계산 (sessions를 주면 세션(거래일)마다 누적을 다시 시작)"""
+        pv = (high + low + close) / 3 * volume
+        if sessions is None:
+            return pv.cumsum() / volume.cumsum()
+        keys = np.asarray(sessions)
+        return pv.groupby(keys).cumsum() / volume.groupby(keys).cumsum()
+
+    def __init__(self, backend: str = INDICATOR_BACKEND):
+        if backend not in INDICATOR_BACKENDS:
+            raise ValueError(f"Unknown indicator backend: {backend} (available: {', '.join(INDICATOR_BACKENDS)})")
+        self.backend = backend
+
+    def compute_series(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        한 종목의 RSI/MACD/볼린저 밴드 전체 시계열을 선택된 백엔드로 계산합니다.
+        numpy는 indicator_kernels, pandas는 위의 calculate_* 메서드를 사용하며 결과는 같습니다.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        if self.backend == "numpy":
+            return {"rsi": kernels.rsi(close), **kernels.macd(close), **kernels.bollinger(close)}
+        series = pd.Series(close)
+        result = {"rsi": self.calculate_rsi(series), **self.calculate_macd(series), **self.calculate_bollinger_bands(series)}
+        return {key: value.to_numpy() for key, value in result.items()}
+
+    @staticmethod
+    def calculate_rsi_panel(closes: np.ndarray, period: int = 14) -> np.ndarray:
+        """행별 RSI (종목 × 시간). 1차원 입력은 한 행짜리 패널로 취급합니다."""
+        return kernels.rsi(np.atleast_2d(np.asarray(closes, dtype=np.float64)), period)
+
+    @staticmethod
+    def calculate_panel(closes: np.ndarray, rsi_period: int = 14, fast: int = 12, slow: int = 26, signal: int = 9,
+                        bb_period: int = 20, std_dev: int = 2) -> Dict[str, np.ndarray]:
+        """
+        여러 종목의 종가 행렬(종목 × 시간)로 RSI/MACD/볼린저 밴드를 한 번에 계산합니다.
+        이력이 짧은 종목은 앞쪽을 NaN으로 채워 오른쪽(최신)에 맞춥니다. 각 행의 결과는 종목별 배치 함수와 같습니다.
+        """
+        closes = np.atleast_2d(np.asarray(closes, dtype=np.float64))
+        return {
+            "rsi": kernels.rsi(closes, rsi_period),
+            **kernels.macd(closes, fast, slow, signal),
+            **kernels.bollinger(closes, bb_period, std_dev),
+        }
+
+    async def get_latest_indicators(self, symbols: List[str], interval: str = "1d", period: str = "3mo") -> Dict[str, Dict[str, Any]]:
+        """
+        여러 종목의 최신 지표를 바 저장소에서 읽어 패널 모드로 한 번에 계산합니다.
+        반환 형식은 종목별 get_indicators()의 최신값(history 제외)과 같고, 데이터가 없으면 {"error": ...}입니다.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        all_bars = await asyncio.gather(*[bar_store.get_bars(s, interval=interval, period=period) for s in symbols])
+        results: Dict[str, Dict[str, Any]] = {}
+        loaded = []
+        for symbol, bars in zip(symbols, all_bars):
+            if len(bars) == 0:
+                results[symbol] = {"error": "No data found"}
+                continue
+            # 같은 바에 대해 이미 계산된 결과가 있으면 패널에서 제외
+            cached = indicator_cache.get(indicator_cache_key(symbol, interval, period, bars))
+            if cached is not None:
+                results[symbol] = {k: v for k, v in cached.items() if k != "history"}
+            else:
+                loaded.append((symbol, bars))
+        if not loaded:
+            return results
+
+        # 지표는 종목마다 독립적이므로 시각이 아닌 마지막 바 기준으로 오른쪽 정렬
+        width = max(len(b) for _, b in loaded)
+        closes = np.full((len(loaded), width), np.nan)
+        for row, (_, bars) in enumerate(loaded):
+            closes[row, width - len(bars):] = bars.close
+        panel = self.calculate_panel(closes)
+
+        def latest(key: str, row: int):
+            value = panel[key][row, -1]
+            return None if np.isnan(value) else float(value)
+
+        for row, (symbol, bars) in enumerate(loaded):
+            results[symbol] = {
+                "symbol": symbol,
+                "current_price": float(bars.close[-1]),
+                "rsi": latest("rsi", row),
+                "macd": {"val": latest("macd", row), "signal": latest("signal", row), "hist": latest("histogram", row)},
+                "bollinger": {"upper": latest("upper", row), "middle": latest("middle", row), "lower": latest("lower", row)},
+                "ohlcv": last_ohlcv(bars),
+                "timestamp": pd.Timestamp(int(bars.ts[-1]), unit="s", tz="UTC").tz_convert("America/New_York").isoformat(),
+            }
+        return results
+
+    async def get_indicators_columnar(self, symbol: str, fields: Optional[Sequence[str]] = None, limit: int = 60,
+                                      interval: str = "1d", period: str = "3mo", base: Optional[str] = None) -> Dict[str, Any]:
+        """
+        get_indicators()의 columnar 버전. history를 행 목록 대신 필드별 병렬 배열로 반환하며,
+        pandas 없이 바 배열과 패널 계산 결과를 벡터 연산으로 변환합니다. (긴 차트 구간용)
+        """
+        fields = tuple(dict.fromkeys(fields or DEFAULT_COLUMNAR_FIELDS))
+        unknown = [f for f in fields if f != "date" and f not in COLUMNAR_FIELDS]
+        if unknown:
+            return {"error": f"Unknown fields: {', '.join(unknown)}"}
+
+        try:
+            bars = await bar_store.get_bars(symbol, interval=interval, period=period, base=base)
+        except ValueError as e:
+            return {"error": str(e)}
+        if len(bars) == 0:
             return {"error": "No data found"}
 
-        close = df['Close']
-        
-        # 지표 계산
-        rsi = self.calculate_rsi(close)
-        macd_data = self.calculate_macd(close)
-        bb_data = self.calculate_bollinger_bands(close)
-        
-        # 차트용 데이터 리스트 생성 (마지막 30개 데이터 우선 반환)
-        history = []
-        plot_df = df.tail(60).copy() # 최근 60개 데이터 사용
-        plot_rsi = rsi.tail(60)
-        plot_macd = macd_data["macd"].tail(60)
-        plot_macd_hist = macd_data["histogram"].tail(60)
-        
-        for i in range(len(plot_df)):
-            idx = plot_df.index[i]
-            history.append({
-                "date": idx.strftime("%Y-%m-%d"),
-                "price": float(plot_df['Close'].iloc[i]),
-                "rsi": float(plot_rsi.iloc[i]) if not np.isnan(plot_rsi.iloc[i]) else None,
-                "macd": float(plot_macd.iloc[i]) if not np.isnan(plot_macd.iloc[i]) else None,
-                "macd_hist": float(plot_macd_hist.iloc[i]) if not np.isnan(plot_macd_hist.iloc[i]) else None,
-            })
-
-        latest_idx = -1
+        cache_key = indicator_cache_key(symbol, interval, period, bars) + (base, "columnar", fields, limit)
+        cached = indicator_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        panel = self.calculate_panel(bars.close)
+        # ATR/VWAP은 요청된 경우에만 계산 (VWAP은 분/시간봉이면 거래일마다 누적을 다시 시작)
+        if "atr" in fields:
+            panel["atr"] = kernels.atr(bars.high, bars.low, bars.close)[np.newaxis, :]
+        if "vwap" in fields:
+            sessions = (bars.ts + ny_utc_offsets(bars.ts)) // 86400 if is_intraday(interval) else None
+            panel["vwap"] = kernels.vwap(bars.high, bars.low, bars.close, bars.volume, sessions)[np.newaxis, :]
+        view = bars.tail(limit)
+        start = len(bars) - len(view)
+        columns: Dict[str, list] = {}
+        for field in fields:
+            if field == "date":
+                columns["date"] = format_bar_dates(view.ts, interval)
+                continue
+            key = COLUMNAR_FIELDS[field]
+            if key in panel:
+                columns[field] = to_json_floats(panel[key][0, start:])
+            else:
+                columns[field] = to_json_floats(getattr(view, key))
+
+        def latest(key: str) -> Optional[float]:
+            value = panel[key][0, -1]
+            return None if np.isnan(value) else float(value)
+
+        result = {
+            "symbol": symbol,
+            "format": "columnar",
+            "current_price": float(bars.close[-1]),
+            "rsi": latest("rsi"),
+            "macd": {"val": latest("macd"), "signal": latest("signal"), "hist": latest("histogram")},
+            "bollinger": {"upper": latest("upper"), "middle": latest("middle"), "lower": latest("lower")},
+            "length": len(view),
+            "columns": columns,
+            "timestamp": datetime.fromtimestamp(int(bars.ts[-1]), tz=NY_TZ).isoformat(),
+        }
+        indicator_cache.set(cache_key, result)
+        return result
+
+    async def get_indicators(self, symbol: str, interval: str = "1d", period: str = "3mo",
+                             base: Optional[str] = None) -> Dict[str, Any]:
+        """특정 종목의 기술적 지표 및 차트 데이터를 반환 (base를 주면 그 주기 바를 interval로 리샘플링하여 계산)"""
+        # 로컬 바 저장소에서 읽기 (새로 생긴 바만 yfinance에서 받아 덧붙임)
+        try:
+            bars = await bar_store.get_bars(symbol, interval=interval, period=period, base=base)
+        except ValueError as e:
+            return {"error": str(e)}
+        if len(bars) == 0:
+            return {"error": "No data found"}
+
+        # 같은 바 안에서의 반복 요청(여러 전략/사용자)은 계산 결과를 그대로 반환
+        cache_key = indicator_cache_key(symbol, interval, period, bars) + ((base,) if base else ())
+        cached = indicator_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        result = self._compute_indicators(symbol, bars)
+        indicator_cache.set(cache_key, result)
+        return result
+
+    def _compute_indicators(self, symbol: str, bars: Bars) -> Dict[str, Any]:
+        """바 배열로 지표와 차트용 history를 계산합니다."""
+        close = np.asarray(bars.close, dtype=np.float64)
+        series = self.compute_series(close)
+
+        # 차트용 데이터 리스트 생성 (최근 60개 데이터 사용)
+        start = max(len(close) - 60, 0)
+        history = [
+            {"date": date, "price": price, "rsi": rsi, "macd": macd, "macd_hist": hist}
+            for date, price, rsi, macd, hist in zip(
+                format_bar_dates(bars.ts[start:], "1d"),
+                close[start:].tolist(),
+                to_json_floats(series["rsi"][start:]),
+                to_json_floats(series["macd"][start:]),
+                to_json_floats(series["histogram"][start:]),
+            )
+        ]
+
+        def latest(key: str) -> float:
+            return float(series[key][-1])
+
         return {
             "symbol": symbol,
-            "current_price": float(close.iloc[latest_idx]),
-            "rsi": float(rsi.iloc[latest_idx]) if not np.isnan(rsi.iloc[latest_idx]) else None,
-            "macd": {
-                "val": float(macd_data["macd"].iloc[latest_idx]),
-                "signal": float(macd_data["signal"].iloc[latest_idx]),
-                "hist": float(macd_data["histogram"].iloc[latest_idx])
-            },
-            "bollinger": {
-                "upper": float(bb_data["upper"].iloc[latest_idx]),
-                "middle": float(bb_data["middle"].iloc[latest_idx]),
-                "lower": float(bb_data["lower"].iloc[latest_idx])
-            },
+            "current_price": float(close[-1]),
+            "rsi": None if np.isnan(series["rsi"][-1]) else latest("rsi"),
+            "macd": {"val": latest("macd"), "signal": latest("signal"), "hist": latest("histogram")},
+            "bollinger": {"upper": latest("upper"), "middle": latest("middle"), "lower": latest("lower")},
+            "ohlcv": last_ohlcv(bars),
             "history": history,
-            "timestamp": df.index[latest_idx].isoformat()
+            "timestamp": datetime.fromtimestamp(int(bars.ts[-1]), tz=NY_TZ).isoformat(),
         }
\ No newline at end of file
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from core.database import engine
+from core.models import Job
+
+logger = logging.getLogger("job_queue")
+
+JOB_PENDING = "PENDING"
+JOB_RUNNING = "RUNNING"
+JOB_DONE = "DONE"
+JOB_FAILED = "FAILED"
+
+# 작업 종류. OPTIMIZE는 무거운 계산 작업, EXIT_LEVELS는 API -> 워커 신호 (청산 가격 변경)
+JOB_OPTIMIZE = "OPTIMIZE"
+JOB_EXIT_LEVELS = "EXIT_LEVELS"
+
+# 대기 작업이 없을 때 다시 확인하는 주기 (초)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# 실행 중인 작업의 리스. 워커가 이 시간 안에 갱신하지 못하면(워커 종료 등) 다른 워커가 다시 가져감
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+# 작업 실행 중 리스를 연장하는 주기 (초). JOB_LEASE_SECONDS보다 충분히 짧아야 함
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# 끝난 작업(DONE/FAILED) 보관 기간 (초). EXIT_LEVELS 신호는 결과를 조회하지 않으므로 더 짧게 보관
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+JOB_SIGNAL_RETENTION_SECONDS = float(os.getenv("JOB_SIGNAL_RETENTION_SECONDS", "3600"))
+# 오래된 작업을 정리하는 주기 (초)
+JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "3600"))
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+class JobQueue:
+    """
+    API와 워커 프로세스가 공유하는 DB 작업/신호 큐 (job 테이블).
+    API는 enqueue로 행을 쌓고, 워커는 SELECT ... FOR UPDATE SKIP LOCKED로 한 건씩 가져가므로
+    여러 워커가 같은 작업을 실행하지 않고, 어느 쪽 프로세스가 재시작되어도 작업이 남아 있습니다.
+    """
+
+    def __init__(self, lease_seconds: float = JOB_LEASE_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retention_seconds: float = JOB_RETENTION_SECONDS,
+                 signal_retention_seconds: float = JOB_SIGNAL_RETENTION_SECONDS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.signal_retention_seconds = signal_retention_seconds
+
+    async def enqueue(self, session: AsyncSession, kind: str, payload: Dict[str, Any],
+                      user_id: Optional[int] = None) -> Job:
+        job = Job(kind=kind, payload=json.dumps(payload), user_id=user_id)
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        return job
+
+    async def claim(self, session: AsyncSession, kinds: Iterable[str], worker_id: str) -> Optional[Job]:
+        """
+        kinds 중 가장 오래된 대기 작업(또는 리스가 만료된 실행 중 작업)을 가져와 RUNNING으로 바꿉니다.
+        재시도 횟수를 넘긴 만료 작업은 실행하지 않고 FAILED로 정리합니다.
+        """
+        kinds = list(kinds)
+        if not kinds:
+            return None
+        while True:
+            now = datetime.utcnow()
+            result = await session.execute(
+                select(Job)
+                .where(
+                    Job.kind.in_(kinds),
+                    or_(Job.status == JOB_PENDING, and_(Job.status == JOB_RUNNING, Job.lease_expires_at < now)),
+                )
+                .order_by(Job.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                await session.commit()
+                return None
+            if job.attempts >= self.max_attempts:
+                job.status = JOB_FAILED
+                job.error = f"Worker lost after {job.attempts} attempts"
+                job.finished_at = now
+                session.add(job)
+                await session.commit()
+                continue
+            job.status = JOB_RUNNING
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = now
+            job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            session.add(job)
+            await session.commit()
+            return job
+
+    async def heartbeat(self, session: AsyncSession, job: Job, worker_id: str) -> bool:
+        """
+        실행 중인 작업의 리스를 연장합니다.
+        리스가 만료되어 다른 워커가 가져갔거나 이미 끝난 작업이면 연장하지 않고 False를 반환합니다.
+        """
+        result = await session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == JOB_RUNNING, Job.worker_id == worker_id)
+            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    async def complete(self, session: AsyncSession, job: Job, result: Optional[Dict[str, Any]] = None):
+        """결과를 저장합니다. 결과가 {"error": ...}이면 FAILED로 기록합니다."""
+        result = result or {}
+        if "error" in result:
+            job.status = JOB_FAILED
+            job.error = str(result["error"])
+        else:
+            job.status = JOB_DONE
+            job.result = json.dumps(result, default=str)
+        job.finished_at = datetime.utcnow()
+        job.lease_expires_at = None
+        session.add(job)
+        await session.commit()
+
+    async def fail(self, session: AsyncSession, job: Job, error: str):
+        await self.complete(session, job, {"error": error})
+
+    async def get(self, session: AsyncSession, job_id: int, user_id: Optional[int] = None) -> Optional[Job]:
+        """작업 조회. user_id를 주면 해당 사용자의 작업만 반환합니다."""
+        job = await session.get(Job, job_id)
+        if job is None or (user_id is not None and job.user_id != user_id):
+            return None
+        return job
+
+    async def purge(self, session: AsyncSession, now: Optional[datetime] = None) -> int:
+        """보관 기간이 지난 끝난 작업을 삭제하고 삭제한 행 수를 반환합니다."""
+        now = now or datetime.utcnow()
+        result = await session.execute(
+            delete(Job).where(
+                Job.status.in_([JOB_DONE, JOB_FAILED]),
+                or_(
+                    Job.finished_at < now - timedelta(seconds=self.retention_seconds),
+                    and_(Job.kind == JOB_EXIT_LEVELS,
+                         Job.finished_at < now - timedelta(seconds=self.signal_retention_seconds)),
+                ),
+            )
+        )
+        await session.commit()
+        return result.rowcount
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """API 응답용 작업 상태 (payload/result JSON은 객체로 풀어서 반환)"""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+# 글로벌 인스턴스
+job_queue = JobQueue()
+
+class JobRunner:
+    """
+    job 테이블을 폴링하여 handlers에 등록된 종류의 작업을 한 건씩 실행합니다.
+    enabled가 False를 반환하는 동안에는 작업을 가져가지 않습니다. (예: 청산 리스를 가진 워커만 EXIT_LEVELS 처리)
+    작업 실행 중에는 heartbeat_seconds마다 리스를 연장하고, purge_seconds마다 보관 기간이 지난 작업을 정리합니다.
+    """
+
+    def __init__(self, handlers: Dict[str, JobHandler], worker_id: str, queue: JobQueue = job_queue,
+                 poll_seconds: float = JOB_POLL_SECONDS, enabled: Optional[Callable[[], bool]] = None,
+                 heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS, purge_seconds: float = JOB_PURGE_INTERVAL_SECONDS):
+        self.handlers = handlers
+        self.worker_id = worker_id
+        self.queue = queue
+        self.poll_seconds = poll_seconds
+        self.enabled = enabled
+        self.heartbeat_seconds = heartbeat_seconds
+        self.purge_seconds = purge_seconds
+        self._purged_at: Optional[float] = None
+        self.is_running = False
+
+    async def _keep_alive(self, job: Job, async_session):
+        """작업이 끝날 때까지(취소될 때까지) 리스를 주기적으로 연장합니다."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                async with async_session() as session:
+                    if not await self.queue.heartbeat(session, job, self.worker_id):
+                        logger.warning(f"Lost lease on job {job.id} ({job.kind})")
+                        return
+            except Exception as e:
+                logger.error(f"Job {job.id} heartbeat failed: {e}")
+
+    async def run_next(self) -> Optional[Job]:
+        """
+        대기 작업 하나를 실행하고 반환합니다. 실행할 작업이 없으면 None.
+        가져오기와 결과 기록은 각각 짧은 세션에서 하고, 작업 실행 중(최적화 등 수 분)에는 DB 연결을 잡고 있지 않습니다.
+        """
+        if self.enabled is not None and not self.enabled():
+            return None
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with async_session() as session:
+            job = await self.queue.claim(session, self.handlers, self.worker_id)
+        if job is None:
+            return None
+        logger.info(f"⚙️ Running job {job.id} ({job.kind}, attempt {job.attempts})")
+        keep_alive = asyncio.create_task(self._keep_alive(job, async_session))
+        try:
+            result = await self.handlers[job.kind](json.loads(job.payload or "{}"))
+            error = None
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            result, error = None, str(e)
+        finally:
+            keep_alive.cancel()
+        async with async_session() as session:
+            if error is None:
+                await self.queue.complete(session, job, result)
+            else:
+                await self.queue.fail(session, job, error)
+        return job
+
+    async def purge_if_due(self) -> int:
+        """마지막 정리 후 purge_seconds가 지났으면 보관 기간이 지난 작업을 삭제합니다."""
+        now = time.monotonic()
+        if self._purged_at is not None and now - self._purged_at < self.purge_seconds:
+            return 0
+        self._purged_at = now
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with async_session() as session:
+            deleted = await self.queue.purge(session)
+        if deleted:
+            logger.info(f"🧹 Purged {deleted} finished jobs")
+        return deleted
+
+    async def start(self):
+        self.is_running = True
+        while self.is_running:
+            try:
+                await self.purge_if_due()
+            except Exception as e:
+                logger.error(f"Job purge error: {e}")
+            try:
+                job = await self.run_next()
+            except Exception as e:
+                logger.error(f"Job runner error: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+
+    def stop(self):
+        self.is_running = False
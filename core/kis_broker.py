@@ -1,5 +1,5 @@
 import os
-import httpx
+from core.http_client import http_clients
 import json
 from typing import Dict, Any, Optional
 from core.broker import TradingBroker
@@ -30,19 +30,18 @@ class KISBroker(TradingBroker):
             "appsecret": self.app_secret
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            data = response.json()
-            
-            if "access_token" in data:
-                self._access_token = data["access_token"]
-                # 보안상 실제 만료 시간보다 약간 짧게 설정
-                self._token_expired_at = datetime.now()
-                logger.info("KIS Access Token renewed successfully.")
-                return self._access_token
-            else:
-                logger.error(f"Failed to get KIS token: {data}")
-                raise Exception("KIS Authentication Failed")
+        response = await http_clients.get("kis").post(url, json=payload)
+        data = response.json()
+        
+        if "access_token" in data:
+            self._access_token = data["access_token"]
+            # 보안상 실제 만료 시간보다 약간 짧게 설정
+            self._token_expired_at = datetime.now()
+            logger.info("KIS Access Token renewed successfully.")
+            return self._access_token
+        else:
+            logger.error(f"Failed to get KIS token: {data}")
+            raise Exception("KIS Authentication Failed")
 
     def _get_headers(self, tr_id: str):
         """공통 헤더 생성"""
@@ -71,9 +70,8 @@ class KISBroker(TradingBroker):
             "CTX_AREA_NK200": ""
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._get_headers(tr_id), params=params)
-            return response.json()
+        response = await http_clients.get("kis").get(url, headers=self._get_headers(tr_id), params=params)
+        return response.json()
 
     async def place_order(
         self, 
@@ -104,20 +102,19 @@ class KISBroker(TradingBroker):
             "ORD_DVSN": "00" if order_type == "limit" else "01" # 00: 지정가, 01: 시장가
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=self._get_headers(tr_id), json=payload)
-            data = response.json()
-            
-            # 응답 포맷을 시스템 표준에 맞게 변환
-            if data.get("rt_cd") == "0":
-                return {
-                    "status": "filled", # 실제로는 체결 확인 API를 별도 호출해야 할 수 있음
-                    "order_id": data["output"]["ODNO"],
-                    "symbol": symbol,
-                    "quantity": quantity,
-                    "price": price or 0.0 # 체결가는 추후 업데이트 필요
-                }
-            return {"error": data.get("msg1", "Order failed")}
+        response = await http_clients.get("kis").post(url, headers=self._get_headers(tr_id), json=payload)
+        data = response.json()
+        
+        # 응답 포맷을 시스템 표준에 맞게 변환
+        if data.get("rt_cd") == "0":
+            return {
+                "status": "filled", # 실제로는 체결 확인 API를 별도 호출해야 할 수 있음
+                "order_id": data["output"]["ODNO"],
+                "symbol": symbol,
+                "quantity": quantity,
+                "price": price or 0.0 # 체결가는 추후 업데이트 필요
+            }
+        return {"error": data.get("msg1", "Order failed")}
 
     async def get_order_status(self, order_id: str) -> Dict[str, Any]:
         # 주문 상세 조회 API 연동 필요
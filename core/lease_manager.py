@@ -0,0 +1,143 @@
+import logging
+import math
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from core.models import TradingStrategy, WorkerLease
+
+logger = logging.getLogger("lease_manager")
+
+# 리스 유지 시간. 워커가 이 시간 안에 갱신하지 못하면(프로세스 종료 등) 다른 워커가 가져감
+LEASE_SECONDS = float(os.getenv("WORKER_LEASE_SECONDS", "180"))
+WORKER_PREFIX = "worker:"
+
+def make_worker_id() -> str:
+    """프로세스마다 고유한 워커 id (호스트:PID:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class LeaseManager:
+    """
+    여러 워커 프로세스가 활성 TradingStrategy를 겹치지 않게 나눠 갖도록 DB 리스를 관리합니다.
+    - 전략: SELECT ... FOR UPDATE SKIP LOCKED로 주인이 없거나 만료된 전략만 가져가므로 두 워커가 같은 전략을 잡지 않음
+    - 분배: 살아 있는 워커 수(WorkerLease의 "worker:<id>" 생존 신호)로 나눈 몫만큼만 보유하고 초과분은 반납
+    - 싱글톤 작업: WorkerLease 행 하나를 원자적 upsert로 선점 (자산 스냅샷처럼 주기당 한 번만 실행해야 하는 작업)
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, lease_seconds: float = LEASE_SECONDS):
+        self.worker_id = worker_id or make_worker_id()
+        self.lease_seconds = lease_seconds
+
+    def cover_interval(self, seconds: float):
+        """
+        실행 주기가 seconds인 워커의 리스가 다음 주기 전에 만료되지 않도록 리스 시간을 주기의 2배 이상으로 늘립니다.
+        (만료되면 각 워커가 자신만 살아 있다고 보고 전략 전체를 가져가 분배가 깨짐)
+        """
+        self.lease_seconds = max(self.lease_seconds, 2 * seconds)
+
+    def _expiry(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.lease_seconds)
+
+    async def _try_lease(self, session: AsyncSession, name: str, now: datetime) -> bool:
+        """
+        name 리스를 선점하거나 연장합니다. 비어 있거나, 만료되었거나, 이미 내 것일 때만 성공합니다.
+        INSERT ... ON CONFLICT DO UPDATE ... WHERE 한 문장이므로 동시에 시도해도 한 워커만 성공합니다.
+        """
+        dialect = sqlite if session.bind.dialect.name == "sqlite" else postgresql
+        values = {"name": name, "owner": self.worker_id, "expires_at": self._expiry(now)}
+        statement = dialect.insert(WorkerLease).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[WorkerLease.name],
+            set_={"owner": values["owner"], "expires_at": values["expires_at"]},
+            where=or_(WorkerLease.owner == self.worker_id, WorkerLease.expires_at < now),
+        ).returning(WorkerLease.owner)
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() == self.worker_id
+
+    async def acquire(self, session: AsyncSession, name: str) -> bool:
+        """싱글톤 작업 리스를 선점/연장하고 커밋합니다. 다른 워커가 보유 중이면 False"""
+        acquired = await self._try_lease(session, name, datetime.utcnow())
+        await session.commit()
+        return acquired
+
+    async def heartbeat(self, session: AsyncSession, now: Optional[datetime] = None) -> int:
+        """이 워커의 생존 신호를 갱신하고, 살아 있는 워커 수를 반환합니다."""
+        now = now or datetime.utcnow()
+        await self._try_lease(session, WORKER_PREFIX + self.worker_id, now)
+        live = await session.execute(
+            select(func.count()).select_from(WorkerLease)
+            .where(WorkerLease.name.startswith(WORKER_PREFIX), WorkerLease.expires_at >= now)
+        )
+        return max(live.scalar_one(), 1)
+
+    async def claim_strategies(self, session: AsyncSession) -> List[TradingStrategy]:
+        """
+        이 워커가 이번 주기에 평가할 활성 전략을 확보합니다.
+        1) 보유 중인 리스를 연장하고, 몫(활성 전략 수 / 살아 있는 워커 수)을 넘는 전략은 반납
+        2) 모자라면 주인이 없거나 리스가 만료된 전략을 SKIP LOCKED로 가져옴 (죽은 워커의 전략 자동 재배정)
+        """
+        now = datetime.utcnow()
+        workers = await self.heartbeat(session, now)
+        total = (await session.execute(
+            select(func.count()).select_from(TradingStrategy).where(TradingStrategy.is_active == True)
+        )).scalar_one()
+        share = math.ceil(total / workers)
+
+        owned_result = await session.execute(
+            select(TradingStrategy)
+            .where(TradingStrategy.is_active == True, TradingStrategy.lease_owner == self.worker_id)
+            .order_by(TradingStrategy.id)
+            .with_for_update(skip_locked=True)
+        )
+        owned = list(owned_result.scalars().all())
+        released = owned[share:]
+        owned = owned[:share]
+
+        claimed = []
+        if len(owned) < share:
+            free_result = await session.execute(
+                select(TradingStrategy)
+                .where(
+                    TradingStrategy.is_active == True,
+                    or_(
+                        TradingStrategy.lease_owner == None,
+                        and_(TradingStrategy.lease_owner != self.worker_id, TradingStrategy.lease_expires_at < now),
+                    ),
+                )
+                .order_by(TradingStrategy.id)
+                .limit(share - len(owned))
+                .with_for_update(skip_locked=True)
+            )
+            claimed = list(free_result.scalars().all())
+
+        expires_at = self._expiry(now)
+        for strategy in owned + claimed:
+            strategy.lease_owner = self.worker_id
+            strategy.lease_expires_at = expires_at
+        for strategy in released:
+            strategy.lease_owner = None
+            strategy.lease_expires_at = None
+        session.add_all(owned + claimed + released)
+        await session.commit()
+
+        if claimed or released:
+            logger.info(f"🔑 Worker {self.worker_id}: {len(owned) + len(claimed)} strategies leased "
+                        f"(+{len(claimed)}, -{len(released)}, {workers} workers)")
+        return sorted(owned + claimed, key=lambda s: s.id)
+
+    async def release_all(self, session: AsyncSession):
+        """종료 시 보유한 리스를 모두 반납하여 다른 워커가 바로 가져가게 합니다."""
+        await session.execute(
+            update(TradingStrategy)
+            .where(TradingStrategy.lease_owner == self.worker_id)
+            .values(lease_owner=None, lease_expires_at=None)
+        )
+        await session.execute(delete(WorkerLease).where(WorkerLease.owner == self.worker_id))
+        await session.commit()
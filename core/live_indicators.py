@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+from core.bar_store import bar_store
+from core.market_calendar import NY_TZ
+from core.quote_feed import QUOTE_MAX_AGE_SECONDS, QuoteBoard, quote_board
+from core.streaming_indicators import StreamingIndicators
+
+logger = logging.getLogger("live_indicators")
+
+class LiveIndicators:
+    """
+    시세 보드의 틱마다 종목별 일봉 지표(RSI/MACD/볼린저)를 StreamingIndicators로 O(1) 갱신합니다.
+    종목당 한 번만 바 저장소의 과거 일봉으로 상태를 채우고, 이후에는 틱 가격을 진행 중인 일봉의 종가로 보고
+    peek()으로 지표를 계산합니다. 틱의 뉴욕 날짜가 바뀌면 직전 바의 마지막 가격을 update()로 확정합니다.
+    결과 형식은 get_latest_indicators()의 종목별 값과 같습니다.
+    """
+
+    def __init__(self, board: QuoteBoard = quote_board, interval: str = "1d", period: str = "3mo"):
+        self.board = board
+        self.interval = interval
+        self.period = period
+        self._states: Dict[str, StreamingIndicators] = {}
+        # 종목별 진행 중인 바: 뉴욕 날짜, OHLCV(종가 = 마지막 가격)
+        self._days: Dict[str, date] = {}
+        self._bars: Dict[str, Dict[str, Optional[float]]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self.is_running = False
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._states
+
+    async def track(self, symbols: Iterable[str]):
+        """아직 추적하지 않는 종목의 상태를 과거 일봉으로 채웁니다. (이미 추적 중인 종목은 건너뜀)"""
+        new = [s for s in dict.fromkeys(symbols) if s not in self._states]
+        if not new:
+            return
+        all_bars = await asyncio.gather(
+            *[bar_store.get_bars(s, interval=self.interval, period=self.period) for s in new], return_exceptions=True,
+        )
+        for symbol, bars in zip(new, all_bars):
+            if isinstance(bars, Exception):
+                logger.error(f"Failed to seed live indicators for {symbol}: {bars}")
+                continue
+            if len(bars) == 0:
+                continue
+            # 마지막 바는 아직 진행 중일 수 있으므로 확정하지 않고 틱으로 이어서 갱신
+            self._states[symbol] = StreamingIndicators.from_closes(bars.close[:-1].tolist())
+            self._days[symbol] = datetime.fromtimestamp(int(bars.ts[-1]), tz=NY_TZ).date()
+            self._bars[symbol] = {c: float(getattr(bars, c)[-1]) for c in ("open", "high", "low", "close", "volume")}
+
+    def on_tick(self, symbol: str, quote: Dict[str, Any]):
+        """틱 하나로 종목의 지표를 갱신합니다. 추적하지 않는 종목이나 가격이 없는 틱은 무시합니다."""
+        state = self._states.get(symbol)
+        price = quote.get("currentPrice")
+        if state is None or price is None or math.isnan(price):
+            return
+        timestamp = quote.get("timestamp") or time.time()
+        day = datetime.fromtimestamp(timestamp, tz=NY_TZ).date()
+        bar = self._bars[symbol]
+        if day > self._days[symbol]:
+            # 새 거래일의 첫 틱: 직전 바를 확정하고 새 바 시작
+            state.update(bar["close"])
+            self._days[symbol] = day
+            bar = self._bars[symbol] = {"open": price, "high": price, "low": price, "close": price, "volume": None}
+        elif day < self._days[symbol]:
+            return
+        bar["high"] = max(bar["high"], price)
+        bar["low"] = min(bar["low"], price)
+        bar["close"] = price
+        indicators = state.peek(price)
+        # get_latest_indicators()와 같이 값이 없는 지표는 None
+        for key in ("macd", "bollinger"):
+            indicators[key] = {k: None if math.isnan(v) else v for k, v in indicators[key].items()}
+        self._latest[symbol] = {
+            "symbol": symbol,
+            **indicators,
+            "ohlcv": dict(bar),
+            "timestamp": datetime.fromtimestamp(timestamp, tz=NY_TZ).isoformat(),
+            "updated_at": timestamp,
+        }
+
+    def get(self, symbol: str, max_age: Optional[float] = QUOTE_MAX_AGE_SECONDS) -> Optional[Dict[str, Any]]:
+        """최근 틱으로 계산한 지표. 틱이 없거나 max_age보다 오래되었으면 None"""
+        latest = self._latest.get(symbol)
+        if latest is None:
+            return None
+        if max_age is not None and time.time() - latest["updated_at"] > max_age:
+            return None
+        return latest
+
+    async def start(self):
+        """시세 보드를 구독하여 틱마다 지표를 갱신합니다."""
+        self.is_running = True
+        queue = self.board.subscribe()
+        try:
+            while self.is_running:
+                symbol, quote = await queue.get()
+                try:
+                    self.on_tick(symbol, quote)
+                except Exception as e:
+                    logger.error(f"Live indicator update failed for {symbol}: {e}")
+        finally:
+            self.board.unsubscribe(queue)
+
+    def stop(self):
+        self.is_running = False
+
+# 글로벌 인스턴스
+live_indicators = LiveIndicators()
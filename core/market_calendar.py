@@ -0,0 +1,155 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# 오프라인 NYSE/NASDAQ 거래 일정 (뉴욕 현지 시간). 외부 호출 없이 휴장일, 조기 폐장, 장전/장후 거래 시간을 계산합니다.
+
+NY_TZ = ZoneInfo("America/New_York")
+
+PRE_MARKET = "PRE_MARKET"
+REGULAR = "REGULAR"
+AFTER_HOURS = "AFTER_HOURS"
+CLOSED = "CLOSED"
+
+PRE_MARKET_OPEN = time(4, 0)
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+AFTER_HOURS_CLOSE = time(20, 0)
+# 조기 폐장일 (독립기념일 전날, 추수감사절 다음 날, 크리스마스 이브)
+EARLY_CLOSE = time(13, 0)
+EARLY_AFTER_HOURS_CLOSE = time(17, 0)
+
+# 규칙으로 계산할 수 없는 임시 휴장일 (국가 애도일 등)
+SPECIAL_CLOSURES = {
+    date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+def easter(year: int) -> date:
+    """그레고리력 부활절 (Anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """month의 n번째 weekday (월=0). n=-1이면 마지막"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(day: date) -> date:
+    """토요일 공휴일은 금요일, 일요일 공휴일은 월요일에 휴장"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+@lru_cache(maxsize=64)
+def holidays(year: int) -> Dict[date, str]:
+    """해당 연도의 NYSE 휴장일 {날짜: 이름}"""
+    days = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    # 새해 첫날이 토요일이면 전년도 12/31에 휴장하지 않음 (NYSE 규칙)
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days[_observed(new_year)] = "New Year's Day"
+    if year >= 2022:
+        days[_observed(date(year, 6, 19))] = "Juneteenth"
+    days.update({d: name for d, name in SPECIAL_CLOSURES.items() if d.year == year})
+    return days
+
+def is_holiday(day: date) -> bool:
+    return day in holidays(day.year)
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and not is_holiday(day)
+
+def is_early_close(day: date) -> bool:
+    """13:00 조기 폐장일 여부"""
+    if not is_trading_day(day):
+        return False
+    if day.month == 7 and day.day == 3:
+        return True
+    if day.month == 12 and day.day == 24:
+        return True
+    return day == _nth_weekday(day.year, 11, 3, 4) + timedelta(days=1)
+
+def session_bounds(day: date) -> Optional[Tuple[datetime, datetime, datetime, datetime]]:
+    """거래일의 (장전 시작, 정규장 시작, 정규장 종료, 장후 종료) 시각. 휴장일이면 None"""
+    if not is_trading_day(day):
+        return None
+    early = is_early_close(day)
+    times = (PRE_MARKET_OPEN, REGULAR_OPEN, EARLY_CLOSE if early else REGULAR_CLOSE,
+             EARLY_AFTER_HOURS_CLOSE if early else AFTER_HOURS_CLOSE)
+    return tuple(datetime.combine(day, t, tzinfo=NY_TZ) for t in times)
+
+def _now(now: Optional[datetime]) -> datetime:
+    return datetime.now(NY_TZ) if now is None else now.astimezone(NY_TZ)
+
+def session_at(now: Optional[datetime] = None) -> str:
+    """주어진 시각(기본: 현재)의 거래 세션"""
+    now = _now(now)
+    bounds = session_bounds(now.date())
+    if bounds is None:
+        return CLOSED
+    pre_open, regular_open, regular_close, after_close = bounds
+    if pre_open <= now < regular_open:
+        return PRE_MARKET
+    if regular_open <= now < regular_close:
+        return REGULAR
+    if regular_close <= now < after_close:
+        return AFTER_HOURS
+    return CLOSED
+
+def next_session_change(now: Optional[datetime] = None) -> Tuple[datetime, str]:
+    """다음 세션 전환 시각과 그 이후의 세션"""
+    now = _now(now)
+    day = now.date()
+    for _ in range(15):  # 가장 긴 연휴도 2주를 넘지 않음
+        bounds = session_bounds(day)
+        if bounds is not None:
+            for boundary, session in zip(bounds, (PRE_MARKET, REGULAR, AFTER_HOURS, CLOSED)):
+                if boundary > now:
+                    return boundary, session
+        day += timedelta(days=1)
+    raise RuntimeError("No trading session found within 15 days")
+
+def seconds_until_change(now: Optional[datetime] = None) -> float:
+    now = _now(now)
+    return (next_session_change(now)[0] - now).total_seconds()
+
+def next_wakeup(intervals: Dict[str, Optional[float]], now: Optional[datetime] = None) -> float:
+    """
+    현재 세션에 맞는 대기 시간(초). 세션별 주기를 따르되 세션 전환 시각은 넘기지 않으며,
+    주기가 None(또는 없음)인 세션에서는 다음 세션 전환까지 잠듭니다.
+    """
+    now = _now(now)
+    until = seconds_until_change(now)
+    interval = intervals.get(session_at(now))
+    return until if interval is None else min(interval, until)
+
+def market_status(now: Optional[datetime] = None) -> Dict[str, str]:
+    """현재 세션과 다음 전환 정보 (API/브로드캐스트용)"""
+    now = _now(now)
+    change, next_session = next_session_change(now)
+    return {"session": session_at(now), "next_session": next_session, "next_change": change.isoformat()}
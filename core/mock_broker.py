@@ -1,6 +1,6 @@
 from typing import Dict, Any, Optional
 from core.broker import TradingBroker
-from core.stock_service import get_stock_info
+from core.quote_feed import get_quote
 from bot.config import logger
 from datetime import datetime
 
@@ -26,7 +26,7 @@ class MockBroker(TradingBroker):
         
         # 지정가 주문이 아닐 경우(시장가), 실제 현재가를 가져옴
         if price is None:
-            stock_data = await get_stock_info(symbol)
+            stock_data = await get_quote(symbol)
             if "error" in stock_data:
                 logger.error(f"Failed to fetch price for {symbol} during mock trade")
                 price = 150.0 # 최종 폴백
@@ -38,6 +38,8 @@ class StockAsset(SQLModel, table=True):
     symbol: str = Field(index=True)
     quantity: float
     average_price: float
+    stop_price: Optional[float] = None # 손절가 (시세가 이 가격 이하가 되면 전량 매도)
+    target_price: Optional[float] = None # 익절가 (시세가 이 가격 이상이 되면 전량 매도)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
     user: User = Relationship(back_populates="assets")
@@ -66,9 +68,34 @@ class TradingStrategy(TradingStrategyBase, table=True):
     user_id: int = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # 워커 리스: 이 전략을 평가하는 워커와 리스 만료 시각 (만료되면 다른 워커가 가져감)
+    lease_owner: Optional[str] = Field(default=None, index=True)
+    lease_expires_at: Optional[datetime] = None
 
     user: User = Relationship(back_populates="strategies")
 
+class WorkerLease(SQLModel, table=True):
+    """싱글톤 작업(자산 스냅샷 등)과 워커 생존 신호("worker:<id>")의 리스"""
+    name: str = Field(primary_key=True)
+    owner: str
+    expires_at: datetime
+
+class Job(SQLModel, table=True):
+    """API와 워커 프로세스 사이의 작업/신호 큐 (예: OPTIMIZE 작업, EXIT_LEVELS 신호)"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(index=True)
+    status: str = Field(default="PENDING", index=True) # PENDING, RUNNING, DONE, FAILED
+    payload: str = Field(default="{}")
+    result: Optional[str] = None
+    error: Optional[str] = None
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    worker_id: Optional[str] = None
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+
 class EquitySnapshot(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
@@ -141,3 +168,28 @@ class StrategyRead(TradingStrategyBase):
     id: int
     user_id: int
     created_at: datetime
+
+class ExitLevelsUpdate(SQLModel):
+    stop_price: Optional[float] = None
+    target_price: Optional[float] = None
+
+class BacktestRequest(SQLModel):
+    symbol: str
+    strategy_type: str = "RSI_LIMIT"
+    parameters: str = Field(default="{}")
+    period: str = "1y"
+    interval: str = "1d"
+    quantity: float = 1.0
+    initial_cash: float = 10000.0
+
+class OptimizeRequest(SQLModel):
+    symbols: List[str]
+    strategy_type: str = "RSI_LIMIT"
+    space: Dict[str, List[float]]  # 예: {"buy_rsi": [20, 25, 30], "sell_rsi": [65, 70, 75]}
+    parameters: str = Field(default="{}")  # 고정 파라미터 JSON
+    random_samples: Optional[int] = None   # 생략하면 그리드 서치
+    seed: Optional[int] = None
+    metric: str = "total_return"
+    top: int = 20
+    period: str = "1y"
+    interval: str = "1d"
@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import yfinance as yf
+
+from core.cache import cache_registry
+from core.executor import run_yfinance
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger("news_store")
+
+NEWS_CACHE_SECONDS = int(os.getenv("NEWS_CACHE_SECONDS", "300"))
+
+def to_epoch(value: Any) -> int:
+    """providerPublishTime(epoch 초), ISO 8601 문자열, RFC 822(RSS) 문자열을 epoch 초로 변환합니다."""
+    if not value:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        pass
+    try:
+        return int(parsedate_to_datetime(str(value)).timestamp())
+    except (TypeError, ValueError):
+        return 0
+
+def normalize_news(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    yfinance 뉴스 항목을 공통 형식으로 변환합니다.
+    구버전: {uuid, title, publisher, link, providerPublishTime}
+    신버전: {id, content: {title, pubDate, provider: {displayName}, canonicalUrl: {url}, summary}}
+    """
+    if not item:
+        return None
+    content = item.get("content") if isinstance(item.get("content"), dict) else {}
+    uuid = item.get("uuid") or item.get("id") or content.get("id")
+    title = item.get("title") or content.get("title")
+    if not uuid or not title:
+        return None
+
+    link = item.get("link") or (content.get("canonicalUrl") or {}).get("url") or (content.get("clickThroughUrl") or {}).get("url")
+    publisher = item.get("publisher") or (content.get("provider") or {}).get("displayName")
+    return {
+        "uuid": uuid,
+        "title": title,
+        "publisher": publisher,
+        "link": link,
+        "summary": content.get("summary") or item.get("summary"),
+        "providerPublishTime": to_epoch(item.get("providerPublishTime") or content.get("pubDate")),
+    }
+
+def make_uuid(*parts: str) -> str:
+    """uuid가 없는 소스(RSS 등)를 위한 안정적인 식별자"""
+    return hashlib.sha1("|".join(p or "" for p in parts).encode("utf-8")).hexdigest()
+
+class NewsStore:
+    """
+    uuid로 중복 제거된 뉴스 저장소.
+    종목/피드별로 어떤 uuid가 속하는지를 TTL 인덱스로 관리하여, TTL 안에서는 다시 내려받지 않습니다.
+    """
+
+    def __init__(self, max_items: int = 5000, ttl: int = NEWS_CACHE_SECONDS):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._index = cache_registry.namespace("news_index", maxsize=2048, ttl=ttl, negative_ttl=60)
+        self._flight = SingleFlight("news")
+
+    def add(self, items: Iterable[Dict[str, Any]]) -> List[str]:
+        """정규화된 뉴스 항목을 저장하고 uuid 목록을 반환합니다. (같은 uuid는 하나만 유지)"""
+        uuids = []
+        for item in items:
+            self._items[item["uuid"]] = item
+            self._items.move_to_end(item["uuid"])
+            uuids.append(item["uuid"])
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return list(dict.fromkeys(uuids))
+
+    def _resolve(self, uuids: List[str]) -> List[Dict[str, Any]]:
+        return [self._items[u] for u in uuids if u in self._items]
+
+    async def get_feed(self, key: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]], ttl: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        키(종목, RSS 피드 등)에 해당하는 뉴스를 반환합니다.
+        인덱스가 만료된 경우에만 fetch()로 정규화된 항목을 받아오며, 동시 요청은 한 번의 조회를 공유합니다.
+        """
+        uuids = self._index.get(key)
+        if uuids is None:
+            uuids = await self._flight.do(key, lambda: self._refresh(key, fetch, ttl))
+        return self._resolve(uuids)
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]], ttl: Optional[int]) -> List[str]:
+        try:
+            items = await fetch()
+        except Exception as e:
+            logger.error(f"Error fetching news for {key}: {e}")
+            self._index.set_negative(key, [])
+            return []
+        uuids = self.add(items)
+        self._index.set(key, uuids, ttl=ttl)
+        return uuids
+
+    async def get_symbol_news(self, symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """yfinance 종목 뉴스를 정규화된 형식으로 반환합니다."""
+        async def fetch():
+            raw = await run_yfinance(lambda: yf.Ticker(symbol).news) or []
+            return [n for n in (normalize_news(r) for r in raw) if n]
+
+        return (await self.get_feed(f"symbol:{symbol.upper()}", fetch))[:limit]
+
+    async def get_many(self, symbols: Iterable[str], limit: int = 5) -> List[Dict[str, Any]]:
+        """여러 종목의 뉴스를 uuid 기준으로 중복 제거하여 최신순으로 반환합니다."""
+        results = await asyncio.gather(*[self.get_symbol_news(s, limit=limit) for s in symbols])
+        merged = {item["uuid"]: item for items in results for item in items}
+        return sorted(merged.values(), key=lambda n: n["providerPublishTime"], reverse=True)
+
+# 글로벌 인스턴스
+news_store = NewsStore()
@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import os
-import httpx
+from core.http_client import http_clients
 from typing import List, Dict, Any, Set
 from fastapi import WebSocket
 from dotenv import load_dotenv
@@ -77,19 +77,19 @@ class NotificationService:
         body = message.get("body", "")
         formatted_msg = f"🔔 *{title}*\n\n{body}"
         
-        async with httpx.AsyncClient() as client:
-            for chat_id in self.telegram_chat_ids:
-                url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-                payload = {
-                    "chat_id": chat_id,
-                    "text": formatted_msg,
-                    "parse_mode": "Markdown"
-                }
-                try:
-                    await client.post(url, json=payload)
-                    logger.info(f"Sent Telegram notification to {chat_id}")
-                except Exception as e:
-                    logger.error(f"Failed to send Telegram message to {chat_id}: {e}")
+        client = http_clients.get("telegram")
+        for chat_id in self.telegram_chat_ids:
+            url = f"/bot{self.telegram_token}/sendMessage"
+            payload = {
+                "chat_id": chat_id,
+                "text": formatted_msg,
+                "parse_mode": "Markdown"
+            }
+            try:
+                await client.post(url, json=payload)
+                logger.info(f"Sent Telegram notification to {chat_id}")
+            except Exception as e:
+                logger.error(f"Failed to send Telegram message to {chat_id}: {e}")
 
 # 글로벌 인스턴스
 notification_service = NotificationService()
\ No newline at end of file
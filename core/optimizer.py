@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.backtest_service import SIGNAL_RULES, backtest_metrics, simulate
+from core.expression_strategy import RuleError
+from core.bar_store import COLUMNS, Bars, bar_store
+
+logger = logging.getLogger("optimizer")
+
+# API 서버(이벤트 루프/스레드 실행 중)에서도 안전하도록 기본은 spawn. 가격 배열은 공유 메모리로 전달되므로 피클링 비용이 없음
+OPTIMIZER_START_METHOD = os.getenv("OPTIMIZER_START_METHOD", "spawn")
+OPTIMIZER_MAX_WORKERS = int(os.getenv("OPTIMIZER_MAX_WORKERS", str(os.cpu_count() or 1)))
+# 요청 하나가 백테스트할 수 있는 조합 수 상한 (그리드 전체 또는 랜덤 샘플 수). 넘으면 조합을 만들기 전에 거부
+OPTIMIZER_MAX_COMBINATIONS = int(os.getenv("OPTIMIZER_MAX_COMBINATIONS", "10000"))
+
+# 정렬 기준으로 쓸 수 있는 지표 (backtest_metrics의 키). 클수록 좋은 지표 외에는 작을수록 좋은 것으로 정렬
+METRICS = {"total_return", "final_equity", "max_drawdown", "num_trades", "turnover", "max_capital_used"}
+HIGHER_IS_BETTER = {"total_return", "final_equity", "max_drawdown"}
+
+def grid_combinations(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """파라미터 공간의 모든 조합 (그리드 서치)"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+def search_space_error(space: Dict[str, Sequence[Any]], random_samples: Optional[int] = None,
+                       limit: int = OPTIMIZER_MAX_COMBINATIONS) -> Optional[str]:
+    """
+    조합을 실제로 만들지 않고 탐색 공간 크기만 계산하여 검증합니다. 문제가 없으면 None.
+    (그리드는 후보 개수의 곱, 랜덤 서치는 샘플 수와 그리드 크기 중 작은 값)
+    """
+    if random_samples is not None and random_samples < 1:
+        return "random_samples must be at least 1"
+    total = math.prod(len(v) for v in space.values())
+    count = total if random_samples is None else min(random_samples, total)
+    if count > limit:
+        return f"Too many parameter combinations: {count} (limit {limit})"
+    return None
+
+def random_combinations(space: Dict[str, Sequence[Any]], samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """파라미터마다 후보 값 중 하나를 무작위로 골라 중복 없이 samples개 조합을 만듭니다. (랜덤 서치)"""
+    total = math.prod(len(v) for v in space.values())
+    if samples >= total:
+        return grid_combinations(space)
+    rng = np.random.default_rng(seed)
+    names = list(space)
+    seen, combos = set(), []
+    while len(combos) < samples:
+        picks = tuple(int(rng.integers(len(space[n]))) for n in names)
+        if picks not in seen:
+            seen.add(picks)
+            combos.append({n: space[n][i] for n, i in zip(names, picks)})
+    return combos
+
+def is_valid_combination(combo: Dict[str, Any]) -> bool:
+    """의미 없는 조합 제외 (매수 RSI가 매도 RSI 이상인 경우 등)"""
+    return combo.get("buy_rsi", -math.inf) < combo.get("sell_rsi", math.inf)
+
+class SharedBars:
+    """
+    여러 종목의 OHLCV 배열을 하나의 공유 메모리 블록(컬럼 × 전체 바 수, float64)에 한 번만 적재합니다.
+    워커 프로세스는 이름과 레이아웃만 받아 복사 없이 붙습니다.
+    """
+
+    def __init__(self, bars_list: Sequence[Bars]):
+        total = sum(len(b) for b in bars_list)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * len(COLUMNS) * 8)
+        data = np.ndarray((len(COLUMNS), total), dtype=np.float64, buffer=self.shm.buf)
+        self.layout: List[Tuple[str, str, int, int]] = []
+        offset = 0
+        for bars in bars_list:
+            for row, column in enumerate(COLUMNS):
+                data[row, offset:offset + len(bars)] = getattr(bars, column)
+            self.layout.append((bars.symbol, bars.interval, offset, len(bars)))
+            offset += len(bars)
+        self.total = total
+
+    def handle(self) -> Tuple[str, int, List[Tuple[str, str, int, int]]]:
+        return self.shm.name, self.total, self.layout
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+# --- 워커 프로세스 측 상태 (initializer에서 한 번 설정) ---
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_bars: List[Bars] = []
+_worker_features: Dict[Tuple[str, int], Dict[str, np.ndarray]] = {}
+
+def _init_worker(handle: Tuple[str, int, List[Tuple[str, str, int, int]]]):
+    global _worker_shm, _worker_bars
+    name, total, layout = handle
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    data = np.ndarray((len(COLUMNS), total), dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_bars = [
+        Bars(symbol, interval, data[0, start:start + n].astype(np.int64), *(data[row, start:start + n] for row in range(1, len(COLUMNS))))
+        for symbol, interval, start, n in layout
+    ]
+
+def _evaluate_chunk(strategy_type: str, base_params: Dict[str, Any], combos: List[Dict[str, Any]],
+                    quantity: float, initial_cash: float) -> List[Dict[str, Any]]:
+    """워커에서 조합 묶음을 모든 종목에 대해 백테스트합니다."""
+    rule = SIGNAL_RULES[strategy_type]
+    results = []
+    for combo in combos:
+        params = {**base_params, **combo}
+        per_symbol = {}
+        for i, bars in enumerate(_worker_bars):
+            # 지표는 파라미터와 무관하므로 워커당 종목별로 한 번만 계산
+            features = _worker_features.get((strategy_type, i))
+            if features is None:
+                features = _worker_features[(strategy_type, i)] = rule.features(bars)
+            closes = np.asarray(bars.close)
+            sim = simulate(closes, rule.signals(features, params), quantity=quantity, initial_cash=initial_cash)
+            per_symbol[bars.symbol] = backtest_metrics(closes, sim, initial_cash)
+        results.append({"parameters": combo, "symbols": per_symbol})
+    return results
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class Optimizer:
+    """파라미터 조합을 프로세스 풀에 나눠 백테스트하고 지정한 지표로 순위를 매깁니다."""
+
+    def __init__(self, max_workers: int = OPTIMIZER_MAX_WORKERS, start_method: str = OPTIMIZER_START_METHOD,
+                 max_combinations: int = OPTIMIZER_MAX_COMBINATIONS):
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.max_combinations = max_combinations
+
+    def sweep(self, bars_list: Sequence[Bars], strategy_type: str, combos: List[Dict[str, Any]],
+              base_params: Optional[Dict[str, Any]] = None, metric: str = "total_return", top: int = 20,
+              quantity: float = 1.0, initial_cash: float = 10000.0) -> Dict[str, Any]:
+        """
+        combos 각각을 모든 종목에 적용하고, 종목 평균 metric으로 정렬한 상위 top개를 반환합니다.
+        조합은 워커 수의 몇 배 크기로 묶어 보내 프로세스 간 통신 횟수를 줄입니다.
+        """
+        if strategy_type not in SIGNAL_RULES:
+            return {"error": f"Backtest not supported for strategy type: {strategy_type}"}
+        if metric not in METRICS:
+            return {"error": f"Unknown metric: {metric} (available: {', '.join(sorted(METRICS))})"}
+        if len(combos) > self.max_combinations:
+            return {"error": f"Too many parameter combinations: {len(combos)} (limit {self.max_combinations})"}
+        bars_list = [b for b in bars_list if len(b) > 0]
+        if not bars_list:
+            return {"error": "No data found"}
+        combos = [c for c in combos if is_valid_combination({**(base_params or {}), **c})]
+        if not combos:
+            return {"error": "No valid parameter combinations"}
+        try:
+            # 규칙 오류(EXPRESSION 등)는 워커로 보내기 전에 한 번 검증
+            rule = SIGNAL_RULES[strategy_type]
+            rule(bars_list[0], {**(base_params or {}), **combos[0]})
+        except RuleError as e:
+            return {"error": str(e)}
+
+        started = time.perf_counter()
+        workers = max(1, min(self.max_workers, len(combos)))
+        chunk_size = max(1, math.ceil(len(combos) / (workers * 4)))
+        shared = SharedBars(bars_list)
+        try:
+            context = multiprocessing.get_context(self.start_method)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(shared.handle(),)) as pool:
+                futures = [
+                    pool.submit(_evaluate_chunk, strategy_type, base_params or {}, chunk, quantity, initial_cash)
+                    for chunk in _chunks(combos, chunk_size)
+                ]
+                results = [r for f in futures for r in f.result()]
+        finally:
+            shared.close()
+
+        for result in results:
+            values = [m[metric] for m in result["symbols"].values()]
+            result["score"] = float(np.mean(values))
+        results.sort(key=lambda r: r["score"], reverse=metric in HIGHER_IS_BETTER)
+
+        return {
+            "strategy_type": strategy_type,
+            "symbols": [b.symbol for b in bars_list],
+            "metric": metric,
+            "combinations": len(combos),
+            "workers": workers,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "results": results[:top],
+        }
+
+    async def optimize(self, symbols: Sequence[str], strategy_type: str, space: Dict[str, Sequence[Any]],
+                       base_params: Optional[Dict[str, Any]] = None, random_samples: Optional[int] = None,
+                       seed: Optional[int] = None, metric: str = "total_return", top: int = 20,
+                       period: str = "1y", interval: str = "1d", quantity: float = 1.0,
+                       initial_cash: float = 10000.0) -> Dict[str, Any]:
+        """바 저장소에서 종목 데이터를 읽고, 스윕은 별도 스레드에서 프로세스 풀로 실행합니다."""
+        error = search_space_error(space, random_samples, self.max_combinations)
+        if error:
+            return {"error": error}
+        bars_list = await asyncio.gather(*[bar_store.get_bars(s, interval=interval, period=period) for s in symbols])
+        combos = random_combinations(space, random_samples, seed) if random_samples else grid_combinations(space)
+        return await asyncio.to_thread(
+            self.sweep, bars_list, strategy_type, combos, base_params=base_params, metric=metric,
+            top=top, quantity=quantity, initial_cash=initial_cash,
+        )
+
+# 글로벌 인스턴스
+optimizer = Optimizer()
+
+def parse_values(text: str) -> List[float]:
+    """'20:40:5'(시작:끝:간격, 끝 포함) 또는 '20,25,30' 형식의 후보 값"""
+    if ":" in text:
+        start, stop, step = (float(x) for x in text.split(":"))
+        return [float(v) for v in np.round(np.arange(start, stop + step / 2, step), 10)]
+    return [float(x) for x in text.split(",")]
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="전략 파라미터 최적화 (예: python -m core.optimizer TSLA NVDA --param buy_rsi=20:40:1 --param sell_rsi=60:80:1)")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--type", default="RSI_LIMIT")
+    parser.add_argument("--param", action="append", default=[], help="이름=시작:끝:간격 또는 이름=값1,값2")
+    parser.add_argument("--params", default="{}", help="고정 파라미터 JSON")
+    parser.add_argument("--random", type=int, default=None, help="랜덤 서치 조합 수 (생략하면 그리드 서치)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--metric", default="total_return")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--workers", type=int, default=OPTIMIZER_MAX_WORKERS)
+    args = parser.parse_args(argv)
+
+    space = {}
+    for item in args.param:
+        name, values = item.split("=", 1)
+        space[name] = parse_values(values)
+
+    result = asyncio.run(Optimizer(max_workers=args.workers).optimize(
+        [s.upper() for s in args.symbols], args.type, space, base_params=json.loads(args.params),
+        random_samples=args.random, seed=args.seed, metric=args.metric, top=args.top,
+        period=args.period, interval=args.interval,
+    ))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
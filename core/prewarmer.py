@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from core import market_calendar, stock_service
+from core.market_calendar import AFTER_HOURS, PRE_MARKET, REGULAR
+from core.database import engine
+from core.models import StockAsset, TradingStrategy
+
+logger = logging.getLogger("prewarmer")
+
+PREWARM_INTERVAL_SECONDS = float(os.getenv("PREWARM_INTERVAL_SECONDS", "5"))
+# 만료까지 이 시간 이내로 남은 핫 종목을 미리 갱신
+PREWARM_LEAD_SECONDS = float(os.getenv("PREWARM_LEAD_SECONDS", "10"))
+# DB에서 핫 종목 집합을 다시 읽는 주기
+HOT_SET_REFRESH_SECONDS = float(os.getenv("HOT_SET_REFRESH_SECONDS", "60"))
+RECENT_SEARCH_LIMIT = int(os.getenv("RECENT_SEARCH_LIMIT", "50"))
+# 갱신에 실패한 종목은 interval * 2^(연속 실패 횟수)만큼, 최대 이 시간(초)까지 미뤄서 다시 시도
+PREWARM_FAILURE_BACKOFF_MAX_SECONDS = float(os.getenv("PREWARM_FAILURE_BACKOFF_MAX_SECONDS", "300"))
+
+class PreWarmer:
+    """
+    핫 종목(활성 전략, 보유 종목, 브로드캐스트 종목, 최근 검색 종목)의 시세 캐시를 만료 직전에 미리 갱신합니다.
+    핫 종목은 stock_service.hot_symbols에 등록되어, 캐시가 만료되어도 이전 시세를 바로 응답받습니다.
+    """
+
+    def __init__(self, interval_seconds: float = PREWARM_INTERVAL_SECONDS, lead_seconds: float = PREWARM_LEAD_SECONDS,
+                 hot_set_refresh_seconds: float = HOT_SET_REFRESH_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.lead_seconds = lead_seconds
+        self.hot_set_refresh_seconds = hot_set_refresh_seconds
+        self.static_symbols: Set[str] = set()
+        self.recent_searches: deque = deque(maxlen=RECENT_SEARCH_LIMIT)
+        self.db_symbols: Set[str] = set()
+        self._db_loaded_at = 0.0
+        # 갱신에 실패한 종목 -> (연속 실패 횟수, 다음 시도 시각)
+        self._failures: Dict[str, Tuple[int, float]] = {}
+        self.is_running = False
+
+    def add_static(self, symbols: Iterable[str]):
+        """항상 유지할 종목 추가 (브로드캐스트 종목 등)"""
+        self.static_symbols.update(symbols)
+        self._publish()
+
+    def record_search(self, symbol: str):
+        """/search 결과 종목을 최근 검색 목록에 기록합니다."""
+        if symbol in self.recent_searches:
+            self.recent_searches.remove(symbol)
+        self.recent_searches.append(symbol)
+        self._publish()
+
+    def hot_set(self) -> Set[str]:
+        return self.static_symbols | self.db_symbols | set(self.recent_searches)
+
+    def _publish(self):
+        stock_service.hot_symbols.clear()
+        stock_service.hot_symbols.update(self.hot_set())
+
+    async def load_db_symbols(self):
+        """활성 전략과 보유 자산의 종목을 DB에서 읽어옵니다."""
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with async_session() as session:
+            strategies = await session.execute(select(TradingStrategy.symbol).where(TradingStrategy.is_active == True).distinct())
+            assets = await session.execute(select(StockAsset.symbol).where(StockAsset.quantity > 0).distinct())
+            self.db_symbols = set(strategies.scalars().all()) | set(assets.scalars().all())
+        self._db_loaded_at = time.monotonic()
+        self._publish()
+
+    def due_symbols(self) -> List[str]:
+        """
+        캐시가 없거나 만료까지 lead_seconds 이내로 남은 핫 종목.
+        최근 실패가 negative 캐싱된 종목과 실패 후 대기 중인 종목은 제외합니다.
+        """
+        cache = stock_service.price_cache
+        now = time.monotonic()
+        return sorted(
+            s for s in self.hot_set()
+            if cache.ttl_remaining(s) <= self.lead_seconds and not cache.is_negative(s)
+            and self._failures.get(s, (0, 0.0))[1] <= now
+        )
+
+    def _record_results(self, quotes: Dict[str, dict]):
+        now = time.monotonic()
+        for symbol, quote in quotes.items():
+            if "error" not in quote:
+                self._failures.pop(symbol, None)
+                continue
+            failures = self._failures.get(symbol, (0, 0.0))[0] + 1
+            delay = min(PREWARM_FAILURE_BACKOFF_MAX_SECONDS, self.interval_seconds * 2 ** failures)
+            self._failures[symbol] = (failures, now + delay)
+
+    async def refresh_once(self) -> List[str]:
+        if time.monotonic() - self._db_loaded_at >= self.hot_set_refresh_seconds:
+            try:
+                await self.load_db_symbols()
+            except Exception as e:
+                logger.error(f"Failed to load hot symbols: {e}")
+                self._db_loaded_at = time.monotonic()
+        due = self.due_symbols()
+        if due:
+            logger.info(f"🔥 Pre-warming {len(due)} hot symbols: {', '.join(due)}")
+            self._record_results(await stock_service.refresh_stock_infos(due))
+        return due
+
+    async def start(self):
+        """거래 시간(장전~장후)에만 interval_seconds마다 갱신하고, 휴장 중에는 다음 세션까지 쉽니다."""
+        self.is_running = True
+        intervals = {PRE_MARKET: self.interval_seconds, REGULAR: self.interval_seconds, AFTER_HOURS: self.interval_seconds}
+        while self.is_running:
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Pre-warmer error: {e}")
+            await asyncio.sleep(market_calendar.next_wakeup(intervals))
+
+    def stop(self):
+        self.is_running = False
+
+# 글로벌 인스턴스
+prewarmer = PreWarmer()
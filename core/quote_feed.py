@@ -0,0 +1,263 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core import market_calendar
+from core.market_calendar import AFTER_HOURS, PRE_MARKET, REGULAR
+from core.stock_service import get_stock_info, get_stock_infos, refresh_stock_infos
+
+logger = logging.getLogger("quote_feed")
+
+# 보드의 시세를 "최신"으로 인정하는 최대 경과 시간 (초). 넘으면 직접 조회로 폴백
+QUOTE_MAX_AGE_SECONDS = float(os.getenv("QUOTE_MAX_AGE_SECONDS", "30"))
+# 장전/장후 거래 시간의 폴링 주기 (초). 휴장 중에는 폴링하지 않음
+QUOTE_EXTENDED_POLL_SECONDS = float(os.getenv("QUOTE_EXTENDED_POLL_SECONDS", "30"))
+# 조회 요청으로 추가된 종목을 마지막 조회 후 이 시간(초)이 지나면 피드 추적에서 제외
+QUOTE_WATCH_IDLE_SECONDS = float(os.getenv("QUOTE_WATCH_IDLE_SECONDS", "600"))
+
+class QuoteBoard:
+    """
+    피드가 밀어넣은 종목별 최신 시세를 보관하는 인메모리 보드.
+    시세 형식은 get_stock_info()와 같으며, 수신 시각(timestamp)이 추가됩니다.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def update(self, symbol: str, quote: Dict[str, Any], timestamp: Optional[float] = None):
+        """시세를 갱신하고 구독자 큐에 (심볼, 시세)를 전달합니다."""
+        entry = {**quote, "timestamp": timestamp or time.time()}
+        self._quotes[symbol] = entry
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((symbol, entry))
+            except asyncio.QueueFull:
+                # 느린 구독자 때문에 피드가 막히지 않도록 가장 오래된 틱을 버림
+                queue.get_nowait()
+                queue.put_nowait((symbol, entry))
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """보드의 시세를 반환합니다. max_age를 주면 그보다 오래된 시세는 None으로 취급합니다."""
+        quote = self._quotes.get(symbol)
+        if quote is None:
+            return None
+        if max_age is not None and time.time() - quote["timestamp"] > max_age:
+            return None
+        return quote
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        if symbols is None:
+            return dict(self._quotes)
+        return {s: self._quotes[s] for s in symbols if s in self._quotes}
+
+    def subscribe(self, maxsize: int = 1000) -> asyncio.Queue:
+        """시세 갱신을 받을 큐를 등록합니다."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+class QuoteFeed(ABC):
+    """
+    시세를 QuoteBoard로 밀어넣는 피드의 추상 클래스.
+    watch()로 추가한 종목(전략/청산/브로드캐스트)은 unwatch() 전까지 추적하고,
+    watch_on_demand()로 추가한 종목(API 조회)은 마지막 조회 후 idle_seconds가 지나면 prune_idle()에서 제외합니다.
+    """
+
+    def __init__(self, board: QuoteBoard, idle_seconds: float = QUOTE_WATCH_IDLE_SECONDS):
+        self.board = board
+        self.watchlist: Set[str] = set()
+        self.idle_seconds = idle_seconds
+        # 조회 요청으로 추가된 종목 -> 마지막 조회 시각
+        self._last_access: Dict[str, float] = {}
+        self.is_running = False
+
+    def watch(self, symbols: Iterable[str]):
+        """피드가 추적할 종목을 추가합니다. (만료 없음)"""
+        for symbol in symbols:
+            self.watchlist.add(symbol)
+            self._last_access.pop(symbol, None)
+
+    def watch_on_demand(self, symbols: Iterable[str]):
+        """조회 요청이 들어온 종목을 추가합니다. 이미 만료 없이 추적 중인 종목은 그대로 둡니다."""
+        now = time.time()
+        for symbol in symbols:
+            if symbol in self.watchlist and symbol not in self._last_access:
+                continue
+            self.watchlist.add(symbol)
+            self._last_access[symbol] = now
+
+    def touch(self, symbols: Iterable[str]):
+        """조회 요청으로 추가된 종목의 마지막 조회 시각을 갱신합니다."""
+        now = time.time()
+        for symbol in symbols:
+            if symbol in self._last_access:
+                self._last_access[symbol] = now
+
+    def unwatch(self, symbols: Iterable[str]):
+        for symbol in symbols:
+            self.watchlist.discard(symbol)
+            self._last_access.pop(symbol, None)
+
+    def prune_idle(self) -> List[str]:
+        """idle_seconds 동안 조회되지 않은 종목을 추적에서 제외하고 목록을 반환합니다."""
+        cutoff = time.time() - self.idle_seconds
+        idle = [s for s, accessed in self._last_access.items() if accessed < cutoff]
+        self.unwatch(idle)
+        return idle
+
+    @abstractmethod
+    async def start(self):
+        """피드 루프 실행 (stop() 호출 전까지 반환하지 않음)"""
+        pass
+
+    def stop(self):
+        self.is_running = False
+
+class YFinancePollingFeed(QuoteFeed):
+    """
+    기존 방식: watchlist 전체를 주기적으로 일괄 조회하여 보드에 반영.
+    보드의 timestamp는 "이 시각에 받은 시세"라는 뜻이므로 price_cache(최대 60초, 핫 종목은 stale로 300초)를
+    거치지 않고 refresh_stock_infos로 새로 받습니다. (받은 결과로 캐시도 함께 갱신됨)
+    """
+
+    def __init__(self, board: QuoteBoard, interval_seconds: float = 10,
+                 extended_interval_seconds: float = QUOTE_EXTENDED_POLL_SECONDS):
+        super().__init__(board)
+        self.interval_seconds = interval_seconds
+        self.extended_interval_seconds = extended_interval_seconds
+
+    async def poll_once(self):
+        self.prune_idle()
+        if not self.watchlist:
+            return
+        quotes = await refresh_stock_infos(sorted(self.watchlist))
+        now = time.time()
+        failed = []
+        for symbol, quote in quotes.items():
+            if "error" not in quote:
+                self.board.update(symbol, quote, timestamp=now)
+            elif symbol in self._last_access:
+                failed.append(symbol)
+        # 조회로 추가된 종목이 오류(상장폐지/잘못된 심볼 등)를 내면 계속 폴링하지 않음. 다시 조회되면 재추가
+        self.unwatch(failed)
+
+    async def start(self):
+        """정규장에는 interval_seconds, 장전/장후에는 extended_interval_seconds마다 조회하고, 휴장 중에는 다음 세션까지 쉽니다."""
+        self.is_running = True
+        intervals = {REGULAR: self.interval_seconds, PRE_MARKET: self.extended_interval_seconds,
+                     AFTER_HOURS: self.extended_interval_seconds}
+        while self.is_running:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Polling feed error: {e}")
+            await asyncio.sleep(market_calendar.next_wakeup(intervals))
+
+class ReplayFeed(QuoteFeed):
+    """
+    기록된 틱(파일 또는 리스트)을 재생하는 피드 (테스트/시뮬레이션용).
+    파일 형식: CSV(timestamp,symbol,price[,previous_close]) 또는 같은 키를 가진 JSON Lines.
+    """
+
+    def __init__(self, board: QuoteBoard, ticks: Optional[List[Dict[str, Any]]] = None, path: Optional[str] = None,
+                 speed: float = 1.0, loop: bool = False):
+        super().__init__(board)
+        self.ticks = ticks if ticks is not None else self.load_ticks(path)
+        self.speed = speed
+        self.loop = loop
+
+    @staticmethod
+    def load_ticks(path: Optional[str]) -> List[Dict[str, Any]]:
+        if not path:
+            return []
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".jsonl", ".json")):
+                return [json.loads(line) for line in f if line.strip()]
+            return list(csv.DictReader(f))
+
+    @staticmethod
+    def to_quote(tick: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """틱 한 건을 get_stock_info() 형식의 시세로 변환합니다."""
+        symbol = tick["symbol"]
+        price = float(tick["price"])
+        previous_close = float(tick.get("previous_close") or price)
+        change = price - previous_close
+        return symbol, {
+            "shortName": symbol,
+            "currentPrice": price,
+            "previousClose": previous_close,
+            "change": change,
+            "changePercent": (change / previous_close) * 100 if previous_close else 0.0,
+            "currency": "USD",
+        }
+
+    async def start(self):
+        self.is_running = True
+        while self.is_running:
+            previous_ts = None
+            for tick in self.ticks:
+                if not self.is_running:
+                    return
+                ts = float(tick.get("timestamp", 0) or 0)
+                if previous_ts is not None and ts > previous_ts:
+                    await asyncio.sleep((ts - previous_ts) / self.speed)
+                previous_ts = ts
+                symbol, quote = self.to_quote(tick)
+                if not self.watchlist or symbol in self.watchlist:
+                    self.board.update(symbol, quote)
+                await asyncio.sleep(0)
+            if not self.loop:
+                break
+        self.is_running = False
+
+def create_quote_feed(board: QuoteBoard) -> QuoteFeed:
+    """환경변수 QUOTE_FEED(yfinance | replay)에 따라 피드를 생성합니다."""
+    kind = os.getenv("QUOTE_FEED", "yfinance").lower()
+    if kind == "replay":
+        return ReplayFeed(board, path=os.getenv("QUOTE_REPLAY_PATH"), speed=float(os.getenv("QUOTE_REPLAY_SPEED", "1")), loop=True)
+    return YFinancePollingFeed(board, interval_seconds=float(os.getenv("QUOTE_POLL_SECONDS", "10")))
+
+# 글로벌 인스턴스
+quote_board = QuoteBoard()
+quote_feed = create_quote_feed(quote_board)
+
+async def get_quote(symbol: str) -> Dict[str, Any]:
+    """
+    보드의 최신 시세를 우선 사용하고, 없거나 오래되었으면 직접 조회합니다.
+    정상 조회된 종목은 피드 추적에 추가되며, 한동안 조회되지 않으면 다시 제외됩니다.
+    """
+    quote = quote_board.get(symbol, max_age=QUOTE_MAX_AGE_SECONDS)
+    if quote is not None:
+        quote_feed.touch([symbol])
+        return quote
+    quote = await get_stock_info(symbol)
+    if "error" not in quote:
+        quote_feed.watch_on_demand([symbol])
+    return quote
+
+async def get_quotes(symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """여러 종목 시세를 보드 우선으로 조회합니다. 보드에 없는 종목만 한 번에 일괄 조회합니다."""
+    symbols = list(dict.fromkeys(symbols))
+    results: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for symbol in symbols:
+        quote = quote_board.get(symbol, max_age=QUOTE_MAX_AGE_SECONDS)
+        if quote is not None:
+            results[symbol] = quote
+        else:
+            missing.append(symbol)
+    quote_feed.touch(results)
+    if missing:
+        fetched = await get_stock_infos(missing)
+        quote_feed.watch_on_demand(s for s, quote in fetched.items() if "error" not in quote)
+        results.update(fetched)
+    return results
@@ -0,0 +1,32 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 요청을 하나의 실제 조회로 합쳐주는 도우미 (in-flight 중복 제거).
+    먼저 도착한 호출이 조회를 시작하고, 완료 전에 들어온 호출은 같은 결과를 함께 기다립니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def is_inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 대해 진행 중인 조회가 있으면 그 결과를, 없으면 새 조회를 시작해 결과를 반환합니다."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # 한 호출자가 취소되어도 공유 조회는 계속 진행되도록 shield 처리
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리는 호출자가 모두 사라진 경우 'exception was never retrieved' 경고 방지
+            task.exception()
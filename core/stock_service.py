@@ -1,39 +1,60 @@
-import httpx
 import yfinance as yf
 import pandas as pd
 from urllib.parse import quote
+import asyncio
 import logging
-import time
+from core.cache import cache_registry, MISSING
+from core.singleflight import SingleFlight
+from core.executor import run_yfinance
+from core.http_client import http_clients
+from core.symbol_index import symbol_index
+from core.news_store import news_store
 
 logger = logging.getLogger("stock_service")
 
-# 캐시 저장소
-ticker_cache = {}
-price_cache = {}
+# 캐시 저장소 (크기 제한 + TTL, 실패한 조회는 짧게 negative 캐싱)
 CACHE_EXPIRE_SECONDS = 60  # 시세 데이터 캐시 유지 시간 (1분)
+STALE_PRICE_SECONDS = 300  # 핫 종목은 만료 후에도 이 시간 동안 이전 시세를 응답하며 백그라운드에서 갱신
+ticker_cache = cache_registry.namespace("ticker", maxsize=4096, ttl=24 * 3600, negative_ttl=300)
+price_cache = cache_registry.namespace("price", maxsize=2048, ttl=CACHE_EXPIRE_SECONDS, negative_ttl=15, stale_ttl=STALE_PRICE_SECONDS)
+
+# 프리워머(core.prewarmer)가 관리하는 핫 종목 집합. 이 종목들은 캐시 만료 시 조회를 기다리지 않음
+hot_symbols: set[str] = set()
+_revalidate_tasks: set[asyncio.Task] = set()
+
+# 동시 요청 합치기 (같은 키의 캐시 미스가 겹쳐도 실제 조회는 한 번)
+ticker_flight = SingleFlight("ticker")
+quote_flight = SingleFlight("quote")
 
 async def find_ticker(query: str) -> dict | None:
     """입력된 쿼리(종목명 또는 티커)로 가장 적합한 티커 심볼을 찾습니다."""
-    if query in ticker_cache:
+    # 1. 오프라인 종목 인덱스 (티커/회사명/한글 별칭) - 네트워크 없이 즉시 응답
+    local = symbol_index.lookup(query)
+    if local:
+        return {"symbol": local["symbol"], "name": local["name"]}
+
+    # 2. 인덱스에서 찾지 못한 쿼리만 Yahoo 검색으로 폴백
+    cached = ticker_cache.get(query, MISSING)
+    if cached is not MISSING:
         logger.info(f"Found ticker in cache: {query}")
-        return ticker_cache[query]
+        return cached
 
+    return await ticker_flight.do(query, lambda: _search_ticker(query))
+
+async def _search_ticker(query: str) -> dict | None:
+    """Yahoo 검색 API로 티커를 조회하고 결과를 캐싱합니다."""
     logger.info(f"Searching ticker for: {query}")
     encoded_query = quote(query)
     url = f"https://query1.finance.yahoo.com/v1/finance/search?q={encoded_query}"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_clients.get("yahoo").get(url)
+        response.raise_for_status()
+        data = response.json()
 
         quotes = data.get('quotes', [])
         if not quotes:
+            ticker_cache.set_negative(query)
             return None
 
         best_result = next((q for q in quotes if q.get('quoteType') == 'EQUITY'), None)
@@ -41,74 +62,197 @@ async def find_ticker(query: str) -> dict | None:
             best_result = next((q for q in quotes if q.get('symbol')), None)
         
         if not best_result:
+            ticker_cache.set_negative(query)
             return None
 
         symbol = best_result.get('symbol')
         long_name = best_result.get('longname', best_result.get('shortname', ''))
         
         result = {"symbol": symbol, "name": long_name}
-        ticker_cache[query] = result
+        ticker_cache.set(query, result)
         return result
 
     except Exception as e:
         logger.error(f"Error finding ticker for {query}: {e}")
         return None
 
+def _short_name(ticker_symbol: str) -> str:
+    """
+    종가 시계열로 만든 시세(일괄 조회/history 경로)의 종목명.
+    이전에 캐시된 시세의 이름(ticker.info의 shortName) > 오프라인 종목 인덱스의 회사명 > 티커 순으로 사용합니다.
+    """
+    previous = price_cache.get_stale(ticker_symbol)
+    if isinstance(previous, dict) and "error" not in previous and previous.get("shortName") not in (None, ticker_symbol):
+        return previous["shortName"]
+    return symbol_index.name(ticker_symbol) or ticker_symbol
+
+def _build_quote(ticker_symbol: str, closes: pd.Series) -> dict:
+    """종가 시계열(최근 2일)로 시세 응답 딕셔너리를 만듭니다."""
+    current_price = closes.iloc[-1]
+    previous_close = closes.iloc[-2] if len(closes) > 1 else current_price
+    change = current_price - previous_close
+    change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
+
+    return {
+        "shortName": _short_name(ticker_symbol),
+        "currentPrice": float(current_price),
+        "previousClose": float(previous_close),
+        "change": float(change),
+        "changePercent": float(change_percent),
+        "currency": "USD"
+    }
+
 async def get_stock_info(ticker_symbol: str) -> dict:
     """yfinance를 사용하여 주식 정보를 가져오며, 1분간 캐싱을 적용합니다."""
     
-    # 1. 캐시 확인
-    now = time.time()
-    if ticker_symbol in price_cache:
-        cached_data, timestamp = price_cache[ticker_symbol]
-        if now - timestamp < CACHE_EXPIRE_SECONDS:
-            logger.info(f"💡 [Cache Hit] Returning cached price for {ticker_symbol}")
-            return cached_data
-
-    # 2. 캐시 없거나 만료된 경우 실제 조회
+    # 1. 캐시 확인 (최근 실패한 종목은 negative 캐시된 오류 응답을 그대로 반환)
+    cached_data = price_cache.get(ticker_symbol)
+    if cached_data is not None:
+        logger.info(f"💡 [Cache Hit] Returning cached price for {ticker_symbol}")
+        return cached_data
+
+    # 2. 핫 종목은 만료된 이전 시세를 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+    if ticker_symbol in hot_symbols:
+        stale = price_cache.get_stale(ticker_symbol)
+        if stale is not None:
+            revalidate([ticker_symbol])
+            return stale
+
+    # 3. 캐시 없거나 만료된 경우 실제 조회 (동시 요청은 하나의 조회를 공유)
+    return await quote_flight.do(ticker_symbol, lambda: _fetch_stock_info(ticker_symbol))
+
+async def _fetch_stock_info(ticker_symbol: str) -> dict:
+    """yfinance로 단일 종목 시세를 조회하고 캐시에 저장합니다."""
     logger.info(f"🌐 [API Fetch] Fetching real-time price for {ticker_symbol}")
-    ticker = yf.Ticker(ticker_symbol)
     try:
-        hist = ticker.history(period="2d")
-        
-        if hist.empty:
-            info = ticker.info
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            previous_close = info.get('previousClose')
-            short_name = info.get('shortName', ticker_symbol)
-            currency = info.get('currency', 'USD')
-        else:
-            current_price = hist['Close'].iloc[-1]
-            previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            short_name = ticker_symbol
-            currency = "USD" 
-
-        change = current_price - previous_close
-        change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
-
-        result = {
-            "shortName": short_name,
-            "currentPrice": float(current_price),
-            "previousClose": float(previous_close),
-            "change": float(change),
-            "changePercent": float(change_percent),
-            "currency": currency
-        }
-
-        # 3. 결과 캐싱
-        price_cache[ticker_symbol] = (result, now)
+        result = await run_yfinance(_load_stock_info, ticker_symbol)
+
+        # 4. 결과 캐싱
+        price_cache.set(ticker_symbol, result)
         return result
 
     except Exception as e:
         logger.error(f"Error fetching data for {ticker_symbol}: {e}")
-        return {"error": f"Failed to fetch data for {ticker_symbol}"}
+        error = {"error": f"Failed to fetch data for {ticker_symbol}"}
+        _cache_error(ticker_symbol, error)
+        return error
 
-async def get_stock_news(ticker_symbol: str) -> list:
-    """yfinance를 사용하여 특정 종목의 최신 뉴스 리스트를 가져옵니다."""
+def _cache_error(ticker_symbol: str, error: dict):
+    """조회 실패를 negative 캐싱합니다. 단, 아직 응답 가능한 이전 시세가 있으면 오류로 덮어쓰지 않습니다."""
+    if price_cache.get_stale(ticker_symbol) is None:
+        price_cache.set_negative(ticker_symbol, error)
+
+def _load_stock_info(ticker_symbol: str) -> dict:
+    """(블로킹) yfinance 시세 조회 - yfinance 전용 스레드 풀에서 실행됩니다."""
     ticker = yf.Ticker(ticker_symbol)
+    hist = ticker.history(period="2d")
+
+    if not hist.empty:
+        return _build_quote(ticker_symbol, hist['Close'])
+
+    info = ticker.info
+    current_price = info.get('currentPrice') or info.get('regularMarketPrice')
+    previous_close = info.get('previousClose')
+    short_name = info.get('shortName', ticker_symbol)
+    currency = info.get('currency', 'USD')
+
+    change = current_price - previous_close
+    change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
+
+    return {
+        "shortName": short_name,
+        "currentPrice": float(current_price),
+        "previousClose": float(previous_close),
+        "change": float(change),
+        "changePercent": float(change_percent),
+        "currency": currency
+    }
+
+async def get_stock_infos(symbols: list[str]) -> dict[str, dict]:
+    """
+    여러 종목의 시세를 한 번에 조회합니다.
+    캐시에 없는 종목만 모아 yf.download 한 번으로 일괄 조회하고, 결과를 price_cache에 채웁니다.
+    이미 다른 요청이 조회 중인 종목은 새로 받지 않고 그 결과를 기다립니다.
+    반환값은 {심볼: 시세 또는 {"error": ...}} 형태입니다.
+    """
+    results: dict[str, dict] = {}
+    missing: list[str] = []
+    stale_symbols: list[str] = []
+
+    for symbol in dict.fromkeys(symbols):
+        cached = price_cache.get(symbol)
+        if cached is None and symbol in hot_symbols:
+            cached = price_cache.get_stale(symbol)
+            if cached is not None:
+                stale_symbols.append(symbol)
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    if stale_symbols:
+        revalidate(stale_symbols)
+    if missing:
+        results.update(await _fetch_many(missing))
+    return results
+
+async def refresh_stock_infos(symbols: list[str]) -> dict[str, dict]:
+    """캐시를 무시하고 시세를 다시 조회합니다. (프리워머가 만료 직전의 핫 종목을 갱신할 때 사용)"""
+    return await _fetch_many(list(dict.fromkeys(symbols)))
+
+def revalidate(symbols: list[str]):
+    """이미 조회 중이 아닌 종목들의 시세 갱신을 백그라운드 태스크로 예약합니다."""
+    pending = [s for s in symbols if not quote_flight.is_inflight(s)]
+    if not pending:
+        return
+    task = asyncio.ensure_future(_fetch_many(pending))
+    _revalidate_tasks.add(task)
+    task.add_done_callback(_revalidate_tasks.discard)
+
+async def _fetch_many(missing: list[str]) -> dict[str, dict]:
+    """여러 종목을 한 번에 조회합니다. 이미 다른 요청이 조회 중인 종목은 그 결과를 기다립니다."""
+    to_fetch = [s for s in missing if not quote_flight.is_inflight(s)]
+    bulk = asyncio.ensure_future(_fetch_stock_infos(to_fetch)) if to_fetch else None
+
+    async def pick(symbol: str) -> dict:
+        return (await asyncio.shield(bulk))[symbol]
+
+    fetched = await asyncio.gather(*[
+        quote_flight.do(s, lambda s=s: pick(s) if s in to_fetch else _fetch_stock_info(s))
+        for s in missing
+    ])
+    return dict(zip(missing, fetched))
+
+async def _fetch_stock_infos(symbols: list[str]) -> dict[str, dict]:
+    """yf.download 한 번으로 여러 종목 시세를 조회하고 캐시에 저장합니다."""
+    logger.info(f"🌐 [API Fetch] Bulk fetching prices for {len(symbols)} symbols: {', '.join(symbols)}")
+    results: dict[str, dict] = {}
     try:
-        news = ticker.news
-        return news[:5]  # 최신 뉴스 5개만 반환
+        df = await run_yfinance(yf.download, symbols, period="2d", group_by="ticker", progress=False, threads=True)
     except Exception as e:
-        logger.error(f"Error fetching news for {ticker_symbol}: {e}")
-        return []
\ No newline at end of file
+        logger.error(f"Error bulk fetching data for {symbols}: {e}")
+        return {symbol: {"error": f"Failed to fetch data for {symbol}"} for symbol in symbols}
+
+    for symbol in symbols:
+        try:
+            if isinstance(df.columns, pd.MultiIndex):
+                closes = df[symbol]['Close'].dropna()
+            else:
+                closes = df['Close'].dropna()
+
+            if closes.empty:
+                raise ValueError("no price data")
+
+            result = _build_quote(symbol, closes)
+            price_cache.set(symbol, result)
+            results[symbol] = result
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            results[symbol] = {"error": f"Failed to fetch data for {symbol}"}
+            _cache_error(symbol, results[symbol])
+
+    return results
+
+async def get_stock_news(ticker_symbol: str) -> list:
+    """특정 종목의 최신 뉴스 5개를 공유 뉴스 저장소(uuid 중복 제거, TTL 캐싱)에서 가져옵니다."""
+    return await news_store.get_symbol_news(ticker_symbol, limit=5)
@@ -1,22 +1,36 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from core.models import TradingStrategy
 from core.indicator_service import IndicatorService
+from core.expression_strategy import RuleError, env_from_indicators, get_compiled_strategy
 from bot.config import logger
 
+# RSI_LIMIT 기본 임계값 (실시간 평가와 백테스트가 같은 값을 사용)
+RSI_LIMIT_DEFAULTS = {"buy_rsi": 30, "sell_rsi": 70}
+
 class StrategyService:
     def __init__(self, indicator_service: IndicatorService):
         self.indicator_service = indicator_service
 
-    async def evaluate_strategy(self, strategy: TradingStrategy) -> str:
+    @staticmethod
+    def rsi_limit_thresholds(params: Dict[str, Any]) -> tuple:
+        """RSI_LIMIT 전략 파라미터에서 (매수 RSI, 매도 RSI) 임계값을 꺼냅니다."""
+        return (
+            params.get("buy_rsi", RSI_LIMIT_DEFAULTS["buy_rsi"]),
+            params.get("sell_rsi", RSI_LIMIT_DEFAULTS["sell_rsi"]),
+        )
+
+    async def evaluate_strategy(self, strategy: TradingStrategy, indicators: Optional[Dict[str, Any]] = None) -> str:
         """
         전략을 평가하여 액션(BUY, SELL, HOLD)을 반환합니다.
+        indicators를 주면(워커의 패널 일괄 계산 결과 등) 지표를 다시 계산하지 않습니다.
         """
         symbol = strategy.symbol
         params = json.loads(strategy.parameters)
         
         # 최신 지표 데이터 가져오기
-        indicators = await self.indicator_service.get_indicators(symbol)
+        if indicators is None:
+            indicators = await self.indicator_service.get_indicators(symbol)
         if "error" in indicators:
             logger.error(f"Strategy eval failed for {symbol}: {indicators['error']}")
             return "HOLD"
@@ -25,8 +39,7 @@ class StrategyService:
         
         # 1. RSI 기반 전략 (예시)
         if strategy.strategy_type == "RSI_LIMIT":
-            buy_threshold = params.get("buy_rsi", 30)
-            sell_threshold = params.get("sell_rsi", 70)
+            buy_threshold, sell_threshold = self.rsi_limit_thresholds(params)
             
             if rsi is not None:
                 if rsi <= buy_threshold:
@@ -34,7 +47,20 @@ class StrategyService:
                 elif rsi >= sell_threshold:
                     return "SELL"
         
-        # 2. 고정 익절/손절 전략 (추후 확장 가능)
+        # 2. 수식 규칙 전략 (예: {"buy_rule": "rsi < 30 and close < bb_lower", "sell_rule": "rsi > 70"})
+        elif strategy.strategy_type == "EXPRESSION":
+            try:
+                compiled = get_compiled_strategy(strategy)
+            except RuleError as e:
+                logger.error(f"Invalid rule for strategy {strategy.id}: {e}")
+                return "HOLD"
+            signal = int(compiled.signals(env_from_indicators(indicators)))
+            if signal == 1:
+                return "BUY"
+            elif signal == -1:
+                return "SELL"
+
+        # 3. 고정 익절/손절 전략 (추후 확장 가능)
         # ... 
         
         return "HOLD"
@@ -0,0 +1,258 @@
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+# IndicatorService의 배치 함수(pandas rolling/ewm)와 같은 값을 새 바 하나당 O(1)로 계산하는 상태 기반 지표.
+# to_state()/from_state()로 상태를 저장/복원할 수 있어, 프로세스가 재시작되어도 과거 데이터를 다시 계산하지 않습니다.
+
+NAN = float("nan")
+
+class RollingWindow:
+    """고정 길이 윈도우의 합계를 누적 갱신합니다. (합이 0이어야 하는 경우 누적 오차를 0으로 보정)"""
+
+    def __init__(self, size: int, values: Optional[Iterable[float]] = None):
+        self.size = size
+        self.values: deque = deque(maxlen=size)
+        self.total = 0.0
+        self.nonzero = 0
+        for v in values or []:
+            self.push(v)
+
+    def _sum_after(self, value: float) -> tuple:
+        total, nonzero = self.total + value, self.nonzero + (value != 0)
+        if len(self.values) == self.size:
+            old = self.values[0]
+            total -= old
+            nonzero -= (old != 0)
+        return (0.0 if nonzero == 0 else total), nonzero
+
+    def push(self, value: float):
+        self.total, self.nonzero = self._sum_after(value)
+        self.values.append(value)
+
+    def mean_after(self, value: float) -> float:
+        """value를 추가했을 때의 평균 (상태는 바꾸지 않음). 윈도우가 다 차지 않으면 NaN"""
+        if len(self.values) + 1 < self.size:
+            return NAN
+        return self._sum_after(value)[0] / self.size
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.values) == self.size
+
+class StreamingRSI:
+    """calculate_rsi()와 같은 단순 이동평균 RSI. 첫 바의 변화량은 0으로 취급합니다. (pandas diff + where와 동일)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.value = NAN
+
+    def _changes(self, close: float) -> tuple:
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if math.isnan(gain) or math.isnan(loss):
+            return NAN
+        if loss == 0:
+            return NAN if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+    def peek(self, close: float) -> float:
+        """close로 바가 마감된다고 가정했을 때의 RSI (상태는 바꾸지 않음, 틱 단위 평가용)"""
+        gain, loss = self._changes(close)
+        return self._rsi(self.gains.mean_after(gain), self.losses.mean_after(loss))
+
+    def update(self, close: float) -> float:
+        gain, loss = self._changes(close)
+        self.value = self._rsi(self.gains.mean_after(gain), self.losses.mean_after(loss))
+        self.gains.push(gain)
+        self.losses.push(loss)
+        self.prev_close = close
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"period": self.period, "prev_close": self.prev_close,
+                "gains": list(self.gains.values), "losses": list(self.losses.values), "value": self.value}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingRSI":
+        obj = cls(state["period"])
+        obj.prev_close = state["prev_close"]
+        obj.gains = RollingWindow(obj.period, state["gains"])
+        obj.losses = RollingWindow(obj.period, state["losses"])
+        obj.value = state["value"]
+        return obj
+
+class StreamingEMA:
+    """pandas ewm(span, adjust=False).mean()과 같은 지수이동평균"""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = NAN
+
+    def peek(self, x: float) -> float:
+        return x if math.isnan(self.value) else self.value + self.alpha * (x - self.value)
+
+    def update(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"span": self.span, "value": self.value}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingEMA":
+        obj = cls(state["span"])
+        obj.value = state["value"]
+        return obj
+
+class StreamingMACD:
+    """calculate_macd()와 같은 MACD (빠른/느린 EMA 차이와 그 시그널선)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    @staticmethod
+    def _result(macd: float, signal: float) -> Dict[str, float]:
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+    @property
+    def value(self) -> Dict[str, float]:
+        return self._result(self.fast.value - self.slow.value, self.signal.value)
+
+    def peek(self, close: float) -> Dict[str, float]:
+        macd = self.fast.peek(close) - self.slow.peek(close)
+        return self._result(macd, self.signal.peek(macd))
+
+    def update(self, close: float) -> Dict[str, float]:
+        macd = self.fast.update(close) - self.slow.update(close)
+        return self._result(macd, self.signal.update(macd))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"fast": self.fast.to_state(), "slow": self.slow.to_state(), "signal": self.signal.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingMACD":
+        obj = cls()
+        obj.fast = StreamingEMA.from_state(state["fast"])
+        obj.slow = StreamingEMA.from_state(state["slow"])
+        obj.signal = StreamingEMA.from_state(state["signal"])
+        return obj
+
+class StreamingBollinger:
+    """
+    calculate_bollinger_bands()와 같은 볼린저 밴드 (이동평균 ± 표본표준편차(ddof=1) × std_dev).
+    합/제곱합은 첫 값을 기준점(offset)으로 뺀 값으로 누적하여 가격 수준이 커도 상쇄 오차를 줄입니다.
+    """
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.offset: Optional[float] = None
+        self.window: deque = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def _sums_after(self, close: float) -> tuple:
+        offset = close if self.offset is None else self.offset
+        x = close - offset
+        total, total_sq = self.total + x, self.total_sq + x * x
+        if len(self.window) == self.period:
+            old = self.window[0]
+            total -= old
+            total_sq -= old * old
+        return offset, x, total, total_sq
+
+    def _bands(self, offset: float, total: float, total_sq: float) -> Dict[str, float]:
+        n = self.period
+        mean = total / n
+        variance = max((total_sq - total * mean) / (n - 1), 0.0) if n > 1 else NAN
+        std = math.sqrt(variance)
+        middle = mean + offset
+        return {"upper": middle + std * self.std_dev, "middle": middle, "lower": middle - std * self.std_dev}
+
+    @property
+    def value(self) -> Dict[str, float]:
+        if len(self.window) < self.period:
+            return {"upper": NAN, "middle": NAN, "lower": NAN}
+        return self._bands(self.offset, self.total, self.total_sq)
+
+    def peek(self, close: float) -> Dict[str, float]:
+        if len(self.window) + 1 < self.period:
+            return {"upper": NAN, "middle": NAN, "lower": NAN}
+        offset, _, total, total_sq = self._sums_after(close)
+        return self._bands(offset, total, total_sq)
+
+    def update(self, close: float) -> Dict[str, float]:
+        result = self.peek(close)
+        self.offset, x, self.total, self.total_sq = self._sums_after(close)
+        self.window.append(x)
+        return result
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"period": self.period, "std_dev": self.std_dev, "offset": self.offset,
+                "window": list(self.window), "total": self.total, "total_sq": self.total_sq}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingBollinger":
+        obj = cls(state["period"], state["std_dev"])
+        obj.offset = state["offset"]
+        obj.window = deque(state["window"], maxlen=obj.period)
+        obj.total = state["total"]
+        obj.total_sq = state["total_sq"]
+        return obj
+
+class StreamingIndicators:
+    """한 종목의 RSI/MACD/볼린저 밴드를 함께 관리합니다. get_indicators()의 최신값과 같은 키를 반환합니다."""
+
+    def __init__(self, rsi: Optional[StreamingRSI] = None, macd: Optional[StreamingMACD] = None,
+                 bollinger: Optional[StreamingBollinger] = None):
+        self.rsi = rsi or StreamingRSI()
+        self.macd = macd or StreamingMACD()
+        self.bollinger = bollinger or StreamingBollinger()
+        self.bars = 0
+
+    @classmethod
+    def from_closes(cls, closes: Iterable[float]) -> "StreamingIndicators":
+        """과거 종가로 상태를 한 번 채웁니다. (이후로는 update()만 호출)"""
+        obj = cls()
+        for close in closes:
+            obj.update(close)
+        return obj
+
+    @staticmethod
+    def _result(close: float, rsi: float, macd: Dict[str, float], bollinger: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "current_price": close,
+            "rsi": None if math.isnan(rsi) else rsi,
+            "macd": {"val": macd["macd"], "signal": macd["signal"], "hist": macd["histogram"]},
+            "bollinger": bollinger,
+        }
+
+    def peek(self, close: float) -> Dict[str, Any]:
+        """진행 중인 바의 현재가(틱)로 지표를 계산합니다. (상태는 바꾸지 않음)"""
+        return self._result(close, self.rsi.peek(close), self.macd.peek(close), self.bollinger.peek(close))
+
+    def update(self, close: float) -> Dict[str, Any]:
+        """마감된 바의 종가를 반영합니다."""
+        self.bars += 1
+        return self._result(close, self.rsi.update(close), self.macd.update(close), self.bollinger.update(close))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"bars": self.bars, "rsi": self.rsi.to_state(), "macd": self.macd.to_state(),
+                "bollinger": self.bollinger.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingIndicators":
+        obj = cls(StreamingRSI.from_state(state["rsi"]), StreamingMACD.from_state(state["macd"]),
+                  StreamingBollinger.from_state(state["bollinger"]))
+        obj.bars = state["bars"]
+        return obj
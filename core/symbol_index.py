@@ -0,0 +1,217 @@
+import bisect
+import csv
+import difflib
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("symbol_index")
+
+DEFAULT_LISTINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "symbols.csv")
+
+# 한글 별칭 -> (티커, 이름). 상장 목록 파일이 없어도 자주 쓰는 종목은 네트워크 없이 찾을 수 있도록 내장
+KOREAN_ALIASES: Dict[str, Tuple[str, str]] = {
+    "애플": ("AAPL", "Apple Inc."),
+    "마이크로소프트": ("MSFT", "Microsoft Corporation"),
+    "마소": ("MSFT", "Microsoft Corporation"),
+    "엔비디아": ("NVDA", "NVIDIA Corporation"),
+    "테슬라": ("TSLA", "Tesla, Inc."),
+    "아마존": ("AMZN", "Amazon.com, Inc."),
+    "구글": ("GOOGL", "Alphabet Inc."),
+    "알파벳": ("GOOGL", "Alphabet Inc."),
+    "메타": ("META", "Meta Platforms, Inc."),
+    "페이스북": ("META", "Meta Platforms, Inc."),
+    "넷플릭스": ("NFLX", "Netflix, Inc."),
+    "브로드컴": ("AVGO", "Broadcom Inc."),
+    "에이엠디": ("AMD", "Advanced Micro Devices, Inc."),
+    "인텔": ("INTC", "Intel Corporation"),
+    "퀄컴": ("QCOM", "QUALCOMM Incorporated"),
+    "마이크론": ("MU", "Micron Technology, Inc."),
+    "팔란티어": ("PLTR", "Palantir Technologies Inc."),
+    "코인베이스": ("COIN", "Coinbase Global, Inc."),
+    "마이크로스트래티지": ("MSTR", "MicroStrategy Incorporated"),
+    "스트래티지": ("MSTR", "MicroStrategy Incorporated"),
+    "아이온큐": ("IONQ", "IonQ, Inc."),
+    "어도비": ("ADBE", "Adobe Inc."),
+    "오라클": ("ORCL", "Oracle Corporation"),
+    "세일즈포스": ("CRM", "Salesforce, Inc."),
+    "티에스엠씨": ("TSM", "Taiwan Semiconductor Manufacturing Company Limited"),
+    "TSMC": ("TSM", "Taiwan Semiconductor Manufacturing Company Limited"),
+    "에이에스엠엘": ("ASML", "ASML Holding N.V."),
+    "버크셔해서웨이": ("BRK-B", "Berkshire Hathaway Inc."),
+    "제이피모건": ("JPM", "JPMorgan Chase & Co."),
+    "비자": ("V", "Visa Inc."),
+    "마스터카드": ("MA", "Mastercard Incorporated"),
+    "코카콜라": ("KO", "The Coca-Cola Company"),
+    "펩시": ("PEP", "PepsiCo, Inc."),
+    "맥도날드": ("MCD", "McDonald's Corporation"),
+    "스타벅스": ("SBUX", "Starbucks Corporation"),
+    "나이키": ("NKE", "NIKE, Inc."),
+    "디즈니": ("DIS", "The Walt Disney Company"),
+    "월마트": ("WMT", "Walmart Inc."),
+    "코스트코": ("COST", "Costco Wholesale Corporation"),
+    "일라이릴리": ("LLY", "Eli Lilly and Company"),
+    "노보노디스크": ("NVO", "Novo Nordisk A/S"),
+    "화이자": ("PFE", "Pfizer Inc."),
+    "엑슨모빌": ("XOM", "Exxon Mobil Corporation"),
+    "우버": ("UBER", "Uber Technologies, Inc."),
+    "에어비앤비": ("ABNB", "Airbnb, Inc."),
+    "쇼피파이": ("SHOP", "Shopify Inc."),
+    "리비안": ("RIVN", "Rivian Automotive, Inc."),
+    "루시드": ("LCID", "Lucid Group, Inc."),
+    "슈퍼마이크로": ("SMCI", "Super Micro Computer, Inc."),
+    "암홀딩스": ("ARM", "Arm Holdings plc"),
+    "큐큐큐": ("QQQ", "Invesco QQQ Trust"),
+    "나스닥100": ("QQQ", "Invesco QQQ Trust"),
+    "에스앤피500": ("SPY", "SPDR S&P 500 ETF Trust"),
+    "에스엔피500": ("SPY", "SPDR S&P 500 ETF Trust"),
+    "티큐큐큐": ("TQQQ", "ProShares UltraPro QQQ"),
+    "속슬": ("SOXL", "Direxion Daily Semiconductor Bull 3X Shares"),
+    "슈드": ("SCHD", "Schwab U.S. Dividend Equity ETF"),
+    "나스닥": ("^IXIC", "NASDAQ Composite"),
+    "빅스": ("^VIX", "CBOE Volatility Index"),
+}
+
+# 이름 비교 시 무시하는 회사 형태/증권 종류 접미어
+_NAME_SUFFIXES = re.compile(
+    r"\b(inc|incorporated|corp|corporation|co|company|ltd|limited|plc|holdings?|group|nv|sa|ag|"
+    r"common stock|ordinary shares?|class [a-c]|american depositary shares?|ads|units?)\b"
+)
+
+def normalize(text: str) -> str:
+    """검색 비교용 정규화: 소문자화, 기호/공백 제거 (한글은 그대로 유지)"""
+    return re.sub(r"[^0-9a-z가-힣^=]", "", text.lower())
+
+def normalize_name(name: str) -> str:
+    """회사명 정규화: ' - Common Stock' 같은 증권 설명과 Inc/Corp 등 접미어 제거"""
+    base = name.split(" - ")[0].lower()
+    return normalize(_NAME_SUFFIXES.sub(" ", base))
+
+class SymbolIndex:
+    """
+    NASDAQ/NYSE/ETF 상장 목록과 한글 별칭으로 만든 오프라인 종목 검색 인덱스.
+    정규화된 검색 키를 정렬된 리스트로 보관해 bisect로 접두어 검색을 하며, 네트워크를 사용하지 않습니다.
+    """
+
+    def __init__(self, listings_path: Optional[str] = None):
+        self.listings_path = listings_path
+        self._loaded = False
+        self._records: Dict[str, Tuple[str, str, bool]] = {}  # symbol -> (name, exchange, is_etf)
+        self._exact: Dict[str, str] = {}                      # 정규화된 이름/별칭 -> symbol
+        self._keys: List[str] = []                            # 정렬된 검색 키
+        self._key_symbols: List[str] = []                     # _keys와 같은 순서의 symbol
+
+    def load(self, listings_path: Optional[str] = None) -> "SymbolIndex":
+        """상장 목록 CSV(symbol,name,exchange,etf)와 내장 별칭으로 인덱스를 구성합니다."""
+        path = listings_path or self.listings_path
+        entries: List[Tuple[str, str]] = []
+        records: Dict[str, Tuple[str, str, bool]] = {}
+        exact: Dict[str, str] = {}
+
+        if path and os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    symbol = row["symbol"].strip().upper()
+                    if not symbol:
+                        continue
+                    name = row.get("name", "").strip()
+                    records[symbol] = (name, row.get("exchange", "").strip(), row.get("etf", "N").strip().upper() == "Y")
+                    entries.append((normalize(symbol), symbol))
+                    name_key = normalize_name(name)
+                    if name_key:
+                        exact.setdefault(name_key, symbol)
+                        entries.append((name_key, symbol))
+        else:
+            logger.warning(f"Symbol listings file not found ({path}). Only built-in aliases are available.")
+
+        for alias, (symbol, name) in KOREAN_ALIASES.items():
+            records.setdefault(symbol, (name, "", False))
+            exact[normalize(alias)] = symbol
+            entries.append((normalize(alias), symbol))
+
+        entries.sort()
+        self._records = records
+        self._exact = exact
+        self._keys = [k for k, _ in entries]
+        self._key_symbols = [s for _, s in entries]
+        self._loaded = True
+        logger.info(f"Symbol index loaded: {len(records)} symbols, {len(entries)} keys")
+        return self
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _result(self, symbol: str) -> Dict[str, str]:
+        name, exchange, is_etf = self._records[symbol]
+        return {"symbol": symbol, "name": name, "exchange": exchange, "type": "ETF" if is_etf else "EQUITY"}
+
+    def name(self, symbol: str) -> Optional[str]:
+        """종목의 회사명 (상장 목록의 " - Common Stock" 같은 증권 종류 설명은 제외). 인덱스에 없으면 None"""
+        self._ensure_loaded()
+        record = self._records.get(symbol.upper())
+        if record is None or not record[0]:
+            return None
+        return record[0].split(" - ")[0].strip()
+
+    def _rank(self, symbol: str, key: str) -> tuple:
+        # 짧은 키(더 정확한 일치) > 일반 주식 > 짧은 티커 순
+        return (len(key), self._records[symbol][2], len(symbol))
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """접두어 검색 (자동완성용). 티커/회사명/한글 별칭을 모두 대상으로 합니다."""
+        self._ensure_loaded()
+        q = normalize(query)
+        if not q:
+            return []
+        lo = bisect.bisect_left(self._keys, q)
+        hi = bisect.bisect_left(self._keys, q + "\uffff", lo)
+        candidates: Dict[str, tuple] = {}
+        # 매우 짧은 접두어는 후보가 많으므로 앞쪽 일부만 평가
+        for i in range(lo, min(hi, lo + 500)):
+            symbol = self._key_symbols[i]
+            rank = self._rank(symbol, self._keys[i])
+            if symbol not in candidates or rank < candidates[symbol]:
+                candidates[symbol] = rank
+        exact_symbol = query.strip().upper()
+        ordered = sorted(candidates, key=lambda s: (s != exact_symbol, candidates[s]))
+        return [self._result(s) for s in ordered[:limit]]
+
+    def lookup(self, query: str) -> Optional[Dict[str, str]]:
+        """
+        쿼리에 가장 적합한 종목 하나를 찾습니다. (티커 정확 일치 > 별칭/회사명 일치 > 접두어 > 오타 보정)
+        찾지 못하면 None을 반환하며, 이 경우 호출 측에서 Yahoo 검색으로 폴백합니다.
+        """
+        self._ensure_loaded()
+        raw = query.strip()
+        upper = raw.upper()
+        for candidate in (upper, upper.replace(".", "-")):
+            if candidate in self._records:
+                return self._result(candidate)
+
+        q = normalize(raw)
+        if not q:
+            return None
+        if q in self._exact:
+            return self._result(self._exact[q])
+        name_q = normalize_name(raw)
+        if name_q in self._exact:
+            return self._result(self._exact[name_q])
+
+        if len(q) >= 3:
+            matches = self.search(raw, limit=1)
+            if matches:
+                return matches[0]
+
+        if len(q) >= 4:
+            # 같은 첫 글자로 시작하는 키 중에서만 유사도 비교 (오타 보정)
+            lo = bisect.bisect_left(self._keys, q[0])
+            hi = bisect.bisect_left(self._keys, q[0] + "\uffff", lo)
+            close = difflib.get_close_matches(q, self._keys[lo:hi], n=1, cutoff=0.8)
+            if close:
+                return self._result(self._key_symbols[bisect.bisect_left(self._keys, close[0])])
+        return None
+
+# 글로벌 인스턴스 (최초 검색 시 지연 로드)
+symbol_index = SymbolIndex(os.getenv("SYMBOL_LISTINGS_PATH", DEFAULT_LISTINGS_PATH))
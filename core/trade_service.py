@@ -2,10 +2,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from core.models import User, StockAsset, TradeLog, EquitySnapshot
 from core.broker import TradingBroker
-from core.stock_service import get_stock_info
+from core.quote_feed import get_quote, get_quotes
 from core.notification_service import notification_service
 from bot.config import logger
 from datetime import datetime
+from collections import defaultdict
+from typing import List
 import asyncio
 
 class TradeService:
@@ -26,7 +28,7 @@ class TradeService:
         result = await session.execute(statement)
         db_user = result.scalar_one()
 
-        stock_data = await get_stock_info(symbol)
+        stock_data = await get_quote(symbol)
         if "error" in stock_data:
             return {"error": f"Failed to fetch price for {symbol}"}
         
@@ -133,8 +135,11 @@ class TradeService:
         total_market_value = 0.0
         total_unrealized_profit = 0.0
         
-        async def enrich_asset(asset):
-            stock_data = await get_stock_info(asset.symbol)
+        # 보유 종목 시세는 시세 보드에서 읽고, 보드에 없는 종목만 한 번에 일괄 조회
+        quotes = await get_quotes([a.symbol for a in assets])
+
+        def enrich_asset(asset):
+            stock_data = quotes.get(asset.symbol, {})
             current_price = stock_data.get("currentPrice", asset.average_price)
             
             asset_dict = asset.dict()
@@ -145,7 +150,7 @@ class TradeService:
             asset_dict["profit_rate"] = profit_rate
             return asset_dict, (current_price * asset.quantity), profit
 
-        results = await asyncio.gather(*[enrich_asset(a) for a in assets])
+        results = [enrich_asset(a) for a in assets]
         
         enriched_assets = []
         for asset_data, market_val, profit in results:
@@ -178,13 +183,30 @@ class TradeService:
 
     async def record_equity_snapshot(self, session: AsyncSession, user: User):
         """현재 총 자산(현금+주식) 상태를 기록합니다."""
-        portfolio = await self.get_user_portfolio(session, user)
-        total_equity = portfolio["summary"]["total_equity"]
-        
-        snapshot = EquitySnapshot(user_id=user.id, total_equity=total_equity)
-        session.add(snapshot)
+        await self.record_equity_snapshots(session, [user])
+
+    async def record_equity_snapshots(self, session: AsyncSession, users: List[User]) -> List[EquitySnapshot]:
+        """
+        여러 사용자의 총 자산을 한 번에 기록합니다.
+        보유 자산은 한 번의 쿼리로, 시세는 한 번의 일괄 조회로 가져오고, 스냅샷은 한 번에 추가하여 한 번만 커밋합니다.
+        (시세가 없는 종목은 get_user_portfolio()와 같이 평균 단가로 평가)
+        """
+        if not users:
+            return []
+        asset_statement = select(StockAsset).where(StockAsset.user_id.in_([u.id for u in users]))
+        assets = (await session.execute(asset_statement)).scalars().all()
+        quotes = await get_quotes(sorted({a.symbol for a in assets}))
+
+        market_values = defaultdict(float)
+        for asset in assets:
+            current_price = quotes.get(asset.symbol, {}).get("currentPrice", asset.average_price)
+            market_values[asset.user_id] += current_price * asset.quantity
+
+        snapshots = [EquitySnapshot(user_id=u.id, total_equity=u.cash_balance + market_values[u.id]) for u in users]
+        session.add_all(snapshots)
         await session.commit()
-        logger.info(f"💾 Saved equity snapshot for {user.username}: ${total_equity:.2f}")
+        logger.info(f"💾 Saved equity snapshots for {len(snapshots)} users")
+        return snapshots
 
     async def get_equity_history(self, session: AsyncSession, user: User):
         """사용자의 자산 변화 이력을 조회합니다."""
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# (user_id, symbol) -> 보유 포지션 하나. StockAsset도 사용자·종목당 한 행입니다.
+PositionKey = Tuple[int, str]
+
+@dataclass(frozen=True)
+class Trigger:
+    user_id: int
+    symbol: str
+    kind: str  # "STOP"(손절) 또는 "TARGET"(익절)
+    level: float
+    price: float  # 트리거를 발생시킨 시세
+
+class TriggerIndex:
+    """
+    포지션별 손절가/익절가를 종목별 힙에 보관하여, 시세 한 틱마다 가격을 넘은 트리거만 꺼냅니다.
+    손절은 최대 힙(가장 높은 손절가가 맨 위, 가격 <= 손절가면 발동), 익절은 최소 힙(가격 >= 익절가면 발동)이므로
+    틱당 비용은 O(발동 수 · log n)이고 발동하지 않은 포지션은 보지 않습니다.
+    수정/삭제는 힙에서 바로 지우지 않고 버전으로 무효화(lazy deletion)하며, 꺼낼 때 버립니다.
+    """
+
+    def __init__(self):
+        self._stops: Dict[str, list] = {}
+        self._targets: Dict[str, list] = {}
+        # 포지션별 현재 (손절가, 익절가, 버전). 힙 항목의 버전이 다르면 무효
+        self._levels: Dict[PositionKey, Tuple[Optional[float], Optional[float], int]] = {}
+        self._versions = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __contains__(self, key: PositionKey) -> bool:
+        return key in self._levels
+
+    def levels(self, user_id: int, symbol: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        entry = self._levels.get((user_id, symbol))
+        return None if entry is None else entry[:2]
+
+    def set(self, user_id: int, symbol: str, stop_price: Optional[float] = None, target_price: Optional[float] = None):
+        """포지션의 손절가/익절가를 등록하거나 바꿉니다. 둘 다 None이면 제거합니다."""
+        key = (user_id, symbol)
+        if stop_price is None and target_price is None:
+            self.remove(user_id, symbol)
+            return
+        version = next(self._versions)
+        self._levels[key] = (stop_price, target_price, version)
+        if stop_price is not None:
+            heapq.heappush(self._stops.setdefault(symbol, []), (-stop_price, version, user_id))
+        if target_price is not None:
+            heapq.heappush(self._targets.setdefault(symbol, []), (target_price, version, user_id))
+        self._compact(symbol)
+
+    def remove(self, user_id: int, symbol: str):
+        """포지션을 인덱스에서 뺍니다. 힙 항목은 나중에 꺼낼 때 버려집니다."""
+        self._levels.pop((user_id, symbol), None)
+
+    def crossed(self, symbol: str, price: float) -> List[Trigger]:
+        """
+        price에서 발동한 트리거를 꺼내 반환하고 해당 포지션은 인덱스에서 제거합니다. (한 번만 발동)
+        한 포지션의 손절과 익절이 같은 틱에 모두 걸리면 손절을 우선합니다.
+        """
+        fired: Dict[PositionKey, Trigger] = {}
+        stops = self._stops.get(symbol, [])
+        while stops and -stops[0][0] >= price:
+            neg_level, version, user_id = heapq.heappop(stops)
+            if self._is_live(user_id, symbol, version):
+                fired[(user_id, symbol)] = Trigger(user_id, symbol, "STOP", -neg_level, price)
+        targets = self._targets.get(symbol, [])
+        while targets and targets[0][0] <= price:
+            level, version, user_id = heapq.heappop(targets)
+            if self._is_live(user_id, symbol, version):
+                fired.setdefault((user_id, symbol), Trigger(user_id, symbol, "TARGET", level, price))
+        for key in fired:
+            self._levels.pop(key, None)
+        return list(fired.values())
+
+    def _is_live(self, user_id: int, symbol: str, version: int) -> bool:
+        entry = self._levels.get((user_id, symbol))
+        return entry is not None and entry[2] == version
+
+    def _compact(self, symbol: str):
+        """무효 항목이 유효 항목보다 훨씬 많아지면 종목의 힙을 다시 만듭니다. (자주 수정되는 포지션의 메모리 제한)"""
+        for heaps in (self._stops, self._targets):
+            heap = heaps.get(symbol)
+            if heap is None or len(heap) < 64:
+                continue
+            live = [item for item in heap if self._is_live(item[2], symbol, item[1])]
+            if len(live) * 2 < len(heap):
+                heapq.heapify(live)
+                heaps[symbol] = live
+
+    def symbols(self) -> List[str]:
+        """트리거가 걸린 종목 목록 (시세 피드 watchlist용)"""
+        return sorted({symbol for _, symbol in self._levels})
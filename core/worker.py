@@ -1,18 +1,50 @@
 import asyncio
+import logging
+import os
+import signal
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from core.database import engine
+from core.database import engine, init_db
 from core.models import TradingStrategy, User
 from core.strategy_service import StrategyService
 from core.trade_service import TradeService
 from core.notification_service import notification_service
+from core.quote_feed import quote_feed
+from core.exit_manager import ExitManager
+from core.job_queue import JOB_EXIT_LEVELS, JOB_OPTIMIZE, JobRunner
+from core.optimizer import optimizer
+from core.indicator_service import IndicatorService
+from core.kis_broker import KISBroker
+from core.mock_broker import MockBroker
+from core.prewarmer import prewarmer
+from core.executor import yfinance_executor
+from core.http_client import http_clients
+from core import market_calendar
+from core.market_calendar import AFTER_HOURS, CLOSED, PRE_MARKET, REGULAR
+from core.lease_manager import LeaseManager
+from core.live_indicators import LiveIndicators, live_indicators
 from bot.config import logger
 from sqlalchemy.orm import sessionmaker
 
+# 동시에 평가하는 종목 그룹 수의 상한
+WORKER_MAX_CONCURRENCY = int(os.getenv("WORKER_MAX_CONCURRENCY", "8"))
+# 장전/장후 거래 시간의 실행 주기 (초)
+WORKER_EXTENDED_INTERVAL_SECONDS = float(os.getenv("WORKER_EXTENDED_INTERVAL_SECONDS", "300"))
+EQUITY_SNAPSHOT_LEASE = "equity_snapshot"
+
 class TradingWorker:
-    def __init__(self, strategy_service: StrategyService, trade_service: TradeService):
+    def __init__(self, strategy_service: StrategyService, trade_service: TradeService,
+                 max_concurrency: int = WORKER_MAX_CONCURRENCY, leases: Optional[LeaseManager] = None,
+                 live: LiveIndicators = live_indicators):
         self.strategy_service = strategy_service
         self.trade_service = trade_service
+        self.max_concurrency = max_concurrency
+        # 여러 워커 프로세스가 전략을 나눠 갖도록 DB 리스 사용 (프로세스마다 고유한 worker_id)
+        self.leases = leases or LeaseManager()
+        # 시세 틱마다 O(1)로 갱신되는 지표. 최근 틱이 있는 종목은 패널을 다시 계산하지 않음
+        self.live = live
         self.is_running = False
 
     async def run_once(self):
@@ -27,50 +59,196 @@ class TradingWorker:
             
             user_switch_map = {user.id: user.is_auto_trading_enabled for user in all_users}
 
-            # 2. 자산 스냅샷 기록
-            for user in all_users:
+            # 2. 자산 스냅샷 기록 (전체 사용자를 한 번의 조회/커밋으로). 여러 워커 중 리스를 가진 하나만 기록
+            try:
+                if await self.leases.acquire(session, EQUITY_SNAPSHOT_LEASE):
+                    await self.trade_service.record_equity_snapshots(session, all_users)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to save equity snapshots: {e}")
+
+            # 3. 이 워커가 리스로 확보한 활성 전략 (마스터 스위치가 꺼진 사용자의 전략은 제외)
+            claimed = await self.leases.claim_strategies(session)
+            active_strategies = [s for s in claimed if user_switch_map.get(s.user_id, True)]
+            quote_feed.watch({s.symbol for s in active_strategies})
+
+            # 4. 종목별로 묶어 종목당 한 번만 지표를 계산/평가 (종목 그룹은 세마포어 한도 안에서 동시에 실행)
+            groups: Dict[str, List[TradingStrategy]] = defaultdict(list)
+            for strategy in active_strategies:
+                groups[strategy.symbol].append(strategy)
+            logger.info(f"Checking {len(active_strategies)} active strategies across {len(groups)} symbols...")
+
+            indicators_map = {}
+            for symbol in groups:
+                live = self.live.get(symbol)
+                if live is not None:
+                    indicators_map[symbol] = live
+            missing = [s for s in groups if s not in indicators_map]
+            if missing:
                 try:
-                    await self.trade_service.record_equity_snapshot(session, user)
+                    indicators_map.update(await self.strategy_service.indicator_service.get_latest_indicators(missing))
                 except Exception as e:
-                    logger.error(f"Failed to save snapshot for {user.username}: {e}")
+                    logger.error(f"Panel indicator computation failed: {e}")
+            try:
+                # 새로 평가하는 종목은 다음 틱부터 증분 갱신되도록 상태를 채움
+                await self.live.track(groups)
+            except Exception as e:
+                logger.error(f"Live indicator seeding failed: {e}")
 
-            # 3. 활성화된 전략 목록 가져오기
-            statement = select(TradingStrategy).where(TradingStrategy.is_active == True)
-            result = await session.execute(statement)
-            active_strategies = result.scalars().all()
-            
-            logger.info(f"Checking {len(active_strategies)} active strategies...")
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            evaluated = await asyncio.gather(*[
+                self.evaluate_symbol(symbol, strategies, indicators_map.get(symbol), semaphore)
+                for symbol, strategies in groups.items()
+            ])
 
-            for strategy in active_strategies:
+            # 5. 주문은 하나의 세션에서 (사용자 id, 전략 id) 순서로 적용 -> 실행 순서가 매 주기 동일
+            signals = sorted((s for group in evaluated for s in group), key=lambda s: (s[0].user_id, s[0].id))
+            users_by_id = {user.id: user for user in all_users}
+            for strategy, action in signals:
                 try:
-                    if not user_switch_map.get(strategy.user_id, True):
-                        continue
-
-                    # 전략 평가
-                    action = await self.strategy_service.evaluate_strategy(strategy)
-                    if action in ["BUY", "SELL"]:
-                        user = next((u for u in all_users if u.id == strategy.user_id), None)
-                        if user:
-                            # 💡 [알림] 전략 발동 알림
-                            await notification_service.notify_user(
-                                user.id,
-                                {
-                                    "title": f"🚀 자동매매 전략 발동: {strategy.name}",
-                                    "body": f"{strategy.symbol} 종목에 대해 {action} 시그널이 포착되어 주문을 실행합니다."
-                                }
-                            )
-                            
-                            await self.trade_service.execute_trade(session, user, strategy.symbol, 1.0, action)
-                            logger.info(f"✅ Auto-Trade Executed: {action} {strategy.symbol}")
-                
+                    user = users_by_id.get(strategy.user_id)
+                    if user:
+                        # 💡 [알림] 전략 발동 알림
+                        await notification_service.notify_user(
+                            user.id,
+                            {
+                                "title": f"🚀 자동매매 전략 발동: {strategy.name}",
+                                "body": f"{strategy.symbol} 종목에 대해 {action} 시그널이 포착되어 주문을 실행합니다."
+                            }
+                        )
+
+                        await self.trade_service.execute_trade(session, user, strategy.symbol, 1.0, action)
+                        logger.info(f"✅ Auto-Trade Executed: {action} {strategy.symbol}")
+
                 except Exception as e:
                     logger.error(f"Error processing strategy {strategy.id}: {e}")
 
+    async def evaluate_symbol(self, symbol: str, strategies: List[TradingStrategy], indicators: Optional[Dict[str, Any]],
+                              semaphore: asyncio.Semaphore) -> List[Tuple[TradingStrategy, str]]:
+        """
+        한 종목의 전략들을 같은 지표로 평가하여 BUY/SELL 시그널만 반환합니다.
+        패널 계산 결과가 없으면 이 종목의 지표만 한 번 계산합니다.
+        """
+        async with semaphore:
+            try:
+                if indicators is None:
+                    indicators = await self.strategy_service.indicator_service.get_indicators(symbol)
+            except Exception as e:
+                logger.error(f"Indicator fetch failed for {symbol}: {e}")
+                return []
+            signals = []
+            for strategy in strategies:
+                try:
+                    action = await self.strategy_service.evaluate_strategy(strategy, indicators)
+                except Exception as e:
+                    logger.error(f"Error evaluating strategy {strategy.id}: {e}")
+                    continue
+                if action in ["BUY", "SELL"]:
+                    signals.append((strategy, action))
+            return signals
+
     async def start(self, interval_seconds: int = 60):
+        """
+        정규장에는 interval_seconds, 장전/장후에는 WORKER_EXTENDED_INTERVAL_SECONDS마다 실행하고,
+        휴장 시간(주말, 휴장일, 야간)에는 다음 세션이 시작될 때까지 잠듭니다.
+        """
         self.is_running = True
+        intervals = {REGULAR: interval_seconds, PRE_MARKET: WORKER_EXTENDED_INTERVAL_SECONDS,
+                     AFTER_HOURS: WORKER_EXTENDED_INTERVAL_SECONDS}
+        # 가장 긴 주기(장전/장후) 사이에도 전략 리스와 생존 신호가 유지되도록
+        self.leases.cover_interval(max(intervals.values()))
         while self.is_running:
-            await self.run_once()
-            await asyncio.sleep(interval_seconds)
+            if market_calendar.session_at() != CLOSED:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    # 일시적인 DB/네트워크 오류로 루프가 끝나지 않도록 다음 주기에 다시 시도
+                    logger.error(f"Trading worker cycle failed: {e}")
+            else:
+                change, next_session = market_calendar.next_session_change()
+                logger.info(f"💤 Market closed. Worker sleeping until {next_session} at {change.isoformat()}")
+            await asyncio.sleep(market_calendar.next_wakeup(intervals))
+
+    async def release_leases(self):
+        """보유한 전략/작업 리스를 반납합니다. (종료 시 다른 워커가 즉시 이어받도록)"""
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with async_session() as session:
+                await self.leases.release_all(session)
+        except Exception as e:
+            logger.error(f"Failed to release leases: {e}")
 
     def stop(self):
         self.is_running = False
+
+def create_job_runners(exit_manager: ExitManager, worker_id: str) -> List[JobRunner]:
+    """
+    작업 큐 러너. 오래 걸리는 계산 작업(최적화)과 청산 가격 신호를 별도 러너로 처리하여
+    최적화가 도는 동안에도 신호가 지연되지 않게 합니다. 신호는 청산 리스를 가진 워커만 가져갑니다.
+    """
+    async def run_optimize(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await optimizer.optimize(**payload)
+
+    async def apply_exit_levels(payload: Dict[str, Any]) -> Dict[str, Any]:
+        exit_manager.set_levels(payload["user_id"], payload["symbol"], payload.get("stop_price"), payload.get("target_price"))
+        return {}
+
+    return [
+        JobRunner({JOB_OPTIMIZE: run_optimize}, worker_id),
+        JobRunner({JOB_EXIT_LEVELS: apply_exit_levels}, worker_id, enabled=lambda: exit_manager.is_active),
+    ]
+
+async def run_worker(interval_seconds: int = 60):
+    """
+    API 서버와 분리된 워커 프로세스. 자동매매 루프, 손절/익절, 작업 큐, 시세 피드, 캐시 예열을 실행하고
+    API와는 DB(job 테이블, 리스)로만 통신합니다. SIGINT/SIGTERM을 받으면 리스를 반납하고 종료합니다.
+    """
+    await init_db()
+    await http_clients.start()
+    use_real_broker = os.getenv("USE_REAL_BROKER", "false").lower() == "true"
+    trade_service = TradeService(KISBroker() if use_real_broker else MockBroker())
+    trading_worker = TradingWorker(StrategyService(IndicatorService()), trade_service)
+    exit_manager = ExitManager(trade_service, leases=trading_worker.leases)
+    runners = create_job_runners(exit_manager, trading_worker.leases.worker_id)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:  # Windows: 강제 종료 시 리스는 만료 후 다른 워커가 가져감
+            pass
+
+    tasks = [
+        asyncio.create_task(trading_worker.start(interval_seconds=interval_seconds)),
+        asyncio.create_task(exit_manager.start()),
+        asyncio.create_task(live_indicators.start()),
+        asyncio.create_task(quote_feed.start()),
+        asyncio.create_task(prewarmer.start()),
+    ] + [asyncio.create_task(runner.start()) for runner in runners]
+    logger.info(f"🛠️ Worker {trading_worker.leases.worker_id} started")
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info(f"Stopping worker {trading_worker.leases.worker_id}...")
+        trading_worker.stop()
+        exit_manager.stop()
+        live_indicators.stop()
+        quote_feed.stop()
+        prewarmer.stop()
+        for runner in runners:
+            runner.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await trading_worker.release_leases()
+        yfinance_executor.shutdown()
+        await http_clients.aclose()
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    interval = int(os.getenv("WORKER_INTERVAL_SECONDS", "60"))
+    asyncio.run(run_worker(interval_seconds=interval))
+
+if __name__ == "__main__":
+    main()
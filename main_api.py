@@ -3,17 +3,32 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from core.stock_service import get_stock_info, find_ticker, get_stock_news
 from core.database import init_db, get_session, engine
-from core.models import User, UserCreate, UserRead, Token, TradingStrategy, StrategyCreate, StrategyRead, StockAsset, AISentimentHistory, APIKeyConfig, Guru, GuruInsight
+from core.models import User, UserCreate, UserRead, Token, TradingStrategy, StrategyCreate, StrategyRead, StockAsset, AISentimentHistory, APIKeyConfig, Guru, GuruInsight, BacktestRequest, OptimizeRequest, ExitLevelsUpdate
 from core.auth import get_password_hash, verify_password, create_access_token, decode_access_token
 from core.trade_service import TradeService
 from core.broker import TradingBroker
 from core.mock_broker import MockBroker
 from core.kis_broker import KISBroker
-from core.indicator_service import IndicatorService
+from core.indicator_service import IndicatorService, format_bar_dates, to_json_floats
+from core.bar_store import bar_store
 from core.strategy_service import StrategyService
 from core.ai_service import AIService
-from core.worker import TradingWorker
+from core.worker import TradingWorker, create_job_runners
+from core.exit_manager import ExitManager
 from core.notification_service import notification_service
+from core.executor import yfinance_executor
+from core.cache import cache_registry
+from core.http_client import http_clients
+from core.symbol_index import symbol_index
+from core.quote_feed import quote_board, quote_feed
+from core.news_store import news_store
+from core.prewarmer import prewarmer
+from core.live_indicators import live_indicators
+from core import market_calendar
+from core.backtest_service import backtest_service
+from core.optimizer import search_space_error
+from core.job_queue import JOB_EXIT_LEVELS, JOB_OPTIMIZE, job_queue, job_to_dict
+from core.expression_strategy import RuleError, compile_strategy
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import select
@@ -32,43 +47,85 @@ logger = logging.getLogger("api_server")
 
 # --- 서비스 초기화 ---
 USE_REAL_BROKER = os.getenv("USE_REAL_BROKER", "false").lower() == "true"
+# true면 자동매매/손절익절/작업 큐를 API 프로세스 안에서 실행 (단일 프로세스 개발용).
+# 기본은 별도 워커 프로세스(python -m core.worker)가 실행하며, API와는 job 테이블로 통신합니다.
+EMBEDDED_WORKER = os.getenv("EMBEDDED_WORKER", "false").lower() == "true"
 broker = KISBroker() if USE_REAL_BROKER else MockBroker()
 indicator_service = IndicatorService()
 ai_service = AIService()
 trade_service = TradeService(broker)
 strategy_service = StrategyService(indicator_service)
 trading_worker = TradingWorker(strategy_service, trade_service)
+exit_manager = ExitManager(trade_service, leases=trading_worker.leases)
+
+BROADCAST_TICKERS = ["TSLA", "AAPL", "NVDA", "QQQ", "^IXIC"]
 
 async def price_broadcaster():
-    """실시간 시세 브로드캐스트 루프"""
-    while True:
-        try:
-            if notification_service.active_connections:
-                tickers = ["TSLA", "AAPL", "NVDA", "QQQ", "^IXIC"]
-                updates = {}
-                async def get_price(symbol):
-                    data = await get_stock_info(symbol)
-                    if "error" not in data:
-                        return symbol, {"price": data["currentPrice"], "change": data["changePercent"]}
-                    return symbol, None
-                results = await asyncio.gather(*[get_price(t) for t in tickers])
-                for symbol, val in results:
-                    if val: updates[symbol] = val
-                if updates:
+    """
+    실시간 시세 브로드캐스트 루프 (시세 보드에 새 틱이 들어오는 즉시 전송).
+    틱이 없는 휴장 시간에는 다음 세션 전환까지 대기하고, 세션이 바뀌면 market_status를 전송합니다.
+    """
+    quote_feed.watch(BROADCAST_TICKERS)
+    queue = quote_board.subscribe()
+    try:
+        while True:
+            try:
+                try:
+                    symbol, quote = await asyncio.wait_for(queue.get(), timeout=market_calendar.seconds_until_change() + 1)
+                except asyncio.TimeoutError:
+                    if notification_service.active_connections:
+                        await notification_service.broadcast({"type": "market_status", "data": market_calendar.market_status()})
+                    continue
+                # 같은 순간에 들어온 틱은 한 메시지로 묶어서 전송
+                ticks = [(symbol, quote)]
+                while not queue.empty():
+                    ticks.append(queue.get_nowait())
+                updates = {
+                    s: {"price": q["currentPrice"], "change": q["changePercent"]}
+                    for s, q in ticks if s in BROADCAST_TICKERS
+                }
+                if updates and notification_service.active_connections:
                     await notification_service.broadcast({"type": "price_update", "data": updates})
-        except Exception as e:
-            logger.error(f"Broadcaster error: {e}")
-        await asyncio.sleep(10)
+            except Exception as e:
+                logger.error(f"Broadcaster error: {e}")
+    finally:
+        quote_board.unsubscribe(queue)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
-    worker_task = asyncio.create_task(trading_worker.start(interval_seconds=60))
+    await http_clients.start()
+    symbol_index.load()
     broadcaster_task = asyncio.create_task(price_broadcaster())
+    feed_task = asyncio.create_task(quote_feed.start())
+    prewarmer.add_static(BROADCAST_TICKERS)
+    prewarmer_task = asyncio.create_task(prewarmer.start())
+    worker_tasks = []
+    job_runners = []
+    if EMBEDDED_WORKER:
+        job_runners = create_job_runners(exit_manager, trading_worker.leases.worker_id)
+        worker_tasks = [
+            asyncio.create_task(trading_worker.start(interval_seconds=60)),
+            asyncio.create_task(exit_manager.start()),
+            asyncio.create_task(live_indicators.start()),
+        ] + [asyncio.create_task(runner.start()) for runner in job_runners]
     yield
-    trading_worker.stop()
-    worker_task.cancel()
+    if EMBEDDED_WORKER:
+        trading_worker.stop()
+        exit_manager.stop()
+        live_indicators.stop()
+        for runner in job_runners:
+            runner.stop()
+        for task in worker_tasks:
+            task.cancel()
+        await trading_worker.release_leases()
+    quote_feed.stop()
+    prewarmer.stop()
+    prewarmer_task.cancel()
     broadcaster_task.cancel()
+    feed_task.cancel()
+    yfinance_executor.shutdown()
+    await http_clients.aclose()
 
 app = FastAPI(title="Nasdaq is God API", lifespan=lifespan)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -86,6 +143,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSe
     if user is None: raise HTTPException(status_code=404, detail="User not found")
     return user
 
+async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.username != "admin": raise HTTPException(status_code=403, detail="Admin only")
+    return current_user
+
 async def get_active_api_key(user: User, session: AsyncSession) -> Optional[str]:
     statement = select(APIKeyConfig).where(APIKeyConfig.user_id == user.id, APIKeyConfig.is_active == True)
     result = await session.execute(statement)
@@ -235,43 +296,18 @@ async def list_ai_models(current_user: User = Depends(get_current_user), session
     config = (await session.execute(select(APIKeyConfig).where(APIKeyConfig.user_id == current_user.id, APIKeyConfig.is_active == True))).scalar_one_or_none()
     return ai_service.list_available_models(api_key=config.key_value if config else None)
 
+@app.get("/market/status")
+async def get_market_status():
+    """현재 거래 세션(PRE_MARKET/REGULAR/AFTER_HOURS/CLOSED)과 다음 전환 시각 (오프라인 NYSE 일정 기준)"""
+    return market_calendar.market_status()
+
 @app.get("/market/sentiment")
 async def get_market_sentiment():
     try:
         tickers = ["^IXIC", "^GSPC", "NVDA", "AAPL", "MSFT"]
-        results = await asyncio.gather(*[get_stock_news(t) for t in tickers])
-        all_news = []
-        for news_list in results:
-            if news_list:
-                all_news.extend(news_list)
-        
-        # 뉴스 구조 처리 (yfinance 최신 버전 호환성)
-        extracted_news = []
-        for n in all_news:
-            if not n: continue
-            title = n.get('title')
-            uuid = n.get('uuid') or n.get('id')
-            pub_time = n.get('providerPublishTime', 0)
-            
-            # 신규 구조 handling
-            if 'content' in n and isinstance(n['content'], dict):
-                content = n['content']
-                title = title or content.get('title')
-                pub_time = pub_time or content.get('pubDate') or 0
-            
-            if title and uuid:
-                extracted_news.append({
-                    'uuid': uuid,
-                    'title': title,
-                    'providerPublishTime': pub_time
-                })
-
-        unique_news = sorted(
-            {n['uuid']: n for n in extracted_news}.values(),
-            key=lambda x: x.get('providerPublishTime', 0),
-            reverse=True
-        )
-        return await ai_service.analyze_market_outlook(list(unique_news))
+        # 공유 뉴스 저장소: 구/신 yfinance 형식 정규화 + uuid 중복 제거 + 최신순 정렬
+        unique_news = await news_store.get_many(tickers)
+        return await ai_service.analyze_market_outlook(unique_news)
     except Exception as e:
         logger.error(f"Market sentiment error: {e}")
         import traceback
@@ -404,6 +440,24 @@ async def guru_alpha_webhook(request: Request, session: AsyncSession = Depends(g
 
     return {"status": "processed", "analysis": analysis, "execution": execution_result}
 
+# --- Admin ---
+@app.get("/admin/executors")
+async def get_executor_stats(admin: User = Depends(get_admin_user)):
+    """블로킹 작업 전용 스레드 풀의 대기열 깊이 및 처리 지표"""
+    return {"yfinance": yfinance_executor.stats()}
+
+@app.get("/admin/cache")
+async def get_cache_stats(admin: User = Depends(get_admin_user)):
+    """네임스페이스별 캐시 크기 및 hit/miss/eviction 통계"""
+    return cache_registry.stats()
+
+@app.delete("/admin/cache/{namespace}")
+async def clear_cache_namespace(namespace: str, admin: User = Depends(get_admin_user)):
+    cache = cache_registry.get(namespace)
+    if not cache: raise HTTPException(status_code=404)
+    cache.clear()
+    return {"status": "success"}
+
 # --- Common ---
 @app.get("/users/me", response_model=UserRead)
 async def read_users_me(current_user: User = Depends(get_current_user)): return current_user
@@ -419,10 +473,64 @@ async def toggle_master_auto_trading(current_user: User = Depends(get_current_us
 async def search_stock(q: str = Query(..., min_length=1)):
     result = await find_ticker(q)
     if not result: raise HTTPException(status_code=404)
+    prewarmer.record_search(result["symbol"])
     return result
 
+@app.get("/search/autocomplete")
+async def autocomplete_stock(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    """오프라인 종목 인덱스 기반 자동완성 (네트워크 호출 없음)"""
+    return symbol_index.search(q, limit=limit)
+
 @app.get("/stock/{symbol}/indicators")
-async def get_stock_indicators(symbol: str): return await indicator_service.get_indicators(symbol)
+async def get_stock_indicators(
+    symbol: str,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    fields: Optional[str] = Query(None, description="columnar 전용, 쉼표 구분 (예: date,price,rsi,bb_upper)"),
+    limit: int = Query(60, ge=1, le=5000),
+    interval: str = "1d",
+    period: str = "3mo",
+    base: Optional[str] = Query(None, description="기준 주기 (예: 5m). 지정하면 이 주기만 받아 interval로 리샘플링"),
+):
+    """기본(rows)은 기존 형식, format=columnar는 필드별 병렬 배열(긴 차트 구간용)"""
+    if format == "columnar":
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        result = await indicator_service.get_indicators_columnar(symbol, fields=field_list, limit=limit, interval=interval, period=period, base=base)
+        if "error" in result and result["error"].startswith("Unknown fields"):
+            raise HTTPException(status_code=400, detail=result["error"])
+        return result
+    return await indicator_service.get_indicators(symbol, interval=interval, period=period, base=base)
+
+@app.get("/stock/{symbol}/bars")
+async def get_stock_bars(
+    symbol: str,
+    intervals: str = Query("15m,1h,1d", description="쉼표 구분 (예: 15m,1h,1d)"),
+    base: str = "5m",
+    period: str = "5d",
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """기준 주기 바를 한 번만 받아 여러 주기의 OHLCV를 필드별 병렬 배열로 반환"""
+    interval_list = [i.strip() for i in intervals.split(",") if i.strip()]
+    try:
+        frames = await bar_store.get_timeframes(symbol.upper(), interval_list, period=period, base=base)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "symbol": symbol.upper(),
+        "base": base,
+        "period": period,
+        "timeframes": {
+            interval: {
+                "length": len(view),
+                "columns": {
+                    "date": format_bar_dates(view.ts, interval),
+                    "open": to_json_floats(view.open), "high": to_json_floats(view.high),
+                    "low": to_json_floats(view.low), "close": to_json_floats(view.close),
+                    "volume": to_json_floats(view.volume),
+                },
+            }
+            for interval, view in ((i, b.tail(limit)) for i, b in frames.items())
+        },
+    }
 
 @app.post("/trade/order")
 async def place_trade_order(symbol: str, quantity: float, side: str, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
@@ -444,14 +552,51 @@ async def liquidate_positions(symbols: List[str] = Query(...), current_user: Use
 @app.get("/portfolio")
 async def get_portfolio(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)): return await trade_service.get_user_portfolio(session, current_user)
 
+@app.patch("/portfolio/{symbol}/exit-levels")
+async def update_exit_levels(symbol: str, levels: ExitLevelsUpdate, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    """보유 종목의 손절가/익절가 설정 (null이면 해제). 워커에 신호를 보내며, 시세가 도달하면 틱 단위로 전량 매도됩니다."""
+    symbol = symbol.upper()
+    asset = (await session.execute(select(StockAsset).where(StockAsset.user_id == current_user.id, StockAsset.symbol == symbol))).scalar_one_or_none()
+    if not asset or asset.quantity <= 0:
+        raise HTTPException(status_code=404, detail="Position not found")
+    for name in ("stop_price", "target_price"):
+        value = getattr(levels, name)
+        if value is not None and value <= 0:
+            raise HTTPException(status_code=400, detail=f"{name} must be positive")
+    if levels.stop_price is not None and levels.target_price is not None and levels.stop_price >= levels.target_price:
+        raise HTTPException(status_code=400, detail="stop_price must be lower than target_price")
+    asset.stop_price = levels.stop_price
+    asset.target_price = levels.target_price
+    asset.updated_at = datetime.utcnow()
+    session.add(asset)
+    await session.commit()
+    await job_queue.enqueue(session, JOB_EXIT_LEVELS, {
+        "user_id": current_user.id, "symbol": symbol, "stop_price": asset.stop_price, "target_price": asset.target_price,
+    }, user_id=current_user.id)
+    return asset
+
 @app.get("/portfolio/history")
 async def get_portfolio_history(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)): return await trade_service.get_equity_history(session, current_user)
 
 @app.get("/trade/history")
 async def get_trade_history(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)): return await trade_service.get_trade_history(session, current_user)
 
+def _parse_parameters(parameters: str) -> dict:
+    try:
+        result = json.loads(parameters or "{}")
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="parameters must be a JSON object")
+    if not isinstance(result, dict):
+        raise HTTPException(status_code=400, detail="parameters must be a JSON object")
+    return result
+
 @app.post("/strategies", response_model=StrategyRead)
 async def create_strategy(strategy: StrategyCreate, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    if strategy.strategy_type == "EXPRESSION":
+        try:
+            compile_strategy(_parse_parameters(strategy.parameters))
+        except RuleError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     db_strategy = TradingStrategy(**strategy.dict(), user_id=current_user.id)
     session.add(db_strategy)
     await session.commit()
@@ -478,6 +623,48 @@ async def delete_strategy(strategy_id: int, current_user: User = Depends(get_cur
     await session.commit()
     return {"status": "success"}
 
+@app.post("/backtest")
+async def run_backtest(request: BacktestRequest, current_user: User = Depends(get_current_user)):
+    """전략 규칙을 과거 바에 적용한 성과 시뮬레이션 (체결 내역, 자산 곡선, 낙폭, 회전율)"""
+    result = await backtest_service.run(
+        request.symbol.upper(), request.strategy_type, _parse_parameters(request.parameters),
+        period=request.period, interval=request.interval, quantity=request.quantity, initial_cash=request.initial_cash,
+    )
+    if "error" in result: raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@app.post("/backtest/optimize", status_code=202)
+async def optimize_strategy(request: OptimizeRequest, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    """
+    파라미터 조합 병렬 백테스트(그리드/랜덤 서치)를 워커 작업으로 등록합니다.
+    결과는 GET /jobs/{job_id}로 조회합니다. (status: PENDING -> RUNNING -> DONE/FAILED)
+    """
+    error = search_space_error(request.space, request.random_samples)
+    if error: raise HTTPException(status_code=400, detail=error)
+    job = await job_queue.enqueue(session, JOB_OPTIMIZE, {
+        "symbols": [s.upper() for s in request.symbols], "strategy_type": request.strategy_type, "space": request.space,
+        "base_params": _parse_parameters(request.parameters), "random_samples": request.random_samples, "seed": request.seed,
+        "metric": request.metric, "top": request.top, "period": request.period, "interval": request.interval,
+    }, user_id=current_user.id)
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    job = await job_queue.get(session, job_id, user_id=current_user.id)
+    if not job: raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+@app.get("/strategies/{strategy_id}/backtest")
+async def backtest_strategy(strategy_id: int, period: str = "1y", interval: str = "1d", initial_cash: float = 10000.0, current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
+    db_strategy = (await session.execute(select(TradingStrategy).where(TradingStrategy.id == strategy_id, TradingStrategy.user_id == current_user.id))).scalar_one_or_none()
+    if not db_strategy: raise HTTPException(status_code=404)
+    result = await backtest_service.run(
+        db_strategy.symbol, db_strategy.strategy_type, _parse_parameters(db_strategy.parameters),
+        period=period, interval=interval, initial_cash=initial_cash,
+    )
+    if "error" in result: raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
 @app.get("/")
 async def root(): return {"message": "Nasdaq is God API - Real-time Ready"}
 
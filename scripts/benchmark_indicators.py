@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import timeit
+
+# 프로젝트 루트를 PYTHONPATH에 추가 (최상단 배치)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from core import indicator_kernels as kernels
+from core.indicator_service import IndicatorService
+
+# 지표별 (pandas 구현, numpy 커널). 각 함수는 (high, low, close, volume)을 받아 배열 또는 {이름: 배열}을 반환
+INDICATORS = {
+    "rsi": (lambda h, l, c, v: IndicatorService.calculate_rsi(c), lambda h, l, c, v: kernels.rsi(c)),
+    "ema": (lambda h, l, c, v: IndicatorService.calculate_ema(c, 20), lambda h, l, c, v: kernels.ema(c, 20)),
+    "macd": (lambda h, l, c, v: IndicatorService.calculate_macd(c), lambda h, l, c, v: kernels.macd(c)),
+    "bollinger": (lambda h, l, c, v: IndicatorService.calculate_bollinger_bands(c), lambda h, l, c, v: kernels.bollinger(c)),
+    "atr": (lambda h, l, c, v: IndicatorService.calculate_atr(h, l, c), lambda h, l, c, v: kernels.atr(h, l, c)),
+    "vwap": (lambda h, l, c, v: IndicatorService.calculate_vwap(h, l, c, v), lambda h, l, c, v: kernels.vwap(h, l, c, v)),
+}
+
+def make_series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    volume = rng.integers(100, 10000, n).astype(float)
+    return high, low, close, volume
+
+def as_dict(result) -> dict:
+    if isinstance(result, dict):
+        return {k: np.asarray(v, dtype=float) for k, v in result.items()}
+    return {"value": np.asarray(result, dtype=float)}
+
+def max_difference(expected, actual) -> float:
+    """두 결과의 최대 상대 오차 (NaN 위치가 다르면 inf)"""
+    worst = 0.0
+    for key, e in as_dict(expected).items():
+        a = as_dict(actual)[key]
+        if not np.array_equal(np.isnan(e), np.isnan(a)):
+            return float("inf")
+        mask = ~np.isnan(e)
+        if mask.any():
+            worst = max(worst, float(np.max(np.abs(a[mask] - e[mask]) / np.maximum(np.abs(e[mask]), 1.0))))
+    return worst
+
+def best_time(func, repeat: int) -> float:
+    """repeat회 실행 중 가장 빠른 1회 시간 (마이크로초)"""
+    number = max(1, 2000 // repeat)
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="지표 계산 백엔드 비교 (pandas vs numpy 커널)")
+    parser.add_argument("--lengths", default="60,120,250,1000,5000", help="시계열 길이 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="허용 상대 오차")
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    print(f"{'indicator':<10} {'length':>7} {'pandas(us)':>11} {'numpy(us)':>10} {'speedup':>8} {'max_rel_diff':>13}")
+    for n in (int(x) for x in args.lengths.split(",")):
+        h, l, c, v = make_series(n)
+        hs, ls, cs, vs = pd.Series(h), pd.Series(l), pd.Series(c), pd.Series(v)
+        for name, (pandas_fn, numpy_fn) in INDICATORS.items():
+            pandas_us = best_time(lambda: pandas_fn(hs, ls, cs, vs), args.repeat)
+            numpy_us = best_time(lambda: numpy_fn(h, l, c, v), args.repeat)
+            diff = max_difference(pandas_fn(hs, ls, cs, vs), numpy_fn(h, l, c, v))
+            flag = "" if diff <= args.tolerance else "  MISMATCH"
+            mismatches += bool(flag)
+            print(f"{name:<10} {n:>7} {pandas_us:>11.1f} {numpy_us:>10.1f} {pandas_us / numpy_us:>7.1f}x {diff:>13.2e}{flag}")
+
+    if mismatches:
+        print(f"\n{mismatches}개 결과가 허용 오차를 넘었습니다.")
+        return 1
+    print("\n모든 결과가 pandas 구현과 일치합니다.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
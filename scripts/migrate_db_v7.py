@@ -0,0 +1,18 @@
+import asyncio
+from sqlalchemy import text
+from core.database import engine
+
+async def migrate():
+    async with engine.begin() as conn:
+        print("🚀 Starting database migration V7 (Stop-loss / Take-profit levels)...")
+        try:
+            # 손절가/익절가 컬럼 추가
+            await conn.execute(text('ALTER TABLE "stockasset" ADD COLUMN IF NOT EXISTS stop_price DOUBLE PRECISION'))
+            await conn.execute(text('ALTER TABLE "stockasset" ADD COLUMN IF NOT EXISTS target_price DOUBLE PRECISION'))
+
+            print("✅ Exit level columns added to 'stockasset' table.")
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
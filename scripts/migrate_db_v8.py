@@ -0,0 +1,24 @@
+import asyncio
+from sqlalchemy import text
+from core.database import engine
+
+async def migrate():
+    async with engine.begin() as conn:
+        print("🚀 Starting database migration V8 (Worker leases)...")
+        try:
+            # 전략 리스 컬럼 추가
+            await conn.execute(text('ALTER TABLE "tradingstrategy" ADD COLUMN IF NOT EXISTS lease_owner VARCHAR'))
+            await conn.execute(text('ALTER TABLE "tradingstrategy" ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITHOUT TIME ZONE'))
+            await conn.execute(text('CREATE INDEX IF NOT EXISTS ix_tradingstrategy_lease_owner ON "tradingstrategy" (lease_owner)'))
+            # 싱글톤 작업/워커 생존 신호 리스 테이블
+            await conn.execute(text(
+                'CREATE TABLE IF NOT EXISTS "workerlease" ('
+                'name VARCHAR PRIMARY KEY, owner VARCHAR NOT NULL, expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL)'
+            ))
+
+            print("✅ Lease columns added to 'tradingstrategy' and 'workerlease' table created.")
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,17 @@
+import asyncio
+from core.database import engine
+from core.models import Job
+
+async def migrate():
+    async with engine.begin() as conn:
+        print("🚀 Starting database migration V9 (Job queue)...")
+        try:
+            # API <-> 워커 작업/신호 테이블 생성
+            await conn.run_sync(lambda sync_conn: Job.__table__.create(sync_conn, checkfirst=True))
+
+            print("✅ 'job' table created.")
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
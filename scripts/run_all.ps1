@@ -3,17 +3,22 @@
 Write-Host "🚀 Starting NASDAQ IS GOD Ecosystem..." -ForegroundColor Cyan
 
 # 1. Backend API
-Write-Host "1/3 Starting Backend API..." -ForegroundColor White
+Write-Host "1/4 Starting Backend API..." -ForegroundColor White
 Start-Process python -ArgumentList "main_api.py" -WorkingDirectory "$PSScriptRoot\.." -WindowStyle Hidden
 Start-Sleep -Seconds 3
 
-# 2. Telegram Bot
-Write-Host "2/3 Starting Telegram Bot..." -ForegroundColor White
+# 2. Trading Worker
+Write-Host "2/4 Starting Trading Worker..." -ForegroundColor White
+Start-Process python -ArgumentList "-m core.worker" -WorkingDirectory "$PSScriptRoot\.." -WindowStyle Hidden
+Start-Sleep -Seconds 2
+
+# 3. Telegram Bot
+Write-Host "3/4 Starting Telegram Bot..." -ForegroundColor White
 Start-Process python -ArgumentList "main.py" -WorkingDirectory "$PSScriptRoot\.." -WindowStyle Hidden
 Start-Sleep -Seconds 2
 
-# 3. Frontend Web Server
-Write-Host "3/3 Starting Frontend Web Server..." -ForegroundColor White
+# 4. Frontend Web Server
+Write-Host "4/4 Starting Frontend Web Server..." -ForegroundColor White
 Start-Process python -ArgumentList "serve_web.py" -WorkingDirectory "$PSScriptRoot\..\frontend" -WindowStyle Hidden
 
 Write-Host "✅ All systems started!" -ForegroundColor Green
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Nasdaq is God - System Startup Script
-# This script starts all running components: Database, Backend, Frontend, and Bot.
+# This script starts all running components: Database, Backend, Worker, Frontend, and Bot.
 
 # 프로젝트 루트 디렉토리 설정
 PROJECT_ROOT=$(cd "$(dirname "$0")/.." && pwd)
@@ -11,13 +11,13 @@ echo "🚀 Starting Nasdaq is God System..."
 echo "---------------------------------------"
 
 # 1. Start Database (Docker)
-echo "[1/4] Starting Database Container (nasdaq-db)..."
+echo "[1/5] Starting Database Container (nasdaq-db)..."
 docker compose up -d
 echo "⏳ Waiting for Database to be ready..."
 sleep 5
 
 # 2. Start Backend API
-echo "[2/4] Starting Backend API (main_api.py)..."
+echo "[2/5] Starting Backend API (main_api.py)..."
 if ! ps aux | grep "main_api.py" | grep -v "grep" > /dev/null; then
     nohup python3 main_api.py > api_server.log 2>&1 &
     echo "✅ Backend API started in background."
@@ -25,8 +25,17 @@ else
     echo "ℹ️ Backend API is already running."
 fi
 
-# 3. Start Frontend Web Server
-echo "[3/4] Starting Frontend Web Server (run_web.sh)..."
+# 3. Start Trading Worker (자동매매, 손절/익절, 최적화 작업 큐)
+echo "[3/5] Starting Trading Worker (core.worker)..."
+if ! ps aux | grep "core.worker" | grep -v "grep" > /dev/null; then
+    nohup python3 -m core.worker > worker.log 2>&1 &
+    echo "✅ Trading Worker started in background."
+else
+    echo "ℹ️ Trading Worker is already running."
+fi
+
+# 4. Start Frontend Web Server
+echo "[4/5] Starting Frontend Web Server (run_web.sh)..."
 if [ -d "frontend" ]; then
     cd frontend
     ./run_web.sh
@@ -36,8 +45,8 @@ else
     echo "❌ Error: frontend directory not found."
 fi
 
-# 4. Start Telegram Bot
-echo "[4/4] Starting Telegram Bot (main.py)..."
+# 5. Start Telegram Bot
+echo "[5/5] Starting Telegram Bot (main.py)..."
 if ! ps aux | grep "main.py" | grep -v "grep" > /dev/null; then
     nohup python3 main.py > bot.log 2>&1 &
     echo "✅ Telegram Bot started in background."
@@ -2,6 +2,7 @@
 
 $processes = Get-CimInstance Win32_Process | Where-Object { 
     $_.CommandLine -like "*python*main_api.py*" -or 
+    $_.CommandLine -like "*python*core.worker*" -or 
     $_.CommandLine -like "*python*serve_web.py*" -or 
     $_.CommandLine -like "*python*main.py*"
 }
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Nasdaq is God - System Shutdown Script
-# This script stops all running components: Database, Backend, Frontend, and Bot.
+# This script stops all running components: Database, Backend, Worker, Frontend, and Bot.
 
 # 프로젝트 루트 디렉토리 설정
 PROJECT_ROOT=$(cd "$(dirname "$0")/.." && pwd)
@@ -11,7 +11,7 @@ echo "🛑 Stopping Nasdaq is God System..."
 echo "---------------------------------------"
 
 # 1. Stop Telegram Bot
-echo "[1/4] Stopping Telegram Bot (main.py)..."
+echo "[1/5] Stopping Telegram Bot (main.py)..."
 BOT_PID=$(ps aux | grep "main.py" | grep -v "grep" | awk '{print $2}')
 if [ ! -z "$BOT_PID" ]; then
     kill $BOT_PID
@@ -20,8 +20,18 @@ else
     echo "ℹ️ Bot is not running."
 fi
 
-# 2. Stop Backend API
-echo "[2/4] Stopping Backend API (main_api.py)..."
+# 2. Stop Trading Worker (SIGTERM -> 보유 리스 반납 후 종료)
+echo "[2/5] Stopping Trading Worker (core.worker)..."
+WORKER_PID=$(ps aux | grep "core.worker" | grep -v "grep" | awk '{print $2}')
+if [ ! -z "$WORKER_PID" ]; then
+    kill $WORKER_PID
+    echo "✅ Trading Worker stopped (PID: $WORKER_PID)"
+else
+    echo "ℹ️ Trading Worker is not running."
+fi
+
+# 3. Stop Backend API
+echo "[3/5] Stopping Backend API (main_api.py)..."
 API_PID=$(ps aux | grep "main_api.py" | grep -v "grep" | awk '{print $2}')
 if [ ! -z "$API_PID" ]; then
     kill $API_PID
@@ -30,8 +40,8 @@ else
     echo "ℹ️ Backend API is not running."
 fi
 
-# 3. Stop Frontend Web Server
-echo "[3/4] Stopping Frontend Web Server (serve_web.py)..."
+# 4. Stop Frontend Web Server
+echo "[4/5] Stopping Frontend Web Server (serve_web.py)..."
 WEB_PID=$(ps aux | grep "serve_web.py" | grep -v "grep" | awk '{print $2}')
 if [ ! -z "$WEB_PID" ]; then
     kill $WEB_PID
@@ -40,8 +50,8 @@ else
     echo "ℹ️ Frontend is not running."
 fi
 
-# 4. Stop Database (Docker)
-echo "[4/4] Stopping Database Container (nasdaq-db)..."
+# 5. Stop Database (Docker)
+echo "[5/5] Stopping Database Container (nasdaq-db)..."
 if docker ps -q -f name=nasdaq-db | grep -q . ; then
     docker compose down
     echo "✅ Database container stopped."
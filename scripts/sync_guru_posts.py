@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import httpx
 import xml.etree.ElementTree as ET
 import sys
 import os
@@ -19,6 +18,8 @@ from core.database import engine
 from core.models import Guru, GuruInsight
 from core.ai_service import AIService
 from core.stock_service import get_stock_info
+from core.http_client import http_clients
+from core.news_store import news_store, make_uuid, to_epoch
 from datetime import datetime
 
 # 로깅 설정
@@ -41,11 +42,10 @@ async def fetch_from_nitter(handle: str):
     for instance in NITTER_INSTANCES:
         url = f"{instance}/{handle}/rss"
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                if response.status_code == 200 and "<rss" in response.text:
-                    logger.info(f"✅ Success with Nitter: {instance}")
-                    return response.text
+            response = await http_clients.get("rss").get(url)
+            if response.status_code == 200 and "<rss" in response.text:
+                logger.info(f"✅ Success with Nitter: {instance}")
+                return response.text
         except: continue
     return None
 
@@ -54,11 +54,10 @@ async def fetch_from_google_news(name: str):
     query = f"{name} twitter"
     url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            if response.status_code == 200:
-                logger.info(f"✅ Success with Google News for {name}")
-                return response.text
+        response = await http_clients.get("rss").get(url)
+        if response.status_code == 200:
+            logger.info(f"✅ Success with Google News for {name}")
+            return response.text
     except: return None
 
 def parse_rss(xml_content):
@@ -70,15 +69,30 @@ def parse_rss(xml_content):
             title = item.find("title").text if item.find("title") is not None else ""
             desc = item.find("description").text if item.find("description") is not None else ""
             link = item.find("link").text if item.find("link") is not None else ""
+            pub_date = item.find("pubDate").text if item.find("pubDate") is not None else ""
             
             # 설명글에서 HTML 제거
             content = re.sub('<[^<]+?>', '', desc) if desc else title
             if not content or len(content) < 10: content = title
 
-            items.append({"text": content.strip(), "link": link})
+            content = (content or "").strip()
+            # 뉴스 저장소 공통 형식 + 기존 text 필드
+            items.append({
+                "uuid": make_uuid(link, content), "title": title or content, "text": content,
+                "link": link, "publisher": None, "providerPublishTime": to_epoch(pub_date),
+            })
     except: pass
     return items
 
+async def fetch_guru_posts(guru):
+    """Nitter -> Google News 순으로 구루의 RSS를 가져와 파싱합니다."""
+    # 1. 트위터 직접 시도
+    xml = await fetch_from_nitter(guru.handle)
+    # 2. 실패 시 구글 뉴스 시도
+    if not xml:
+        xml = await fetch_from_google_news(guru.name)
+    return parse_rss(xml) if xml else []
+
 async def sync_posts():
     logger.info("🚀 Starting Guru Hybrid Sync...")
     ai_service = AIService()
@@ -90,13 +104,8 @@ async def sync_posts():
         for guru in gurus:
             logger.info(f"📡 Processing {guru.name}...")
             
-            # 1. 트위터 직접 시도
-            xml = await fetch_from_nitter(guru.handle)
-            # 2. 실패 시 구글 뉴스 시도
-            if not xml:
-                xml = await fetch_from_google_news(guru.name)
-            
-            posts = parse_rss(xml) if xml else []
+            # 뉴스 저장소의 TTL 안에서는 같은 피드를 다시 내려받지 않음
+            posts = await news_store.get_feed(f"guru:{guru.handle}", lambda: fetch_guru_posts(guru))
             
             if not posts:
                 logger.warning(f"⚠️ No external data for {guru.name}. Using AI Simulation Mode.")
@@ -148,5 +157,11 @@ async def sync_posts():
 
     logger.info("🎉 Sync completed.")
 
+async def main():
+    try:
+        await sync_posts()
+    finally:
+        await http_clients.aclose()
+
 if __name__ == "__main__":
-    asyncio.run(sync_posts())
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+import asyncio
+import csv
+import logging
+import os
+import sys
+
+# 프로젝트 루트를 PYTHONPATH에 추가 (최상단 배치)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core.http_client import http_clients
+from core.symbol_index import DEFAULT_LISTINGS_PATH, SymbolIndex
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("update_symbol_index")
+
+# NASDAQ Trader 심볼 디렉터리 (NASDAQ 상장 + NYSE/NYSE American/Arca 등 기타 상장, ETF 포함)
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+EXCHANGE_NAMES = {"A": "NYSE American", "N": "NYSE", "P": "NYSE Arca", "Z": "Cboe BZX", "V": "IEX"}
+
+def parse_listing(text: str, symbol_col: str, exchange) -> list:
+    """파이프(|)로 구분된 NASDAQ Trader 파일을 파싱합니다. 테스트 종목과 마지막 'File Creation Time' 행은 제외합니다."""
+    lines = [l for l in text.splitlines() if l and not l.startswith("File Creation Time")]
+    rows = []
+    for row in csv.DictReader(lines, delimiter="|"):
+        if row.get("Test Issue") == "Y":
+            continue
+        # Yahoo 표기법: 클래스 주식의 '.'은 '-'로 (BRK.B -> BRK-B)
+        symbol = row[symbol_col].strip().replace(".", "-")
+        if not symbol or "$" in symbol:
+            continue
+        rows.append({
+            "symbol": symbol,
+            "name": row["Security Name"].strip(),
+            "exchange": exchange(row),
+            "etf": row.get("ETF", "N").strip() or "N",
+        })
+    return rows
+
+async def update(output_path: str):
+    client = http_clients.get("rss")
+    nasdaq = await client.get(NASDAQ_LISTED_URL)
+    other = await client.get(OTHER_LISTED_URL)
+    nasdaq.raise_for_status()
+    other.raise_for_status()
+
+    rows = parse_listing(nasdaq.text, "Symbol", lambda r: "NASDAQ")
+    rows += parse_listing(other.text, "ACT Symbol", lambda r: EXCHANGE_NAMES.get(r.get("Exchange", ""), r.get("Exchange", "")))
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path + ".tmp", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["symbol", "name", "exchange", "etf"])
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(output_path + ".tmp", output_path)
+
+    index = SymbolIndex(output_path).load()
+    logger.info(f"✅ Wrote {len(rows)} listings to {output_path} (sample: {index.lookup('Apple')})")
+
+async def main():
+    try:
+        await update(os.getenv("SYMBOL_LISTINGS_PATH", DEFAULT_LISTINGS_PATH))
+    finally:
+        await http_clients.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
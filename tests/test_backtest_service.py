@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.backtest_service import BacktestService, simulate
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService
+
+
+def make_bars(n=252, seed=11):
+    closes = 100 + np.cumsum(np.random.default_rng(seed).normal(0, 2, n))
+    ts = np.arange(n, dtype=np.int64) * 86400 + 1_700_000_000
+    return Bars("TSLA", "1d", ts, closes, closes, closes, closes, np.ones(n))
+
+
+def reference_loop(closes, signals, quantity, initial_cash):
+    """워커처럼 바마다 BUY/SELL을 처리하는 단순 반복 구현"""
+    position, cash, equity = 0.0, initial_cash, []
+    for price, signal in zip(closes, signals):
+        if signal == 1:
+            position += quantity
+            cash -= quantity * price
+        elif signal == -1 and position >= quantity:
+            position -= quantity
+            cash += quantity * price
+        equity.append(cash + position * price)
+    return np.array(equity), position
+
+
+def test_vectorized_simulation_matches_day_by_day_loop():
+    rng = np.random.default_rng(5)
+    closes = 50 + rng.random(500) * 10
+    signals = rng.choice([-1, 0, 0, 1], size=500)
+
+    sim = simulate(closes, signals, quantity=2.0, initial_cash=1000.0)
+    equity, position = reference_loop(closes, signals, 2.0, 1000.0)
+
+    np.testing.assert_allclose(sim["equity"], equity)
+    assert sim["position"][-1] == position
+    assert (sim["position"] >= 0).all()
+
+
+def test_rsi_limit_backtest_uses_strategy_thresholds():
+    bars = make_bars()
+    result = BacktestService.run_on_bars(bars, "RSI_LIMIT", {"buy_rsi": 40, "sell_rsi": 60})
+
+    rsi = IndicatorService.calculate_rsi(pd.Series(bars.close)).to_numpy()
+    expected = np.where(rsi <= 40, 1, np.where(rsi >= 60, -1, 0))
+    equity, position = reference_loop(bars.close, expected, 1.0, 10000.0)
+
+    assert result["final_equity"] == pytest.approx(equity[-1])
+    assert result["final_position"] == position
+    assert result["num_trades"] == len(result["fills"]["date"]) > 0
+    assert set(result["fills"]["side"]) <= {"BUY", "SELL"}
+    assert result["max_drawdown"] <= 0
+    assert len(result["equity_curve"]["equity"]) == len(bars)
+
+
+def test_unsupported_strategy_type_returns_error():
+    assert "error" in BacktestService.run_on_bars(make_bars(), "UNKNOWN", {})
@@ -0,0 +1,86 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from core.bar_store import BarStore, Bars
+
+
+def make_history(dates, closes) -> pd.DataFrame:
+    """yfinance history() 형태의 일봉 데이터프레임 생성"""
+    index = pd.DatetimeIndex(pd.to_datetime(dates)).tz_localize("America/New_York")
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        "Open": closes - 1, "High": closes + 1, "Low": closes - 2, "Close": closes, "Volume": np.full(len(closes), 1000.0),
+    }, index=index)
+
+
+def recent_dates(n: int):
+    end = pd.Timestamp.now(tz="America/New_York").normalize()
+    return [d.strftime("%Y-%m-%d") for d in pd.bdate_range(end=end - pd.Timedelta(days=1), periods=n)]
+
+
+@pytest.mark.asyncio
+async def test_bar_store_backfills_then_appends_only_new_bars(tmp_path):
+    store = BarStore(str(tmp_path), refresh_seconds=0)
+    dates = recent_dates(5)
+    first = make_history(dates[:4], [10, 11, 12, 13])
+    # 마지막 저장 바(13 -> 13.5로 갱신)부터 새 바 하나가 추가된 응답
+    second = make_history(dates[3:], [13.5, 14])
+
+    with patch("core.bar_store.yf.Ticker") as mock_ticker:
+        mock_ticker.return_value.history.return_value = first
+        bars = await store.get_bars("AAPL", "1d", "1mo")
+        assert mock_ticker.return_value.history.call_args.kwargs["period"] == "1mo"
+        assert list(bars.close) == [10, 11, 12, 13]
+
+        mock_ticker.return_value.history.return_value = second
+        bars = await store.get_bars("AAPL", "1d", "1mo")
+        assert "start" in mock_ticker.return_value.history.call_args.kwargs
+
+    assert list(bars.close) == [10, 11, 12, 13.5, 14]
+    assert isinstance(store.read("AAPL", "1d").close, np.memmap)
+
+
+@pytest.mark.asyncio
+async def test_bar_store_skips_upstream_within_refresh_window(tmp_path):
+    store = BarStore(str(tmp_path), refresh_seconds=60)
+    history = make_history(recent_dates(3), [1, 2, 3])
+
+    with patch("core.bar_store.yf.Ticker") as mock_ticker:
+        mock_ticker.return_value.history.return_value = history
+        await store.get_bars("MSFT", "1d", "1mo")
+        bars = await store.get_bars("MSFT", "1d", "1mo")
+
+    assert mock_ticker.return_value.history.call_count == 1
+    assert len(bars) == 3
+
+
+def test_bar_store_to_frame_round_trip(tmp_path):
+    store = BarStore(str(tmp_path))
+    history = make_history(["2026-01-05", "2026-01-06"], [100, 101])
+    store.write(Bars.from_frame("TSLA", "1d", history))
+
+    frame = store.read("TSLA", "1d").to_frame()
+
+    assert list(frame["Close"]) == [100, 101]
+    assert frame.index[0].strftime("%Y-%m-%d") == "2026-01-05"
+
+
+def test_bar_store_write_waits_for_other_writer(tmp_path):
+    store = BarStore(str(tmp_path))
+    first = Bars.from_frame("AAPL", "1d", make_history(["2026-01-05", "2026-01-06"], [100, 101]))
+    second = Bars.from_frame("AAPL", "1d", make_history(["2026-01-06", "2026-01-07"], [101.5, 102]))
+    store.write(first)
+
+    # 다른 프로세스가 잠금을 잡고 있는 동안(같은 파일에 대한 별도 flock) 쓰기는 기다림
+    other = BarStore(str(tmp_path))
+    with other._lock("AAPL", "1d"):
+        writer = threading.Thread(target=store.write, args=(second,))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+        assert list(store.read("AAPL", "1d").close) == [100, 101]
+    writer.join(5)
+
+    assert list(store.read("AAPL", "1d").close) == [100, 101.5, 102]
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+from core.cache import TTLCache, CacheRegistry, MISSING
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache("test", ttl=60)
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        cache.set("AAPL", {"currentPrice": 1.0})
+    with patch("core.cache.time.monotonic", return_value=1059.0):
+        assert cache.get("AAPL") == {"currentPrice": 1.0}
+    with patch("core.cache.time.monotonic", return_value=1061.0):
+        assert cache.get("AAPL") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_negative_entries_use_short_ttl():
+    cache = TTLCache("test", ttl=60, negative_ttl=5)
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        cache.set_negative("BAD")
+    with patch("core.cache.time.monotonic", return_value=1004.0):
+        assert cache.get("BAD", MISSING) is None
+    with patch("core.cache.time.monotonic", return_value=1006.0):
+        assert cache.get("BAD", MISSING) is MISSING
+
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_ttl_cache_serves_stale_values_within_stale_window():
+    cache = TTLCache("test", ttl=60, stale_ttl=30)
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        cache.set("AAPL", 1.0)
+        cache.set_negative("BAD")
+    with patch("core.cache.time.monotonic", return_value=1070.0):
+        assert cache.get("AAPL") is None
+        assert cache.get_stale("AAPL") == 1.0
+        assert cache.get_stale("BAD") is None
+        assert cache.ttl_remaining("AAPL") == -10.0
+    with patch("core.cache.time.monotonic", return_value=1091.0):
+        assert cache.get_stale("AAPL") is None
+
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_cache_registry_reuses_namespaces():
+    registry = CacheRegistry()
+    price = registry.namespace("price", ttl=60)
+
+    assert registry.namespace("price") is price
+    assert set(registry.stats()) == {"price"}
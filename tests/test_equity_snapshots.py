@@ -0,0 +1,37 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from core.trade_service import TradeService
+
+
+@pytest.mark.asyncio
+async def test_snapshots_for_all_users_use_one_query_one_quote_fetch_and_one_commit():
+    users = [SimpleNamespace(id=1, cash_balance=1000.0), SimpleNamespace(id=2, cash_balance=500.0),
+             SimpleNamespace(id=3, cash_balance=50.0)]
+    assets = [
+        SimpleNamespace(user_id=1, symbol="TSLA", quantity=2.0, average_price=150.0),
+        SimpleNamespace(user_id=1, symbol="AAPL", quantity=1.0, average_price=100.0),
+        SimpleNamespace(user_id=2, symbol="TSLA", quantity=1.0, average_price=180.0),
+    ]
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = assets
+    session = MagicMock(execute=AsyncMock(return_value=result), commit=AsyncMock())
+    # AAPL 시세가 없으면 평균 단가로 평가
+    quotes = {"TSLA": {"currentPrice": 200.0}, "AAPL": {"error": "not found"}}
+
+    with patch("core.trade_service.get_quotes", new=AsyncMock(return_value=quotes)) as get_quotes:
+        snapshots = await TradeService(MagicMock()).record_equity_snapshots(session, users)
+
+    session.execute.assert_awaited_once()
+    get_quotes.assert_awaited_once_with(["AAPL", "TSLA"])
+    session.add_all.assert_called_once()
+    session.commit.assert_awaited_once()
+    assert [(s.user_id, s.total_equity) for s in snapshots] == [(1, 1500.0), (2, 700.0), (3, 50.0)]
+
+
+@pytest.mark.asyncio
+async def test_no_users_is_a_no_op():
+    session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+    assert await TradeService(MagicMock()).record_equity_snapshots(session, []) == []
+    session.execute.assert_not_awaited()
+    session.commit.assert_not_awaited()
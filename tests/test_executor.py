@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.executor import BoundedExecutor
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_runs_off_event_loop():
+    executor = BoundedExecutor("test", max_workers=2)
+    loop_thread = threading.get_ident()
+
+    thread_id = await executor.run(threading.get_ident)
+
+    assert thread_id != loop_thread
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_limits_concurrency_and_tracks_queue():
+    executor = BoundedExecutor("test", max_workers=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def blocking_job():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    await asyncio.gather(*[executor.run(blocking_job) for _ in range(6)])
+    stats = executor.stats()
+
+    assert max(peak) <= 2
+    assert stats["max_queue_depth"] >= 4
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+    assert stats["completed"] == 6
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_counts_failures():
+    executor = BoundedExecutor("test", max_workers=1)
+
+    def boom():
+        raise ValueError("upstream error")
+
+    with pytest.raises(ValueError):
+        await executor.run(boom)
+
+    assert executor.stats()["failed"] == 1
+    executor.shutdown()
@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+import numpy as np
+import pytest
+from core.backtest_service import BacktestService
+from core.bar_store import Bars
+from core.expression_strategy import RuleError, compile_rule, compiled_strategies, get_compiled_strategy
+from core.indicator_service import IndicatorService
+from core.models import TradingStrategy
+from core.strategy_service import StrategyService
+
+
+def make_strategy(params, updated_at=datetime(2026, 1, 1)):
+    return TradingStrategy(id=1, user_id=1, name="expr", symbol="AAPL", strategy_type="EXPRESSION",
+                           parameters=json.dumps(params), updated_at=updated_at)
+
+
+def test_compile_rule_evaluates_vectorized_and_rejects_unsafe_syntax():
+    rule = compile_rule("rsi < 30 and close < bb_lower or not (macd_hist > -1)")
+    env = {"rsi": np.array([20.0, 20.0, 50.0, np.nan]), "close": np.array([9.0, 11.0, 9.0, 9.0]),
+           "bb_lower": np.array([10.0, 10.0, 10.0, 10.0]), "macd_hist": np.array([0.0, 0.0, -2.0, 0.0])}
+    assert rule(env).tolist() == [True, False, True, False]
+    assert compile_rule("20 < rsi <= 40")({"rsi": np.array([10.0, 30.0, 40.0])}).tolist() == [False, True, True]
+
+    for bad in ("__import__('os')", "rsi.real > 1", "foo > 1", "rsi >", "[rsi]"):
+        with pytest.raises(RuleError):
+            compile_rule(bad)
+
+
+def test_compile_rule_rejects_oversized_and_deeply_nested_rules():
+    compile_rule("(" * 10 + "rsi" + ")" * 10 + " < 30")
+    for bad in ("(" * 500 + "rsi" + ")" * 500, "not " * 120 + "rsi", "-" * 200 + "rsi < 1",
+                "rsi < 30 and " * 60 + "rsi < 30", 123):
+        with pytest.raises(RuleError):
+            compile_rule(bad)
+    # 길이 제한 안이라도 깊이 제한을 넘으면 거부 (RecursionError가 아닌 RuleError)
+    with pytest.raises(RuleError, match="nested too deeply"):
+        compile_rule("-" * 100 + "rsi < 1")
+
+
+@pytest.mark.asyncio
+async def test_evaluate_strategy_uses_cached_compiled_rules():
+    compiled_strategies.clear()
+    service = StrategyService(IndicatorService())
+    strategy = make_strategy({"rule": "rsi < 30 and close < bb_lower", "sell_rule": "rsi > 70"})
+    indicators = {"current_price": 90.0, "rsi": 25.0, "macd": {"val": 1, "signal": 0, "hist": 1},
+                  "bollinger": {"upper": 120.0, "middle": 110.0, "lower": 100.0}}
+
+    assert await service.evaluate_strategy(strategy, indicators) == "BUY"
+    assert await service.evaluate_strategy(strategy, {**indicators, "rsi": 75.0}) == "SELL"
+    assert await service.evaluate_strategy(strategy, {**indicators, "rsi": 50.0}) == "HOLD"
+    assert len(compiled_strategies) == 1
+
+    # 전략이 수정되면(updated_at 변경) 새로 컴파일
+    changed = make_strategy({"rule": "rsi < 60"}, updated_at=datetime(2026, 2, 1))
+    assert get_compiled_strategy(changed) is not get_compiled_strategy(strategy)
+    assert await service.evaluate_strategy(changed, {**indicators, "rsi": 50.0}) == "BUY"
+
+
+def test_expression_backtest_matches_equivalent_rsi_limit():
+    closes = 100 + np.cumsum(np.random.default_rng(9).normal(0, 2, 252))
+    bars = Bars("AAPL", "1d", np.arange(252, dtype=np.int64) * 86400, closes, closes, closes, closes, np.ones(252))
+
+    expression = BacktestService.run_on_bars(bars, "EXPRESSION", {"buy_rule": "rsi <= 35", "sell_rule": "rsi >= 65"})
+    rsi_limit = BacktestService.run_on_bars(bars, "RSI_LIMIT", {"buy_rsi": 35, "sell_rsi": 65})
+
+    assert expression["fills"] == rsi_limit["fills"]
+    assert expression["final_equity"] == rsi_limit["final_equity"]
+    assert "error" in BacktestService.run_on_bars(bars, "EXPRESSION", {"buy_rule": "import os"})
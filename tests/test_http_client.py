@@ -0,0 +1,38 @@
+import pytest
+from core.http_client import HTTPClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_one_client_per_upstream():
+    registry = HTTPClientRegistry()
+    registry.register("yahoo", timeout=3.0, max_connections=7)
+    registry.register("telegram", base_url="https://api.telegram.org")
+
+    client = registry.get("yahoo")
+
+    assert registry.get("yahoo") is client
+    assert registry.get("telegram") is not client
+    assert client.timeout.read == 3.0
+    assert str(registry.get("telegram").base_url) == "https://api.telegram.org"
+    await registry.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_registry_recreates_client_after_close():
+    registry = HTTPClientRegistry()
+    registry.register("rss", follow_redirects=True)
+    await registry.start()
+    first = registry.get("rss")
+    await registry.aclose()
+
+    second = registry.get("rss")
+
+    assert second is not first and not second.is_closed
+    assert second.follow_redirects
+    await registry.aclose()
+
+
+def test_registry_rejects_unknown_upstream():
+    with pytest.raises(KeyError):
+        HTTPClientRegistry().get("unknown")
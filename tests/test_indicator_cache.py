@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService, indicator_cache
+
+
+def make_bars(closes):
+    closes = np.asarray(closes, dtype=np.float64)
+    ts = np.arange(len(closes), dtype=np.int64) * 86400 + 1_700_000_000
+    return Bars("AAPL", "1d", ts, closes, closes, closes, closes, np.ones(len(closes)))
+
+
+@pytest.fixture(autouse=True)
+def clear_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_indicators_are_reused_within_the_same_bar():
+    closes = list(100 + np.cumsum(np.random.default_rng(1).normal(0, 1, 60)))
+    current = {"bars": make_bars(closes)}
+
+    async def fake_get_bars(symbol, interval="1d", period="3mo", base=None):
+        return current["bars"]
+
+    service = IndicatorService()
+    with patch("core.indicator_service.bar_store.get_bars", side_effect=fake_get_bars), \
+         patch.object(service, "_compute_indicators", wraps=service._compute_indicators) as compute:
+        first = await service.get_indicators("AAPL")
+        second = await service.get_indicators("AAPL")
+        latest = await service.get_latest_indicators(["AAPL"])
+        assert compute.call_count == 1
+        assert second is first
+        assert latest["AAPL"]["rsi"] == first["rsi"] and "history" not in latest["AAPL"]
+
+        # 진행 중인 바의 종가가 바뀌면 다시 계산
+        current["bars"] = make_bars(closes[:-1] + [closes[-1] + 1])
+        await service.get_indicators("AAPL")
+        # 새 바가 추가되어도 다시 계산
+        current["bars"] = make_bars(closes + [closes[-1]])
+        await service.get_indicators("AAPL")
+        assert compute.call_count == 3
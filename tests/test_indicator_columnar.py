@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService, format_bar_dates, indicator_cache
+
+
+def make_bars(n=120):
+    closes = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, n))
+    # 뉴욕 자정 기준 일봉 (서머타임 전환 구간 포함)
+    index = pd.date_range("2025-01-02", periods=n, freq="B", tz="America/New_York")
+    ts = (index.tz_convert("UTC").as_unit("s").asi8).astype(np.int64)
+    return Bars("AAPL", "1d", ts, closes - 1, closes + 1, closes - 2, closes, np.full(n, 1000.0))
+
+
+@pytest.fixture(autouse=True)
+def clear_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_columnar_matches_row_history():
+    bars = make_bars()
+    service = IndicatorService()
+    with patch("core.indicator_service.bar_store.get_bars", return_value=bars):
+        rows = await service.get_indicators("AAPL")
+        columnar = await service.get_indicators_columnar("AAPL")
+
+    columns = columnar["columns"]
+    assert columnar["length"] == len(rows["history"]) == 60
+    assert columns["date"] == [h["date"] for h in rows["history"]]
+    for field in ("price", "rsi", "macd", "macd_hist"):
+        np.testing.assert_allclose(
+            np.array(columns[field], dtype=float), np.array([h[field] for h in rows["history"]], dtype=float),
+            rtol=1e-9, equal_nan=True,
+        )
+    assert columnar["rsi"] == pytest.approx(rows["rsi"])
+    assert columnar["timestamp"] == rows["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_columnar_fields_limit_and_unknown_field():
+    bars = make_bars()
+    service = IndicatorService()
+    with patch("core.indicator_service.bar_store.get_bars", return_value=bars):
+        result = await service.get_indicators_columnar("AAPL", fields=["bb_upper", "volume"], limit=500)
+        bad = await service.get_indicators_columnar("AAPL", fields=["nope"])
+
+    assert set(result["columns"]) == {"bb_upper", "volume"}
+    assert result["length"] == 120
+    assert result["columns"]["bb_upper"][:19] == [None] * 19
+    assert result["columns"]["volume"][0] == 1000.0
+    assert bad == {"error": "Unknown fields: nope"}
+
+
+def test_format_bar_dates_uses_new_york_local_time():
+    ts = np.array([1_700_000_000, 1_720_000_000])  # 2023-11-14 22:13 UTC (EST), 2024-07-03 09:46 UTC (EDT)
+    assert format_bar_dates(ts, "1d") == ["2023-11-14", "2024-07-03"]
+    assert format_bar_dates(ts, "1h") == ["2023-11-14T17:13", "2024-07-03T05:46"]
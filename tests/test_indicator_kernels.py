@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from core import indicator_kernels as kernels
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService, indicator_cache
+
+
+def make_ohlcv(n, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    volume = rng.integers(100, 10000, n).astype(float)
+    return high, low, close, volume
+
+
+def assert_same(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
+@pytest.mark.parametrize("n", [5, 30, 250, 1000])
+def test_kernels_match_pandas(n):
+    high, low, close, volume = make_ohlcv(n)
+    s = pd.Series(close)
+    h, l, v = pd.Series(high), pd.Series(low), pd.Series(volume)
+
+    assert_same(kernels.rsi(close), IndicatorService.calculate_rsi(s))
+    assert_same(kernels.ema(close, 20), IndicatorService.calculate_ema(s, 20))
+    for key, series in IndicatorService.calculate_macd(s).items():
+        assert_same(kernels.macd(close)[key], series)
+    for key, series in IndicatorService.calculate_bollinger_bands(s).items():
+        assert_same(kernels.bollinger(close)[key], series)
+    assert_same(kernels.atr(high, low, close), IndicatorService.calculate_atr(h, l, s))
+    assert_same(kernels.vwap(high, low, close, volume), IndicatorService.calculate_vwap(h, l, s, v))
+
+
+def test_vwap_resets_each_session():
+    high, low, close, volume = make_ohlcv(40)
+    sessions = np.repeat([1, 2, 3], [10, 20, 10])
+    expected = IndicatorService.calculate_vwap(pd.Series(high), pd.Series(low), pd.Series(close), pd.Series(volume), sessions)
+    result = kernels.vwap(high, low, close, volume, sessions)
+    assert_same(result, expected)
+    assert result[10] == pytest.approx((high[10] + low[10] + close[10]) / 3)
+
+
+def test_ema_skips_leading_nan_in_panel():
+    _, _, close, _ = make_ohlcv(60)
+    panel = np.vstack([close, np.r_[np.full(20, np.nan), close[20:]]])
+    result = kernels.ema(panel, 12)
+    assert_same(result[0], kernels.ema(close, 12))
+    assert_same(result[1, 20:], kernels.ema(close[20:], 12))
+
+
+@pytest.mark.asyncio
+async def test_backends_return_same_indicators():
+    high, low, close, volume = make_ohlcv(120)
+    ts = pd.date_range("2025-01-02", periods=120, freq="B", tz="America/New_York").tz_convert("UTC").as_unit("s").asi8
+    bars = Bars("AAPL", "1d", ts.astype(np.int64), close, high, low, close, volume)
+
+    results = {}
+    for backend in ("numpy", "pandas"):
+        indicator_cache.clear()
+        with patch("core.indicator_service.bar_store.get_bars", return_value=bars):
+            results[backend] = await IndicatorService(backend=backend).get_indicators("AAPL")
+
+    fast, slow = results["numpy"], results["pandas"]
+    assert [h["date"] for h in fast["history"]] == [h["date"] for h in slow["history"]]
+    assert fast["rsi"] == pytest.approx(slow["rsi"])
+    assert fast["macd"] == pytest.approx(slow["macd"])
+    assert fast["bollinger"] == pytest.approx(slow["bollinger"])
+    assert fast["timestamp"] == slow["timestamp"]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        IndicatorService(backend="cuda")
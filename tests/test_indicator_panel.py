@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService
+
+
+def make_closes(n, seed):
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 2, n))
+
+
+def make_bars(symbol, closes):
+    ts = np.arange(len(closes), dtype=np.int64) * 86400 + 1_700_000_000
+    return Bars(symbol, "1d", ts, closes, closes, closes, closes, np.ones(len(closes)))
+
+
+def test_panel_matches_per_symbol_batch_functions():
+    series = [make_closes(120, 1), make_closes(80, 2), make_closes(15, 3)]
+    panel_input = np.full((3, 120), np.nan)
+    for row, closes in enumerate(series):
+        panel_input[row, 120 - len(closes):] = closes
+
+    panel = IndicatorService.calculate_panel(panel_input)
+
+    for row, closes in enumerate(series):
+        s = pd.Series(closes)
+        tail = slice(120 - len(closes), None)
+        macd = IndicatorService.calculate_macd(s)
+        bb = IndicatorService.calculate_bollinger_bands(s)
+        expected = {
+            "rsi": IndicatorService.calculate_rsi(s), "macd": macd["macd"], "signal": macd["signal"],
+            "histogram": macd["histogram"], "upper": bb["upper"], "middle": bb["middle"], "lower": bb["lower"],
+        }
+        for key, values in expected.items():
+            np.testing.assert_allclose(panel[key][row, tail], values.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+            assert np.isnan(panel[key][row, :120 - len(closes)]).all()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_indicators_computes_all_symbols_in_one_panel():
+    bars = {"AAPL": make_bars("AAPL", make_closes(60, 4)), "MSFT": make_bars("MSFT", make_closes(40, 5)),
+            "NONE": make_bars("NONE", np.array([]))}
+
+    async def fake_get_bars(symbol, interval="1d", period="3mo"):
+        return bars[symbol]
+
+    service = IndicatorService()
+    with patch("core.indicator_service.bar_store.get_bars", side_effect=fake_get_bars), \
+         patch.object(IndicatorService, "calculate_panel", wraps=IndicatorService.calculate_panel) as panel:
+        result = await service.get_latest_indicators(["AAPL", "MSFT", "NONE"])
+
+    panel.assert_called_once()
+    assert result["NONE"] == {"error": "No data found"}
+    expected_rsi = IndicatorService.calculate_rsi(pd.Series(bars["MSFT"].close)).iloc[-1]
+    assert result["MSFT"]["rsi"] == pytest.approx(expected_rsi)
+    assert result["AAPL"]["current_price"] == bars["AAPL"].close[-1]
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from core.exit_manager import ExitManager
+from core.job_queue import (JOB_DONE, JOB_EXIT_LEVELS, JOB_FAILED, JOB_OPTIMIZE, JOB_RUNNING,
+                            JobQueue, JobRunner, job_to_dict)
+from core.models import User
+import sqlmodel.sql.sqltypes
+
+# 모델은 naive UTC(datetime.utcnow)를 저장합니다. timezone 있는 datetime만 받는 SQLModel 버전에서는 DB 테스트를 실행할 수 없음
+requires_naive_datetimes = pytest.mark.skipif(
+    hasattr(sqlmodel.sql.sqltypes, "UTCDateTime"),
+    reason="installed SQLModel rejects naive datetimes used by the models",
+)
+
+
+@pytest_asyncio.fixture
+async def make_session():
+    # SQLite는 FOR UPDATE SKIP LOCKED를 무시하지만 대기/만료/재시도 규칙은 같은 쿼리로 검증 가능
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all([User(id=1, username="u1", hashed_password="x"), User(id=2, username="u2", hashed_password="x")])
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+@requires_naive_datetimes
+@pytest.mark.asyncio
+async def test_jobs_are_claimed_once_in_order_and_completed(make_session):
+    queue = JobQueue()
+    async with make_session() as session:
+        first = await queue.enqueue(session, JOB_OPTIMIZE, {"symbols": ["TSLA"]}, user_id=1)
+        second = await queue.enqueue(session, JOB_OPTIMIZE, {"symbols": ["NVDA"]}, user_id=1)
+        await queue.enqueue(session, JOB_EXIT_LEVELS, {"symbol": "TSLA"}, user_id=1)
+
+        claimed = await queue.claim(session, [JOB_OPTIMIZE], "A")
+        assert claimed.id == first.id and claimed.status == JOB_RUNNING and claimed.worker_id == "A"
+        # 실행 중인 작업은 다른 워커가 가져가지 않음
+        assert (await queue.claim(session, [JOB_OPTIMIZE], "B")).id == second.id
+        assert await queue.claim(session, [JOB_OPTIMIZE], "B") is None
+
+        await queue.complete(session, claimed, {"results": [1, 2]})
+        job = await queue.get(session, first.id, user_id=1)
+        assert job.status == JOB_DONE
+        assert job_to_dict(job)["result"] == {"results": [1, 2]}
+        assert await queue.get(session, first.id, user_id=2) is None
+
+        await queue.complete(session, second, {"error": "No data found"})
+        assert (await queue.get(session, second.id)).status == JOB_FAILED
+
+
+@requires_naive_datetimes
+@pytest.mark.asyncio
+async def test_expired_running_jobs_are_retried_until_max_attempts(make_session):
+    queue = JobQueue(lease_seconds=60, max_attempts=2)
+    async with make_session() as session:
+        job = await queue.enqueue(session, JOB_OPTIMIZE, {}, user_id=1)
+        for worker in ("A", "B"):
+            claimed = await queue.claim(session, [JOB_OPTIMIZE], worker)
+            assert claimed.id == job.id and claimed.worker_id == worker
+            # 워커가 결과를 남기지 못하고 죽어 리스가 만료됨
+            claimed.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+            session.add(claimed)
+            await session.commit()
+
+        assert await queue.claim(session, [JOB_OPTIMIZE], "C") is None
+        failed = await queue.get(session, job.id)
+        assert failed.status == JOB_FAILED and failed.attempts == 2
+
+
+@requires_naive_datetimes
+@pytest.mark.asyncio
+async def test_heartbeat_extends_only_own_running_lease(make_session):
+    queue = JobQueue(lease_seconds=60)
+    async with make_session() as session:
+        await queue.enqueue(session, JOB_OPTIMIZE, {}, user_id=1)
+        job = await queue.claim(session, [JOB_OPTIMIZE], "A")
+        job.lease_expires_at = datetime.utcnow() + timedelta(seconds=1)
+        session.add(job)
+        await session.commit()
+
+        assert await queue.heartbeat(session, job, "A")
+        await session.refresh(job)
+        assert job.lease_expires_at > datetime.utcnow() + timedelta(seconds=30)
+        # 다른 워커가 가져간(또는 끝난) 작업의 리스는 연장하지 않음
+        assert not await queue.heartbeat(session, job, "B")
+        await queue.complete(session, job, {})
+        assert not await queue.heartbeat(session, job, "A")
+
+
+@requires_naive_datetimes
+@pytest.mark.asyncio
+async def test_purge_deletes_finished_jobs_past_retention(make_session):
+    queue = JobQueue(retention_seconds=86400, signal_retention_seconds=3600)
+    async with make_session() as session:
+        old_optimize = await queue.enqueue(session, JOB_OPTIMIZE, {}, user_id=1)
+        recent_optimize = await queue.enqueue(session, JOB_OPTIMIZE, {}, user_id=1)
+        signal = await queue.enqueue(session, JOB_EXIT_LEVELS, {}, user_id=1)
+        pending = await queue.enqueue(session, JOB_OPTIMIZE, {}, user_id=1)
+        now = datetime.utcnow()
+        for job, age in ((old_optimize, timedelta(days=2)), (recent_optimize, timedelta(hours=2)),
+                         (signal, timedelta(hours=2))):
+            await queue.complete(session, job, {})
+            job.finished_at = now - age
+            session.add(job)
+        await session.commit()
+
+        assert await queue.purge(session, now=now) == 2
+        assert await queue.get(session, recent_optimize.id) is not None
+        assert await queue.get(session, pending.id) is not None
+        assert await queue.get(session, old_optimize.id) is None
+        assert await queue.get(session, signal.id) is None
+
+
+def fake_session_factory(events=None):
+    events = [] if events is None else events
+
+    def open_session():
+        context = MagicMock()
+
+        async def enter():
+            events.append("open")
+            return MagicMock()
+
+        async def exit_(*_):
+            events.append("close")
+            return False
+
+        context.__aenter__ = AsyncMock(side_effect=enter)
+        context.__aexit__ = AsyncMock(side_effect=exit_)
+        return context
+
+    return MagicMock(return_value=open_session)
+
+
+def make_job(kind, payload):
+    return SimpleNamespace(id=1, kind=kind, payload=json.dumps(payload), attempts=1, status=JOB_RUNNING)
+
+
+@pytest.mark.asyncio
+async def test_runner_dispatches_by_kind_and_records_failures():
+    queue = MagicMock(claim=AsyncMock(), complete=AsyncMock(), fail=AsyncMock())
+    handler = AsyncMock(return_value={"ok": True})
+    broken = AsyncMock(side_effect=RuntimeError("boom"))
+    runner = JobRunner({JOB_OPTIMIZE: handler, JOB_EXIT_LEVELS: broken}, "A", queue=queue)
+
+    with patch("core.job_queue.sessionmaker", fake_session_factory()):
+        queue.claim.return_value = make_job(JOB_OPTIMIZE, {"symbols": ["TSLA"]})
+        job = await runner.run_next()
+        handler.assert_awaited_once_with({"symbols": ["TSLA"]})
+        queue.complete.assert_awaited_once()
+        assert queue.complete.await_args.args[1:] == (job, {"ok": True})
+        assert list(queue.claim.await_args.args[1]) == [JOB_OPTIMIZE, JOB_EXIT_LEVELS]
+
+        queue.claim.return_value = make_job(JOB_EXIT_LEVELS, {})
+        await runner.run_next()
+        queue.fail.assert_awaited_once()
+        assert queue.fail.await_args.args[2] == "boom"
+
+        queue.claim.return_value = None
+        assert await runner.run_next() is None
+
+
+@pytest.mark.asyncio
+async def test_disabled_runner_does_not_claim():
+    queue = MagicMock(claim=AsyncMock())
+    runner = JobRunner({JOB_EXIT_LEVELS: AsyncMock()}, "A", queue=queue, enabled=lambda: False)
+    assert await runner.run_next() is None
+    queue.claim.assert_not_awaited()
+
+
+def test_exit_manager_without_lease_ignores_ticks():
+    manager = ExitManager(MagicMock(), board=MagicMock(), feed=MagicMock(), leases=MagicMock())
+    manager.set_levels(1, "TSLA", 90.0, None)
+    assert not manager.is_active
+    manager.on_tick("TSLA", {"currentPrice": 80.0})
+    # 리스가 없는 워커는 청산하지 않고 트리거도 소비하지 않음
+    assert (1, "TSLA") in manager.index
+
+
+@pytest.mark.asyncio
+async def test_runner_releases_session_while_handler_runs():
+    events = []
+    queue = MagicMock(claim=AsyncMock(return_value=make_job(JOB_OPTIMIZE, {})),
+                      complete=AsyncMock(side_effect=lambda *_: events.append("complete")))
+
+    async def handler(_payload):
+        events.append("run")
+        return {}
+
+    runner = JobRunner({JOB_OPTIMIZE: handler}, "A", queue=queue)
+    with patch("core.job_queue.sessionmaker", fake_session_factory(events)):
+        await runner.run_next()
+
+    # 가져오기 세션을 닫은 뒤 실행하고, 결과는 새 세션에서 기록
+    assert events == ["open", "close", "run", "open", "complete", "close"]
+
+
+@pytest.mark.asyncio
+async def test_runner_extends_lease_while_handler_runs():
+    queue = MagicMock(claim=AsyncMock(return_value=make_job(JOB_OPTIMIZE, {})), complete=AsyncMock(),
+                      heartbeat=AsyncMock(return_value=True))
+
+    async def handler(_payload):
+        await asyncio.sleep(0.05)
+        return {}
+
+    runner = JobRunner({JOB_OPTIMIZE: handler}, "A", queue=queue, heartbeat_seconds=0.01)
+    with patch("core.job_queue.sessionmaker", fake_session_factory()):
+        await runner.run_next()
+        calls = queue.heartbeat.await_count
+        await asyncio.sleep(0.03)
+
+    assert calls >= 2
+    assert queue.heartbeat.await_args.args[1:] == (queue.claim.return_value, "A")
+    # 작업이 끝나면 연장을 멈춤
+    assert queue.heartbeat.await_count == calls
@@ -0,0 +1,110 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from core.lease_manager import LeaseManager
+from core.models import TradingStrategy, User, WorkerLease
+import sqlmodel.sql.sqltypes
+
+# 모델은 naive UTC(datetime.utcnow)를 저장합니다. timezone 있는 datetime만 받는 SQLModel 버전에서는 실행할 수 없음
+pytestmark = pytest.mark.skipif(
+    hasattr(sqlmodel.sql.sqltypes, "UTCDateTime"),
+    reason="installed SQLModel rejects naive datetimes used by the models",
+)
+
+
+@pytest_asyncio.fixture
+async def make_session():
+    # SQLite는 FOR UPDATE SKIP LOCKED를 무시하지만 리스 분배/만료 규칙은 같은 쿼리로 검증 가능
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(User(id=1, username="u", hashed_password="x"))
+        session.add_all([
+            TradingStrategy(id=i, user_id=1, name=f"s{i}", symbol="TSLA", strategy_type="RSI_LIMIT", is_active=i != 11)
+            for i in range(1, 12)
+        ])
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def claim(factory, manager):
+    async with factory() as session:
+        return [s.id for s in await manager.claim_strategies(session)]
+
+
+@pytest.mark.asyncio
+async def test_workers_split_active_strategies_without_overlap(make_session):
+    a, b = LeaseManager("A"), LeaseManager("B")
+
+    assert await claim(make_session, a) == list(range(1, 11))
+    # B가 합류해도 A의 리스가 살아 있는 동안은 가져갈 수 없음
+    assert await claim(make_session, b) == []
+    # A는 다음 주기에 몫(10 / 2)을 넘는 전략을 반납하고, B가 그것을 가져감
+    a_ids = await claim(make_session, a)
+    b_ids = await claim(make_session, b)
+    assert len(a_ids) == len(b_ids) == 5
+    assert sorted(a_ids + b_ids) == list(range(1, 11))
+    assert await claim(make_session, a) == a_ids
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_reassigned(make_session):
+    a, b = LeaseManager("A"), LeaseManager("B")
+    await claim(make_session, a)
+    await claim(make_session, b)
+
+    # A가 죽어서 리스와 생존 신호가 만료됨
+    past = datetime.utcnow() - timedelta(seconds=1)
+    async with make_session() as session:
+        await session.execute(update(TradingStrategy).where(TradingStrategy.lease_owner == "A").values(lease_expires_at=past))
+        await session.execute(update(WorkerLease).where(WorkerLease.owner == "A").values(expires_at=past))
+        await session.commit()
+
+    assert await claim(make_session, b) == list(range(1, 11))
+
+
+@pytest.mark.asyncio
+async def test_singleton_lease_and_release(make_session):
+    a, b = LeaseManager("A"), LeaseManager("B")
+    async with make_session() as session:
+        assert await a.acquire(session, "equity_snapshot")
+        assert not await b.acquire(session, "equity_snapshot")
+        assert await a.acquire(session, "equity_snapshot")
+        await claim(make_session, a)
+
+        await a.release_all(session)
+        assert await b.acquire(session, "equity_snapshot")
+        owners = (await session.execute(select(TradingStrategy.lease_owner))).scalars().all()
+        assert set(owners) == {None}
+
+
+@pytest.mark.asyncio
+async def test_sharding_holds_across_extended_hours_cycles(make_session):
+    # 장전/장후에는 300초마다 실행. 기본 리스(180초)는 주기보다 짧으므로 주기에 맞춰 늘려야 함
+    a, b = LeaseManager("A", lease_seconds=180), LeaseManager("B", lease_seconds=180)
+    for manager in (a, b):
+        manager.cover_interval(300)
+    assert a.lease_seconds == b.lease_seconds == 600
+
+    start = datetime.utcnow()
+    assignments = []
+    for cycle in range(5):
+        now = start + timedelta(seconds=300 * cycle)
+        with patch("core.lease_manager.datetime") as clock:
+            clock.utcnow.return_value = now
+            assignments.append((await claim(make_session, a), await claim(make_session, b)))
+
+    # 첫 두 주기에서 5개씩 나눈 뒤로는 같은 분배를 유지 (매 주기 전략이 옮겨 다니지 않음)
+    settled = assignments[2]
+    assert len(settled[0]) == len(settled[1]) == 5
+    assert sorted(settled[0] + settled[1]) == list(range(1, 11))
+    assert assignments[3:] == [settled, settled]
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from core.bar_store import Bars
+from core.indicator_service import IndicatorService
+from core.live_indicators import LiveIndicators
+from core.market_calendar import NY_TZ
+from core.quote_feed import QuoteBoard
+
+
+def daily_bars(closes, last_day):
+    days = pd.bdate_range(end=last_day, periods=len(closes))
+    ts = np.array([int(datetime(d.year, d.month, d.day, 16, tzinfo=NY_TZ).timestamp()) for d in days])
+    closes = np.asarray(closes, dtype=np.float64)
+    return Bars("TSLA", "1d", ts, closes, closes + 1, closes - 1, closes, np.full(len(closes), 1000.0))
+
+
+def batch_latest(closes):
+    series = IndicatorService().compute_series(np.asarray(closes, dtype=np.float64))
+    return {key: series[key][-1] for key in ("rsi", "macd", "signal", "histogram", "upper", "middle", "lower")}
+
+
+def assert_matches(live, closes):
+    expected = batch_latest(closes)
+    assert live["current_price"] == closes[-1]
+    assert live["rsi"] == pytest.approx(expected["rsi"], rel=1e-9)
+    assert live["macd"]["val"] == pytest.approx(expected["macd"], rel=1e-9)
+    assert live["macd"]["signal"] == pytest.approx(expected["signal"], rel=1e-9)
+    assert live["macd"]["hist"] == pytest.approx(expected["histogram"], rel=1e-9)
+    for key in ("upper", "middle", "lower"):
+        assert live["bollinger"][key] == pytest.approx(expected[key], rel=1e-9)
+
+
+def tick_time(year, month, day, hour):
+    return datetime(year, month, day, hour, tzinfo=NY_TZ).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_ticks_update_indicators_like_batch_recompute():
+    rng = np.random.default_rng(3)
+    closes = list(300 + np.cumsum(rng.normal(0, 2, 80)))
+    live = LiveIndicators(board=QuoteBoard())
+    with patch("core.live_indicators.bar_store.get_bars", AsyncMock(return_value=daily_bars(closes, "2026-03-05"))):
+        await live.track(["TSLA"])
+    assert live.get("TSLA") is None
+
+    # 같은 날의 틱은 진행 중인 마지막 바의 종가를 바꾼 것과 같음
+    with patch("core.live_indicators.time.time", return_value=tick_time(2026, 3, 5, 15)):
+        live.on_tick("TSLA", {"currentPrice": 310.0, "timestamp": tick_time(2026, 3, 5, 15)})
+        assert_matches(live.get("TSLA"), closes[:-1] + [310.0])
+        assert live.get("TSLA")["ohlcv"]["high"] == max(closes[-1] + 1, 310.0)
+
+    # 다음 거래일의 첫 틱은 직전 바(마지막 틱 가격)를 확정하고 새 바를 시작
+    with patch("core.live_indicators.time.time", return_value=tick_time(2026, 3, 6, 10)):
+        live.on_tick("TSLA", {"currentPrice": 305.0, "timestamp": tick_time(2026, 3, 6, 10)})
+        assert_matches(live.get("TSLA"), closes[:-1] + [310.0, 305.0])
+        assert live.get("TSLA")["ohlcv"]["open"] == 305.0
+
+    # 오래된 틱 지표는 사용하지 않음
+    with patch("core.live_indicators.time.time", return_value=tick_time(2026, 3, 6, 11)):
+        assert live.get("TSLA") is None
+
+
+def test_untracked_symbols_are_ignored():
+    live = LiveIndicators(board=QuoteBoard())
+    live.on_tick("AAPL", {"currentPrice": 100.0, "timestamp": tick_time(2026, 3, 5, 10)})
+    assert live.get("AAPL", max_age=None) is None
@@ -0,0 +1,70 @@
+import pytest
+from datetime import date, datetime
+from core import market_calendar as mc
+
+NY = mc.NY_TZ
+
+
+def at(*args):
+    return datetime(*args, tzinfo=NY)
+
+
+def test_2025_holidays_match_nyse_schedule():
+    expected = {
+        date(2025, 1, 1), date(2025, 1, 9), date(2025, 1, 20), date(2025, 2, 17), date(2025, 4, 18),
+        date(2025, 5, 26), date(2025, 6, 19), date(2025, 7, 4), date(2025, 9, 1), date(2025, 11, 27),
+        date(2025, 12, 25),
+    }
+    assert set(mc.holidays(2025)) == expected
+
+
+@pytest.mark.parametrize("year,good_friday", [(2024, date(2024, 3, 29)), (2026, date(2026, 4, 3)), (2027, date(2027, 3, 26))])
+def test_good_friday_follows_easter(year, good_friday):
+    assert mc.holidays(year)[good_friday] == "Good Friday"
+
+
+def test_observed_weekend_holidays():
+    # 2026-07-04(토) -> 7/3(금) 휴장, 2021-12-25(토) -> 12/24(금) 휴장
+    assert mc.is_holiday(date(2026, 7, 3))
+    assert mc.is_holiday(date(2021, 12, 24))
+    # 2022-01-01(토)은 전년도 12/31에 휴장하지 않음
+    assert mc.is_trading_day(date(2021, 12, 31))
+    # 2023-01-01(일) -> 1/2(월) 휴장
+    assert mc.is_holiday(date(2023, 1, 2))
+
+
+def test_early_closes():
+    assert mc.is_early_close(date(2025, 7, 3))
+    assert mc.is_early_close(date(2025, 11, 28))
+    assert mc.is_early_close(date(2025, 12, 24))
+    assert not mc.is_early_close(date(2026, 7, 3))  # 휴장일
+    assert mc.session_at(at(2025, 11, 28, 13, 30)) == mc.AFTER_HOURS
+    assert mc.session_at(at(2025, 11, 28, 17, 30)) == mc.CLOSED
+
+
+def test_sessions_on_a_regular_day():
+    assert mc.session_at(at(2025, 3, 11, 3, 59)) == mc.CLOSED
+    assert mc.session_at(at(2025, 3, 11, 4, 0)) == mc.PRE_MARKET
+    assert mc.session_at(at(2025, 3, 11, 9, 30)) == mc.REGULAR
+    assert mc.session_at(at(2025, 3, 11, 16, 0)) == mc.AFTER_HOURS
+    assert mc.session_at(at(2025, 3, 11, 20, 0)) == mc.CLOSED
+    assert mc.session_at(at(2025, 3, 15, 12, 0)) == mc.CLOSED  # 토요일
+    # 다른 시간대의 시각도 뉴욕 기준으로 판단 (14:30 UTC = 서머타임 중 10:30 ET)
+    assert mc.session_at(datetime.fromisoformat("2025-03-11T14:30:00+00:00")) == mc.REGULAR
+
+
+def test_next_change_skips_weekends_and_holidays():
+    # 2025-04-17(목) 장후 종료 뒤 -> 성금요일과 주말을 건너 4/21(월) 장전
+    change, session = mc.next_session_change(at(2025, 4, 17, 21, 0))
+    assert (change, session) == (at(2025, 4, 21, 4, 0), mc.PRE_MARKET)
+    change, session = mc.next_session_change(at(2025, 4, 21, 9, 0))
+    assert (change, session) == (at(2025, 4, 21, 9, 30), mc.REGULAR)
+
+
+def test_next_wakeup_follows_session_cadence():
+    intervals = {mc.REGULAR: 60, mc.PRE_MARKET: 300, mc.AFTER_HOURS: 300}
+    assert mc.next_wakeup(intervals, at(2025, 3, 11, 10, 0)) == 60
+    # 세션 전환을 넘기지 않음
+    assert mc.next_wakeup(intervals, at(2025, 3, 11, 9, 28)) == 120
+    # 휴장 중에는 다음 장전 시작까지
+    assert mc.next_wakeup(intervals, at(2025, 3, 14, 20, 0)) == (at(2025, 3, 17, 4, 0) - at(2025, 3, 14, 20, 0)).total_seconds()
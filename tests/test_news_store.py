@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from core.cache import cache_registry
+from core.news_store import NewsStore, normalize_news, to_epoch
+
+
+@pytest.fixture(autouse=True)
+def clear_news_index():
+    cache_registry.get("news_index").clear()
+    yield
+    cache_registry.get("news_index").clear()
+
+
+def old_item(uuid, title, ts):
+    return {"uuid": uuid, "title": title, "publisher": "Reuters", "link": f"https://x/{uuid}", "providerPublishTime": ts}
+
+
+def new_item(uuid, title, pub_date):
+    return {"id": uuid, "content": {
+        "title": title, "pubDate": pub_date, "summary": "s",
+        "provider": {"displayName": "Yahoo"}, "canonicalUrl": {"url": f"https://y/{uuid}"},
+    }}
+
+
+def test_normalize_old_and_new_shapes():
+    old = normalize_news(old_item("a", "Old", 1700000000))
+    new = normalize_news(new_item("b", "New", "2023-11-14T22:13:20Z"))
+
+    assert old["uuid"] == "a" and old["publisher"] == "Reuters" and old["providerPublishTime"] == 1700000000
+    assert new["uuid"] == "b" and new["title"] == "New" and new["link"] == "https://y/b"
+    assert new["publisher"] == "Yahoo" and new["providerPublishTime"] == 1700000000
+    assert normalize_news({"content": {"title": "no id"}}) is None
+    assert to_epoch("Tue, 14 Nov 2023 22:13:20 GMT") == 1700000000
+
+
+@pytest.mark.asyncio
+async def test_get_many_dedups_by_uuid_and_sorts_newest_first():
+    store = NewsStore()
+    news = {
+        "AAPL": [old_item("shared", "Shared", 200), old_item("a1", "Apple", 100)],
+        "MSFT": [new_item("shared", "Shared", "1970-01-01T00:03:20Z"), old_item("m1", "Microsoft", 300)],
+    }
+    with patch("core.news_store.yf.Ticker", side_effect=lambda s: MagicMock(news=news[s])):
+        merged = await store.get_many(["AAPL", "MSFT"])
+
+    assert [n["uuid"] for n in merged] == ["m1", "shared", "a1"]
+
+
+@pytest.mark.asyncio
+async def test_symbol_news_is_not_refetched_within_ttl():
+    store = NewsStore()
+    with patch("core.news_store.yf.Ticker", return_value=MagicMock(news=[old_item("a", "A", 1)])) as ticker:
+        first = await store.get_symbol_news("AAPL")
+        second = await store.get_symbol_news("aapl")
+
+    assert first == second and first[0]["uuid"] == "a"
+    assert ticker.call_count == 1
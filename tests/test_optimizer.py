@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from core.backtest_service import BacktestService
+from core.bar_store import Bars
+from core.optimizer import Optimizer, grid_combinations, parse_values, random_combinations, search_space_error
+
+
+def make_bars(symbol, seed, n=252):
+    closes = 100 + np.cumsum(np.random.default_rng(seed).normal(0, 2, n))
+    return Bars(symbol, "1d", np.arange(n, dtype=np.int64) * 86400 + 1_700_000_000, closes, closes, closes, closes, np.ones(n))
+
+
+def test_combination_generators():
+    space = {"buy_rsi": [20, 30], "sell_rsi": [70, 80, 90]}
+    assert len(grid_combinations(space)) == 6
+    sampled = random_combinations(space, 4, seed=1)
+    assert len(sampled) == 4 and len({tuple(c.values()) for c in sampled}) == 4
+    assert parse_values("20:30:5") == [20.0, 25.0, 30.0]
+    assert parse_values("1,2") == [1.0, 2.0]
+
+
+def test_sweep_ranks_by_metric_and_matches_single_backtests():
+    bars_list = [make_bars("AAA", 1), make_bars("BBB", 2)]
+    combos = grid_combinations({"buy_rsi": [20, 30, 40, 70], "sell_rsi": [60, 70, 80]})
+
+    result = Optimizer(max_workers=2, start_method="fork").sweep(bars_list, "RSI_LIMIT", combos, metric="total_return", top=50)
+
+    # buy_rsi >= sell_rsi 조합은 제외
+    assert result["combinations"] == 10
+    scores = [r["score"] for r in result["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+    best = result["results"][0]
+    for bars in bars_list:
+        single = BacktestService.run_on_bars(bars, "RSI_LIMIT", best["parameters"])
+        assert best["symbols"][bars.symbol]["total_return"] == single["total_return"]
+
+
+def test_sweep_rejects_unknown_metric():
+    assert "error" in Optimizer(max_workers=1).sweep([make_bars("AAA", 1)], "RSI_LIMIT", [{}], metric="nope")
+
+
+def test_search_space_limit_is_checked_without_building_combinations():
+    huge = {f"p{i}": list(range(100)) for i in range(6)}
+    assert "Too many" in search_space_error(huge, limit=1000)
+    assert "Too many" in search_space_error(huge, random_samples=5000, limit=1000)
+    assert search_space_error(huge, random_samples=500, limit=1000) is None
+    assert "at least 1" in search_space_error(huge, random_samples=0)
+    assert search_space_error({"buy_rsi": [20, 30], "sell_rsi": [70, 80]}, limit=4) is None
+
+
+@pytest.mark.asyncio
+async def test_optimize_and_sweep_enforce_combination_limit():
+    optimizer = Optimizer(max_workers=1, max_combinations=3)
+    space = {"buy_rsi": [20, 30], "sell_rsi": [70, 80]}
+    with patch("core.optimizer.grid_combinations") as grid, patch("core.optimizer.bar_store.get_bars") as get_bars:
+        result = await optimizer.optimize(["AAA"], "RSI_LIMIT", space)
+    assert "Too many" in result["error"]
+    grid.assert_not_called()
+    get_bars.assert_not_called()
+    assert "Too many" in optimizer.sweep([make_bars("AAA", 1)], "RSI_LIMIT", grid_combinations(space))["error"]
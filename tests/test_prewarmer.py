@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from core import stock_service
+from core.prewarmer import PreWarmer
+
+
+@pytest.fixture(autouse=True)
+def clear_state():
+    stock_service.price_cache.clear()
+    stock_service.hot_symbols.clear()
+    yield
+    stock_service.price_cache.clear()
+    stock_service.hot_symbols.clear()
+
+
+@pytest.mark.asyncio
+async def test_hot_symbol_serves_stale_price_while_refreshing():
+    prewarmer = PreWarmer()
+    prewarmer.record_search("AAPL")
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        stock_service.price_cache.set("AAPL", {"currentPrice": 100.0})
+
+    with patch("core.cache.time.monotonic", return_value=1100.0), \
+         patch("core.stock_service._fetch_many", new=AsyncMock(return_value={})) as fetch:
+        quote = await stock_service.get_stock_info("AAPL")
+        quotes = await stock_service.get_stock_infos(["AAPL"])
+        for task in list(stock_service._revalidate_tasks):
+            await task
+
+    assert quote["currentPrice"] == 100.0
+    assert quotes["AAPL"]["currentPrice"] == 100.0
+    fetch.assert_awaited_with(["AAPL"])
+
+
+@pytest.mark.asyncio
+async def test_refresh_once_renews_only_expiring_hot_symbols():
+    prewarmer = PreWarmer(lead_seconds=10)
+    prewarmer.add_static(["AAPL", "MSFT", "NVDA"])
+    prewarmer.db_symbols = {"TSLA"}
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        stock_service.price_cache.set("AAPL", {"currentPrice": 1.0}, ttl=60)
+        stock_service.price_cache.set("MSFT", {"currentPrice": 1.0}, ttl=5)
+
+    with patch("core.cache.time.monotonic", return_value=1000.0), \
+         patch.object(prewarmer, "load_db_symbols", new=AsyncMock()), \
+         patch("core.stock_service.refresh_stock_infos", new=AsyncMock(return_value={})) as refresh:
+        due = await prewarmer.refresh_once()
+
+    assert due == ["MSFT", "NVDA", "TSLA"]
+    refresh.assert_awaited_once_with(["MSFT", "NVDA", "TSLA"])
+    assert stock_service.hot_symbols == {"AAPL", "MSFT", "NVDA"}
+
+
+@pytest.mark.asyncio
+async def test_failed_hot_symbols_back_off():
+    prewarmer = PreWarmer(interval_seconds=5, lead_seconds=10)
+    prewarmer.add_static(["AAPL", "BAD", "GONE"])
+    prewarmer._db_loaded_at = float("inf")
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        stock_service.price_cache.set_negative("GONE", {"error": "No data found"})
+
+    refresh = AsyncMock(return_value={"AAPL": {"currentPrice": 1.0}, "BAD": {"error": "No data found"}})
+    with patch("core.cache.time.monotonic", return_value=1000.0), patch("core.prewarmer.time.monotonic", return_value=1000.0), \
+         patch("core.stock_service.refresh_stock_infos", new=refresh):
+        # negative 캐싱된 종목은 만료 직전이어도 다시 조회하지 않음
+        assert await prewarmer.refresh_once() == ["AAPL", "BAD"]
+
+    # 실패한 종목은 interval * 2초 동안 건너뜀
+    with patch("core.cache.time.monotonic", return_value=1005.0), patch("core.prewarmer.time.monotonic", return_value=1005.0):
+        assert "BAD" not in prewarmer.due_symbols()
+    with patch("core.cache.time.monotonic", return_value=1011.0), patch("core.prewarmer.time.monotonic", return_value=1011.0):
+        assert "BAD" in prewarmer.due_symbols()
@@ -0,0 +1,126 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from core import quote_feed as qf
+from core.quote_feed import QuoteBoard, ReplayFeed, YFinancePollingFeed
+from core.stock_service import price_cache
+
+
+def test_quote_board_respects_max_age():
+    board = QuoteBoard()
+    board.update("AAPL", {"currentPrice": 100.0}, timestamp=1000.0)
+
+    with patch("core.quote_feed.time.time", return_value=1010.0):
+        assert board.get("AAPL", max_age=30)["currentPrice"] == 100.0
+    with patch("core.quote_feed.time.time", return_value=1100.0):
+        assert board.get("AAPL", max_age=30) is None
+    assert board.get("AAPL")["timestamp"] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_replay_feed_pushes_ticks_to_subscribers():
+    board = QuoteBoard()
+    queue = board.subscribe()
+    ticks = [
+        {"timestamp": 0, "symbol": "TSLA", "price": "200", "previous_close": "190"},
+        {"timestamp": 1, "symbol": "AAPL", "price": "150"},
+        {"timestamp": 2, "symbol": "TSLA", "price": "210", "previous_close": "190"},
+    ]
+    feed = ReplayFeed(board, ticks=ticks, speed=1000)
+
+    await feed.start()
+
+    received = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [s for s, _ in received] == ["TSLA", "AAPL", "TSLA"]
+    assert board.get("TSLA")["currentPrice"] == 210.0
+    assert board.get("TSLA")["changePercent"] == pytest.approx(20 / 190 * 100)
+
+
+@pytest.mark.asyncio
+async def test_polling_feed_updates_board_with_batched_quotes():
+    board = QuoteBoard()
+    feed = YFinancePollingFeed(board)
+    feed.watch(["AAPL", "BAD"])
+    quotes = {"AAPL": {"currentPrice": 1.0, "changePercent": 0.0}, "BAD": {"error": "Failed"}}
+
+    with patch("core.quote_feed.refresh_stock_infos", AsyncMock(return_value=quotes)) as mock_infos:
+        await feed.poll_once()
+
+    mock_infos.assert_awaited_once_with(["AAPL", "BAD"])
+    assert board.get("AAPL")["currentPrice"] == 1.0
+    assert board.get("BAD") is None
+
+
+@pytest.mark.asyncio
+async def test_polling_feed_bypasses_price_cache():
+    board = QuoteBoard()
+    feed = YFinancePollingFeed(board)
+    feed.watch(["AAPL"])
+    # 캐시에 남아 있는 이전 시세를 새 틱으로 찍으면 안 됨
+    price_cache.set("AAPL", {"currentPrice": 110.0, "changePercent": 0.0})
+    fresh = {"AAPL": {"currentPrice": 120.0, "changePercent": 0.0}}
+
+    try:
+        with patch("core.stock_service._fetch_stock_infos", AsyncMock(return_value=fresh)) as mock_fetch:
+            await feed.poll_once()
+            await feed.poll_once()
+    finally:
+        price_cache.delete("AAPL")
+
+    assert mock_fetch.await_count == 2
+    assert board.get("AAPL")["currentPrice"] == 120.0
+
+
+@pytest.mark.asyncio
+async def test_get_quote_rejects_board_quote_older_than_max_age():
+    board = QuoteBoard()
+    board.update("AAPL", {"currentPrice": 110.0}, timestamp=time.time() - qf.QUOTE_MAX_AGE_SECONDS - 1)
+    feed = YFinancePollingFeed(board)
+
+    with patch.object(qf, "quote_board", board), patch.object(qf, "quote_feed", feed), \
+         patch("core.quote_feed.get_stock_info", AsyncMock(return_value={"currentPrice": 120.0})) as mock_info:
+        assert (await qf.get_quote("AAPL"))["currentPrice"] == 120.0
+
+    mock_info.assert_awaited_once_with("AAPL")
+
+
+@pytest.mark.asyncio
+async def test_get_quote_prefers_board_and_falls_back_to_fetch():
+    board = QuoteBoard()
+    board.update("NVDA", {"currentPrice": 500.0})
+    feed = YFinancePollingFeed(board)
+
+    with patch.object(qf, "quote_board", board), patch.object(qf, "quote_feed", feed), \
+         patch("core.quote_feed.get_stock_info", AsyncMock(return_value={"currentPrice": 10.0})) as mock_info:
+        assert (await qf.get_quote("NVDA"))["currentPrice"] == 500.0
+        mock_info.assert_not_awaited()
+        assert (await qf.get_quote("MSFT"))["currentPrice"] == 10.0
+
+    assert "MSFT" in feed.watchlist
+
+
+@pytest.mark.asyncio
+async def test_on_demand_symbols_expire_and_errors_are_not_watched():
+    board = QuoteBoard()
+    feed = YFinancePollingFeed(board)
+    feed.idle_seconds = 60
+    feed.watch(["TSLA"])
+    quotes = {"AAPL": {"currentPrice": 1.0}, "BAD": {"error": "No data found"}, "TSLA": {"currentPrice": 2.0}}
+
+    with patch.object(qf, "quote_board", board), patch.object(qf, "quote_feed", feed), \
+         patch("core.quote_feed.get_stock_infos", AsyncMock(side_effect=lambda s: {k: quotes[k] for k in s})), \
+         patch("core.quote_feed.time.time", return_value=1000.0):
+        await qf.get_quotes(["AAPL", "BAD", "TSLA"])
+    assert feed.watchlist == {"AAPL", "TSLA"}
+
+    # 보드에서 읽어도 마지막 조회 시각이 갱신됨
+    board.update("AAPL", {"currentPrice": 1.0}, timestamp=1040.0)
+    with patch.object(qf, "quote_board", board), patch.object(qf, "quote_feed", feed), \
+         patch("core.quote_feed.time.time", return_value=1050.0):
+        await qf.get_quote("AAPL")
+    with patch("core.quote_feed.time.time", return_value=1100.0):
+        assert feed.prune_idle() == []
+    # 만료 없이 추가된 종목은 조회가 없어도 유지
+    with patch("core.quote_feed.time.time", return_value=1200.0):
+        assert feed.prune_idle() == ["AAPL"]
+    assert feed.watchlist == {"TSLA"}
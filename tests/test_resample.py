@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from core.bar_store import Bars, bar_store, resample_bars
+
+
+def make_5m_bars(days=12):
+    # 정규장(09:30~16:00) 5분봉, 서머타임 시작(2025-03-09) 구간 포함
+    sessions = pd.bdate_range("2025-03-03", periods=days)
+    index = pd.DatetimeIndex([
+        t for d in sessions
+        for t in pd.date_range(f"{d.date()} 09:30", f"{d.date()} 15:55", freq="5min", tz="America/New_York")
+    ])
+    rng = np.random.default_rng(7)
+    n = len(index)
+    close = 100 + np.cumsum(rng.normal(0, 0.2, n))
+    open_ = close + rng.normal(0, 0.1, n)
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    volume = rng.integers(100, 1000, n).astype(float)
+    ts = index.tz_convert("UTC").as_unit("s").asi8.astype(np.int64)
+    return Bars("AAPL", "5m", ts, open_, high, low, close, volume), index
+
+
+def pandas_resample(bars, index, rule, offset=None):
+    df = pd.DataFrame(
+        {"Open": bars.open, "High": bars.high, "Low": bars.low, "Close": bars.close, "Volume": bars.volume},
+        index=index,
+    )
+    agg = df.resample(rule, offset=offset).agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    )
+    return agg.dropna(subset=["Open"])
+
+
+@pytest.mark.parametrize("interval,rule,offset", [
+    ("15m", "15min", None),
+    ("1h", "1h", "30min"),  # 09:30 기준 정렬
+    ("1d", "1D", None),
+])
+def test_resample_matches_pandas(interval, rule, offset):
+    bars, index = make_5m_bars()
+    result = resample_bars(bars, interval)
+    expected = pandas_resample(bars, index, rule, offset)
+
+    assert result.interval == interval
+    assert len(result) == len(expected)
+    np.testing.assert_array_equal(result.ts, expected.index.tz_convert("UTC").as_unit("s").asi8)
+    for column, name in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close"), ("volume", "Volume")):
+        np.testing.assert_allclose(getattr(result, column), expected[name].to_numpy())
+
+
+def test_resample_labels_follow_dst():
+    bars, _ = make_5m_bars()
+    daily = resample_bars(bars, "1d")
+    hours = pd.DatetimeIndex(pd.to_datetime(daily.ts, unit="s", utc=True)).tz_convert("America/New_York")
+    # 서머타임 전후 모두 뉴욕 자정이 라벨
+    assert (hours.hour == 0).all()
+    hourly = resample_bars(bars, "1h")
+    first = pd.Timestamp(int(hourly.ts[0]), unit="s", tz="UTC").tz_convert("America/New_York")
+    assert (first.hour, first.minute) == (9, 30)
+
+
+def test_resample_rejects_finer_or_misaligned_interval():
+    bars, _ = make_5m_bars(1)
+    with pytest.raises(ValueError):
+        resample_bars(bars, "1m")
+    hourly = Bars("AAPL", "60m", bars.ts, bars.open, bars.high, bars.low, bars.close, bars.volume)
+    with pytest.raises(ValueError):
+        resample_bars(hourly, "90m")
+    assert resample_bars(bars, "5m") is bars
+
+
+@pytest.mark.asyncio
+async def test_get_timeframes_fetches_base_once():
+    bars, _ = make_5m_bars()
+    with patch.object(bar_store, "sync") as sync, patch.object(bar_store, "read", return_value=bars):
+        frames = await bar_store.get_timeframes("AAPL", ["15m", "1h", "1d"], period="max", base="5m")
+    sync.assert_called_once_with("AAPL", "5m", "max")
+    assert set(frames) == {"15m", "1h", "1d"}
+    assert len(frames["1d"]) == 12
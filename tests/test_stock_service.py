@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from core import stock_service
+from core.stock_service import find_ticker, get_stock_info, get_stock_infos
+
+
+def make_bulk_frame(prices: dict) -> pd.DataFrame:
+    """yf.download(group_by="ticker") 형태의 MultiIndex 데이터프레임 생성"""
+    index = pd.to_datetime(["2026-01-05", "2026-01-06"])
+    frames = {}
+    for symbol, closes in prices.items():
+        frames[symbol] = pd.DataFrame({"Close": closes, "Volume": [1000, 1000]}, index=index)
+    return pd.concat(frames, axis=1)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    stock_service.price_cache.clear()
+    stock_service.ticker_cache.clear()
+    yield
+    stock_service.price_cache.clear()
+    stock_service.ticker_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_stock_infos_single_bulk_download():
+    frame = make_bulk_frame({"AAPL": [100.0, 110.0], "MSFT": [200.0, 190.0]})
+
+    with patch("core.stock_service.yf.download", return_value=frame) as mock_download:
+        result = await get_stock_infos(["AAPL", "MSFT"])
+
+    mock_download.assert_called_once()
+    assert mock_download.call_args[0][0] == ["AAPL", "MSFT"]
+    assert result["AAPL"]["currentPrice"] == 110.0
+    assert result["AAPL"]["changePercent"] == pytest.approx(10.0)
+    assert result["MSFT"]["change"] == -10.0
+    assert "AAPL" in stock_service.price_cache
+
+
+@pytest.mark.asyncio
+async def test_bulk_quotes_keep_company_names():
+    frame = make_bulk_frame({"AAPL": [100.0, 110.0], "MSFT": [200.0, 190.0], "ZZZZ": [1.0, 2.0]})
+    # 이전 단일 조회에서 받은 이름이 있으면 유지, 없으면 오프라인 종목 인덱스의 회사명
+    stock_service.price_cache.set("AAPL", {"shortName": "Apple Inc.", "currentPrice": 100.0})
+
+    with patch("core.stock_service.yf.download", return_value=frame), \
+         patch.object(stock_service.symbol_index, "name", side_effect=lambda s: {"MSFT": "Microsoft Corporation"}.get(s)):
+        result = await stock_service.refresh_stock_infos(["AAPL", "MSFT", "ZZZZ"])
+
+    assert result["AAPL"]["shortName"] == "Apple Inc."
+    assert result["MSFT"]["shortName"] == "Microsoft Corporation"
+    assert result["ZZZZ"]["shortName"] == "ZZZZ"
+
+
+@pytest.mark.asyncio
+async def test_get_stock_infos_fetches_only_cache_misses():
+    frame = make_bulk_frame({"AAPL": [100.0, 110.0], "MSFT": [200.0, 190.0]})
+
+    with patch("core.stock_service.yf.download", return_value=frame):
+        await get_stock_infos(["AAPL"])
+
+    with patch("core.stock_service.yf.download", return_value=frame) as mock_download:
+        result = await get_stock_infos(["AAPL", "MSFT"])
+
+    assert mock_download.call_args[0][0] == ["MSFT"]
+    assert set(result) == {"AAPL", "MSFT"}
+
+
+@pytest.mark.asyncio
+async def test_get_stock_infos_reports_per_symbol_errors():
+    frame = make_bulk_frame({"AAPL": [100.0, 110.0], "BAD": [float("nan"), float("nan")]})
+
+    with patch("core.stock_service.yf.download", return_value=frame):
+        result = await get_stock_infos(["AAPL", "BAD"])
+
+    assert result["AAPL"]["currentPrice"] == 110.0
+    assert "error" in result["BAD"]
+
+    # 실패한 종목은 negative 캐시되어 재요청 시 업스트림을 다시 호출하지 않음
+    with patch("core.stock_service.yf.download") as mock_download:
+        again = await get_stock_infos(["BAD"])
+
+    mock_download.assert_not_called()
+    assert "error" in again["BAD"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_stock_info_shares_one_fetch():
+    calls = []
+
+    async def slow_fetch(symbol):
+        calls.append(symbol)
+        await asyncio.sleep(0.01)
+        return {"shortName": symbol, "currentPrice": 1.0}
+
+    with patch("core.stock_service._fetch_stock_info", side_effect=slow_fetch):
+        results = await asyncio.gather(*[get_stock_info("TSLA") for _ in range(5)])
+
+    assert calls == ["TSLA"]
+    assert all(r["currentPrice"] == 1.0 for r in results)
+    assert not stock_service.quote_flight.is_inflight("TSLA")
+
+
+@pytest.mark.asyncio
+async def test_get_stock_infos_joins_inflight_fetch():
+    frame = make_bulk_frame({"MSFT": [200.0, 190.0]})
+
+    async def slow_fetch(symbol):
+        await asyncio.sleep(0.01)
+        return {"shortName": symbol, "currentPrice": 1.0}
+
+    with patch("core.stock_service._fetch_stock_info", side_effect=slow_fetch), \
+         patch("core.stock_service.yf.download", return_value=frame) as mock_download:
+        single, batch = await asyncio.gather(get_stock_info("AAPL"), get_stock_infos(["AAPL", "MSFT"]))
+
+    assert mock_download.call_args[0][0] == ["MSFT"]
+    assert batch["AAPL"] is single
+
+
+@pytest.mark.asyncio
+async def test_concurrent_find_ticker_shares_one_search():
+    calls = []
+
+    async def slow_search(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return {"symbol": "TSLA", "name": "Tesla Inc"}
+
+    with patch("core.stock_service._search_ticker", side_effect=slow_search):
+        results = await asyncio.gather(*[find_ticker("unlisted holdings") for _ in range(3)])
+
+    assert calls == ["unlisted holdings"]
+    assert results[0] == {"symbol": "TSLA", "name": "Tesla Inc"}
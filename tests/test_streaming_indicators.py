@@ -0,0 +1,61 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_service import IndicatorService
+from core.streaming_indicators import (
+    StreamingBollinger, StreamingIndicators, StreamingMACD, StreamingRSI,
+)
+
+
+def random_walk(n=300, seed=7, start=500.0):
+    rng = np.random.default_rng(seed)
+    prices = start + np.cumsum(rng.normal(0, 3, n))
+    prices[50:55] = prices[49]  # 변화 없는 구간 포함
+    return pd.Series(prices)
+
+
+def assert_series_equal(streamed, batch):
+    np.testing.assert_allclose(np.array(streamed, dtype=float), batch.to_numpy(dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_streaming_rsi_matches_batch():
+    closes = random_walk()
+    rsi = StreamingRSI(14)
+    assert_series_equal([rsi.update(c) for c in closes], IndicatorService.calculate_rsi(closes))
+
+
+def test_streaming_macd_matches_batch():
+    closes = random_walk()
+    macd = StreamingMACD()
+    streamed = [macd.update(c) for c in closes]
+    batch = IndicatorService.calculate_macd(closes)
+    for key in ("macd", "signal", "histogram"):
+        assert_series_equal([s[key] for s in streamed], batch[key])
+
+
+def test_streaming_bollinger_matches_batch():
+    closes = random_walk(start=20000.0)
+    bands = StreamingBollinger(20, 2)
+    streamed = [bands.update(c) for c in closes]
+    batch = IndicatorService.calculate_bollinger_bands(closes)
+    for key in ("upper", "middle", "lower"):
+        assert_series_equal([s[key] for s in streamed], batch[key])
+
+
+def test_state_round_trip_and_peek():
+    closes = random_walk().tolist()
+    live = StreamingIndicators.from_closes(closes[:200])
+    restored = StreamingIndicators.from_state(json.loads(json.dumps(live.to_state())))
+
+    peeked = restored.peek(closes[200])
+    assert restored.to_state() == json.loads(json.dumps(live.to_state()))  # peek는 상태를 바꾸지 않음
+
+    for close in closes[200:]:
+        expected = live.update(close)
+        assert restored.update(close) == expected
+    assert peeked == StreamingIndicators.from_closes(closes[:200]).update(closes[200])
+
+    batch_rsi = IndicatorService.calculate_rsi(pd.Series(closes)).iloc[-1]
+    assert restored.to_state()["bars"] == len(closes)
+    assert live.rsi.value == pytest.approx(batch_rsi, rel=1e-9)
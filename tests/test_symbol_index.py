@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import patch
+from core.symbol_index import SymbolIndex
+
+LISTINGS = """symbol,name,exchange,etf
+AAPL,Apple Inc. - Common Stock,NASDAQ,N
+APPF,AppFolio Inc - Class A Common Stock,NASDAQ,N
+TSLA,"Tesla, Inc. - Common Stock",NASDAQ,N
+NVDA,NVIDIA Corporation - Common Stock,NASDAQ,N
+BRK-B,Berkshire Hathaway Inc. New Common Stock,NYSE,N
+QQQ,Invesco QQQ Trust Series 1,NASDAQ,Y
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "symbols.csv"
+    path.write_text(LISTINGS, encoding="utf-8")
+    return SymbolIndex(str(path)).load()
+
+
+def test_lookup_exact_ticker_and_yahoo_class_notation(index):
+    assert index.lookup("aapl")["symbol"] == "AAPL"
+    assert index.lookup("BRK.B")["symbol"] == "BRK-B"
+
+
+def test_lookup_company_name_and_korean_alias(index):
+    assert index.lookup("Tesla")["symbol"] == "TSLA"
+    assert index.lookup("nvidia corp")["symbol"] == "NVDA"
+    assert index.lookup("테슬라")["symbol"] == "TSLA"
+    assert index.lookup("엔비디아")["name"] == "NVIDIA Corporation - Common Stock"
+
+
+def test_lookup_prefix_and_fuzzy(index):
+    assert index.lookup("Tesl")["symbol"] == "TSLA"
+    assert index.lookup("nvidai")["symbol"] == "NVDA"
+
+
+def test_name_strips_security_description(index):
+    assert index.name("AAPL") == "Apple Inc."
+    assert index.name("qqq") == "Invesco QQQ Trust Series 1"
+    assert index.name("ZZZZ") is None
+
+
+def test_lookup_returns_none_for_unknown(index):
+    assert index.lookup("zzzzunknown") is None
+
+
+def test_search_prefix_prefers_exact_ticker(index):
+    results = index.search("app", limit=5)
+    assert {r["symbol"] for r in results} == {"AAPL", "APPF"}
+    assert index.search("QQQ")[0] == {"symbol": "QQQ", "name": "Invesco QQQ Trust Series 1", "exchange": "NASDAQ", "type": "ETF"}
+
+
+@pytest.mark.asyncio
+async def test_find_ticker_uses_offline_index_before_yahoo(index):
+    from core.stock_service import find_ticker
+
+    with patch("core.stock_service.symbol_index", index), \
+         patch("core.stock_service._search_ticker") as mock_search:
+        result = await find_ticker("애플")
+
+    assert result == {"symbol": "AAPL", "name": "Apple Inc. - Common Stock"}
+    mock_search.assert_not_called()
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from core.exit_manager import ExitManager
+from core.quote_feed import QuoteBoard
+from core.trigger_index import TriggerIndex
+
+
+def test_only_crossed_triggers_fire():
+    index = TriggerIndex()
+    index.set(1, "TSLA", stop_price=180.0, target_price=250.0)
+    index.set(2, "TSLA", stop_price=190.0)
+    index.set(3, "TSLA", target_price=220.0)
+    index.set(4, "AAPL", stop_price=500.0)
+
+    assert index.crossed("TSLA", 200.0) == []
+    fired = index.crossed("TSLA", 185.0)
+    assert [(t.user_id, t.kind, t.level) for t in fired] == [(2, "STOP", 190.0)]
+    fired = index.crossed("TSLA", 230.0)
+    assert [(t.user_id, t.kind) for t in fired] == [(3, "TARGET")]
+    # 발동한 포지션은 제거되어 다시 발동하지 않음
+    assert index.crossed("TSLA", 185.0) == []
+    assert len(index) == 2
+
+
+def test_updated_and_removed_levels_are_skipped():
+    index = TriggerIndex()
+    index.set(1, "NVDA", stop_price=100.0)
+    index.set(1, "NVDA", stop_price=80.0)
+    index.set(2, "NVDA", target_price=120.0)
+    index.remove(2, "NVDA")
+
+    assert index.crossed("NVDA", 90.0) == []
+    assert index.crossed("NVDA", 130.0) == []
+    fired = index.crossed("NVDA", 79.0)
+    assert [(t.user_id, t.level) for t in fired] == [(1, 80.0)]
+
+
+def test_compaction_bounds_stale_entries():
+    index = TriggerIndex()
+    for i in range(1000):
+        index.set(1, "QQQ", stop_price=100.0 + i)
+    assert len(index._stops["QQQ"]) < 200
+    assert index.levels(1, "QQQ") == (1099.0, None)
+    assert [t.level for t in index.crossed("QQQ", 1099.0)] == [1099.0]
+
+
+@pytest.mark.asyncio
+async def test_exit_manager_dispatches_crossed_positions_once():
+    feed = MagicMock()
+    manager = ExitManager(MagicMock(), board=QuoteBoard(), feed=feed)
+    manager.set_levels(1, "TSLA", 180.0, None)
+    manager.set_levels(2, "TSLA", None, 250.0)
+    feed.watch.assert_called_with(["TSLA"])
+
+    with patch.object(manager, "_exit", new=AsyncMock()) as exit_:
+        manager.on_tick("TSLA", {"currentPrice": 175.0})
+        manager.on_tick("TSLA", {"currentPrice": 170.0})
+        for task in list(manager._tasks):
+            await task
+
+    assert exit_.await_count == 1
+    trigger = exit_.await_args.args[0]
+    assert (trigger.user_id, trigger.kind, trigger.price) == (1, "STOP", 175.0)
+    assert (2, "TSLA") in manager.index
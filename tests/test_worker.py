@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from core.strategy_service import StrategyService
+from core.worker import TradingWorker
+
+
+def make_strategy(id, user_id, symbol, parameters='{"buy_rsi": 30, "sell_rsi": 70}'):
+    return SimpleNamespace(id=id, user_id=user_id, symbol=symbol, name=f"s{id}", strategy_type="RSI_LIMIT",
+                           parameters=parameters, is_active=True)
+
+
+def fake_session_factory(users):
+    session = MagicMock()
+    results = iter([users])
+
+    async def execute(_statement):
+        rows = next(results)
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        return result
+
+    session.execute = execute
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=lambda: context)
+
+
+@pytest.mark.asyncio
+async def test_run_once_evaluates_each_symbol_once_and_orders_by_user_and_strategy():
+    users = [SimpleNamespace(id=1, username="a", is_auto_trading_enabled=True),
+             SimpleNamespace(id=2, username="b", is_auto_trading_enabled=True),
+             SimpleNamespace(id=3, username="c", is_auto_trading_enabled=False)]
+    strategies = [make_strategy(5, 2, "TSLA"), make_strategy(7, 1, "NVDA"), make_strategy(3, 1, "TSLA"),
+                  make_strategy(9, 3, "TSLA"), make_strategy(4, 2, "AAPL")]
+    indicator_service = MagicMock()
+    indicator_service.get_latest_indicators = AsyncMock(return_value={"TSLA": {"rsi": 20.0}})
+    # 패널 결과에 없는 종목만 개별 계산
+    indicator_service.get_indicators = AsyncMock(return_value={"rsi": 50.0})
+    strategy_service = MagicMock(indicator_service=indicator_service)
+    strategy_service.evaluate_strategy = StrategyService(indicator_service).evaluate_strategy
+    trade_service = MagicMock()
+    trade_service.record_equity_snapshots = AsyncMock()
+    trade_service.execute_trade = AsyncMock(return_value={"status": "success"})
+
+    # 리스로 확보한 전략만 평가
+    leases = MagicMock(claim_strategies=AsyncMock(return_value=strategies), acquire=AsyncMock(return_value=True))
+    # 최근 틱 지표가 있는 종목(NVDA)은 패널 계산에서 제외
+    live = MagicMock(track=AsyncMock())
+    live.get.side_effect = lambda symbol: {"rsi": 80.0} if symbol == "NVDA" else None
+    worker = TradingWorker(strategy_service, trade_service, max_concurrency=2, leases=leases, live=live)
+    with patch("core.worker.sessionmaker", fake_session_factory(users)), \
+         patch("core.worker.notification_service.notify_user", new=AsyncMock()), \
+         patch("core.worker.quote_feed.watch"):
+        await worker.run_once()
+
+    symbols = indicator_service.get_latest_indicators.await_args.args[0]
+    assert sorted(symbols) == ["AAPL", "TSLA"]
+    assert sorted(live.track.await_args.args[0]) == ["AAPL", "NVDA", "TSLA"]
+    indicator_service.get_indicators.assert_awaited_once_with("AAPL")
+    orders = [(c.args[1].id, c.args[2], c.args[4]) for c in trade_service.execute_trade.await_args_list]
+    assert orders == [(1, "TSLA", "BUY"), (1, "NVDA", "SELL"), (2, "TSLA", "BUY")]
+    trade_service.record_equity_snapshots.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_symbol_groups_run_concurrently_under_semaphore():
+    running, peak = 0, 0
+
+    async def slow_indicators(symbol):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"rsi": 50.0}
+
+    indicator_service = MagicMock(get_indicators=slow_indicators)
+    strategy_service = MagicMock(indicator_service=indicator_service)
+    strategy_service.evaluate_strategy = AsyncMock(return_value="HOLD")
+    worker = TradingWorker(strategy_service, MagicMock(), max_concurrency=3)
+    semaphore = asyncio.Semaphore(worker.max_concurrency)
+
+    await asyncio.gather(*[
+        worker.evaluate_symbol(f"S{i}", [make_strategy(i, 1, f"S{i}")], None, semaphore) for i in range(10)
+    ])
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_start_survives_failed_cycles():
+    worker = TradingWorker(MagicMock(), MagicMock(), leases=MagicMock())
+    calls = 0
+
+    async def run_once():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("db down")
+        worker.stop()
+
+    worker.run_once = run_once
+    with patch("core.worker.market_calendar.session_at", return_value="REGULAR"), \
+         patch("core.worker.market_calendar.next_wakeup", return_value=0):
+        await worker.start()
+    assert calls == 2